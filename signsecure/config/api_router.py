@@ -1,13 +1,33 @@
 from django.conf import settings
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 from rest_framework.routers import SimpleRouter
 
+from signsecure.core.batch import batch
+from signsecure.documents.api.async_views import document_counts
+from signsecure.documents.api.async_views import document_session
+from signsecure.documents.api.async_views import document_status
+from signsecure.documents.api.views import ArchiveExportViewSet
+from signsecure.documents.api.views import DocumentViewSet
+from signsecure.documents.api.views import TemplateViewSet
 from signsecure.users.api.views import UserViewSet
+from signsecure.webhooks.api.views import WebhookEndpointViewSet
 
 router = DefaultRouter() if settings.DEBUG else SimpleRouter()
 
 router.register("users", UserViewSet)
+router.register("documents", DocumentViewSet)
+router.register("templates", TemplateViewSet)
+router.register("exports", ArchiveExportViewSet)
+router.register("webhooks", WebhookEndpointViewSet)
 
 
 app_name = "api"
-urlpatterns = router.urls
+urlpatterns = [
+    # Async views, see signsecure/core/api.py.
+    path("batch/", batch, name="batch"),
+    path("documents/counts/", document_counts, name="document-counts"),
+    path("documents/<int:pk>/session/", document_session, name="document-session"),
+    path("documents/<int:pk>/status/", document_status, name="document-status"),
+    *router.urls,
+]
@@ -14,6 +14,26 @@ app = Celery("signsecure")
 #   should have a `CELERY_` prefix.
 app.config_from_object("django.conf:settings", namespace="CELERY")
 
+# Tasks are routed to queues by workload class, each consumed by workers
+# suited to it (see compose/production/django/celery/), so that slow PDF
+# work cannot hold up notifications. Unlisted tasks go to the default
+# "celery" queue.
+PDF_QUEUE = "pdf"  # CPU-bound rendering and signing: prefork.
+EXPORTS_QUEUE = "exports"  # Archive exports, up to an hour each: prefork.
+NOTIFICATIONS_QUEUE = "notifications"  # Outbound HTTP: threads.
+AUDIT_QUEUE = "audit"  # Audit timestamping, short and frequent: threads.
+
+app.conf.task_routes = {
+    "signsecure.documents.tasks.extract_document_text": {"queue": PDF_QUEUE},
+    "signsecure.documents.tasks.generate_completion_certificate": {
+        "queue": PDF_QUEUE,
+    },
+    "signsecure.documents.tasks.sign_final_documents": {"queue": PDF_QUEUE},
+    "signsecure.documents.tasks.build_archive_export": {"queue": EXPORTS_QUEUE},
+    "signsecure.webhooks.tasks.deliver_webhooks": {"queue": NOTIFICATIONS_QUEUE},
+    "signsecure.documents.tasks.timestamp_audit_events": {"queue": AUDIT_QUEUE},
+}
+
 
 @setup_logging.connect
 def config_loggers(*args, **kwargs):
@@ -48,6 +48,21 @@ LOCALE_PATHS = [str(BASE_DIR / "locale")]
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
 DATABASES = {"default": env.db("DATABASE_URL")}
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Read replicas, as a comma-separated list of database URLs; see
+# signsecure/core/replicas.py. They mirror the primary in tests.
+DATABASE_REPLICAS = []
+for _number, _url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[]), 1):
+    DATABASES[f"replica{_number}"] = {
+        **env.db_url_config(_url),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica{_number}")
+# https://docs.djangoproject.com/en/dev/ref/settings/#database-routers
+DATABASE_ROUTERS = ["signsecure.core.replicas.ReplicaRouter"]
+# Replicas further behind than this are not read from.
+REPLICA_MAX_LAG_SECONDS = env.float("DJANGO_REPLICA_MAX_LAG_SECONDS", default=5.0)
+# How long a client reads from the primary after writing.
+REPLICA_PIN_SECONDS = env.int("DJANGO_REPLICA_PIN_SECONDS", default=15)
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -69,6 +84,7 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
     # "django.contrib.humanize", # Handy template tags
     "django.contrib.admin",
+    "django.contrib.postgres",
     "django.forms",
 ]
 THIRD_PARTY_APPS = [
@@ -86,7 +102,12 @@ THIRD_PARTY_APPS = [
 ]
 
 LOCAL_APPS = [
+    "signsecure.core",
     "signsecure.users",
+    "signsecure.documents",
+    "signsecure.webhooks",
+    "signsecure.outbox",
+    "signsecure.jobs",
     # Your stuff: custom apps go here
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -136,9 +157,10 @@ AUTH_PASSWORD_VALIDATORS = [
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "signsecure.core.middleware.ReplicaMiddleware",
     "corsheaders.middleware.CorsMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "signsecure.core.middleware.AsyncWhiteNoiseMiddleware",
+    "signsecure.core.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -275,6 +297,10 @@ if USE_TZ:
 CELERY_BROKER_URL = REDIS_URL
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#redis-backend-use-ssl
 CELERY_BROKER_USE_SSL = {"ssl_cert_reqs": ssl.CERT_NONE} if REDIS_SSL else None
+# https://docs.celeryq.dev/en/stable/getting-started/backends-and-brokers/redis.html#visibility-timeout
+# Longer than the longest task (archive exports, one hour), or acks_late tasks
+# still running are handed to a second worker.
+CELERY_BROKER_TRANSPORT_OPTIONS = {"visibility_timeout": 2 * 60 * 60}
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std:setting-result_backend
 CELERY_RESULT_BACKEND = REDIS_URL
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#redis-backend-use-ssl
@@ -300,6 +326,45 @@ CELERY_TASK_TIME_LIMIT = 5 * 60
 CELERY_TASK_SOFT_TIME_LIMIT = 60
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-scheduler
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-schedule
+CELERY_BEAT_SCHEDULE = {
+    "reconcile-document-counters": {
+        "task": "signsecure.documents.tasks.reconcile_document_counters",
+        "schedule": 60 * 60,
+    },
+    "sign-unsigned-documents": {
+        "task": "signsecure.documents.tasks.sign_unsigned_documents",
+        "schedule": 15 * 60,
+    },
+    "timestamp-audit-events": {
+        "task": "signsecure.documents.tasks.timestamp_audit_events",
+        "schedule": 30,
+    },
+    "dispatch-webhooks": {
+        "task": "signsecure.webhooks.tasks.dispatch_webhooks",
+        "schedule": 60,
+    },
+    "relay-outbox-messages": {
+        "task": "signsecure.outbox.tasks.relay_outbox_messages",
+        "schedule": 60,
+    },
+    "refresh-table-counts": {
+        "task": "signsecure.core.tasks.refresh_table_counts",
+        "schedule": 10 * 60,
+    },
+    "purge-outbox": {
+        "task": "signsecure.outbox.tasks.purge_outbox",
+        "schedule": 24 * 60 * 60,
+    },
+    "fail-stalled-jobs": {
+        "task": "signsecure.jobs.tasks.fail_stalled_jobs",
+        "schedule": 5 * 60,
+    },
+    "purge-expired-sessions": {
+        "task": "signsecure.core.tasks.purge_expired_sessions",
+        "schedule": 24 * 60 * 60,
+    },
+}
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-send-task-events
 CELERY_WORKER_SEND_TASK_EVENTS = True
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std-setting-task_send_sent_event
@@ -335,6 +400,18 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.TokenAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_PAGINATION_CLASS": "signsecure.core.pagination.ApproximateCountPagination",
+    "DEFAULT_RENDERER_CLASSES": (
+        "signsecure.core.renderers.ORJSONRenderer",
+        "signsecure.core.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "signsecure.core.parsers.ORJSONParser",
+        "signsecure.core.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
@@ -352,3 +429,43 @@ SPECTACULAR_SETTINGS = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+# PEM key and certificate that final PDFs are digitally signed with; they are
+# left unsigned while no key file is set.
+DOCUMENT_SIGNING_KEY_FILE = env("DJANGO_DOCUMENT_SIGNING_KEY_FILE", default="")
+DOCUMENT_SIGNING_CERT_FILE = env("DJANGO_DOCUMENT_SIGNING_CERT_FILE", default="")
+DOCUMENT_SIGNING_KEY_PASSPHRASE = env(
+    "DJANGO_DOCUMENT_SIGNING_KEY_PASSPHRASE",
+    default="",
+)
+# RFC 3161 timestamp authority that audit events are timestamped by, in
+# batches; DOCUMENT_TIMESTAMPER names a callable returning the pyHanko client.
+DOCUMENT_TIMESTAMP_URL = env("DJANGO_DOCUMENT_TIMESTAMP_URL", default="")
+DOCUMENT_TIMESTAMPER = "signsecure.documents.timestamps.http_timestamper"
+# Redis that the outbox relay publishes domain events to, on channels named
+# OUTBOX_CHANNEL_PREFIX + topic; events are dropped if it is empty.
+OUTBOX_REDIS_URL = env("DJANGO_OUTBOX_REDIS_URL", default=REDIS_URL)
+OUTBOX_CHANNEL_PREFIX = "signsecure:events:"
+OUTBOX_RETENTION_DAYS = 7
+# Tables whose full count is refreshed by a beat task and cached, rather than
+# estimated, once they are too large to count on every request.
+APPROXIMATE_COUNT_MODELS = ["users.User", "documents.Document"]
+APPROXIMATE_COUNT_TIMEOUT = 30 * 60
+# Cached API data is invalidated when the resources it was built from change;
+# this only bounds how long entries nobody asks for again are kept.
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+# The process-local tier in front of the cache, see signsecure/core/tiered.py.
+LOCAL_CACHE_MAX_SIZE = 2048
+LOCAL_CACHE_TIMEOUT = 30
+LOCAL_CACHE_REDIS_URL = env("DJANGO_LOCAL_CACHE_REDIS_URL", default=REDIS_URL)
+LOCAL_CACHE_CHANNEL = "signsecure:cache:invalidate"
+# Networks webhooks may be posted to even though they are not public, such as
+# "127.0.0.0/8"; see signsecure/webhooks/destinations.py.
+WEBHOOK_ALLOWED_NETWORKS = env.list("DJANGO_WEBHOOK_ALLOWED_NETWORKS", default=[])
+# With SESSION_ENGINE = "signsecure.core.sessions", also look for sessions
+# still stored in the database; see signsecure/core/sessions.py. Only turn it
+# on while moving sessions out of the database.
+SESSION_DB_FALLBACK = env.bool("DJANGO_SESSION_DB_FALLBACK", default=False)
+# Paths of the anonymous signing pages, whose sessions are kept in a signed
+# cookie of their own.
+SIGNER_SESSION_PATHS = ["/sign/"]
+SIGNER_SESSION_COOKIE_NAME = "signer_session"
@@ -23,7 +23,39 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["example.com"])
 
 # DATABASES
 # ------------------------------------------------------------------------------
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+# Each process opens a pool of up to DJANGO_DATABASE_POOL_MAX_SIZE connections
+# when it is set, otherwise one persistent connection per thread. The start
+# scripts size the pool per service; forking Celery workers do not use one.
+# https://docs.djangoproject.com/en/dev/ref/databases/#connection-pool
+DATABASE_POOL_MAX_SIZE = env.int("DJANGO_DATABASE_POOL_MAX_SIZE", default=0)
+# Set when connecting through PgBouncer in transaction pooling mode, which may
+# give each transaction a different server connection.
+DATABASE_PGBOUNCER = env.bool("DJANGO_DATABASE_PGBOUNCER", default=False)
+for _database in DATABASES.values():
+    _options = _database.setdefault("OPTIONS", {})
+    if DATABASE_POOL_MAX_SIZE:
+        _database["CONN_MAX_AGE"] = 0
+        _options["pool"] = {
+            "min_size": env.int("DJANGO_DATABASE_POOL_MIN_SIZE", default=1),
+            "max_size": DATABASE_POOL_MAX_SIZE,
+            # Seconds to wait for a free connection before failing.
+            "timeout": env.float("DJANGO_DATABASE_POOL_TIMEOUT", default=10.0),
+            # Seconds before idle connections above min_size are closed.
+            "max_idle": env.float("DJANGO_DATABASE_POOL_MAX_IDLE", default=300.0),
+        }
+    else:
+        _database["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+        _database["CONN_HEALTH_CHECKS"] = True
+    if DATABASE_PGBOUNCER:
+        # A cursor outliving its transaction would be left behind on another
+        # server connection. QuerySet.iterator() then reads the whole result
+        # at once, so the streaming exports page by primary key instead.
+        _database["DISABLE_SERVER_SIDE_CURSORS"] = True
+    # Django disables psycopg's prepared statements, which only work through
+    # PgBouncer 1.21+ with max_prepared_statements set. If so, prepare
+    # statements after this many executions.
+    if _threshold := env.int("DJANGO_DATABASE_PREPARE_THRESHOLD", default=0):
+        _options["prepare_threshold"] = _threshold
 
 # CACHES
 # ------------------------------------------------------------------------------
@@ -38,8 +70,27 @@ CACHES = {
             "IGNORE_EXCEPTIONS": True,
         },
     },
+    # Sessions are not a cache: errors must not be ignored, and the Redis
+    # behind this must not evict keys (maxmemory-policy noeviction), so it is
+    # not the cache's Redis.
+    "sessions": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": env("DJANGO_SESSION_REDIS_URL"),
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+        },
+    },
 }
 
+# SESSIONS
+# ------------------------------------------------------------------------------
+# https://docs.djangoproject.com/en/dev/ref/settings/#session-engine
+# Set to "django.contrib.sessions.backends.cached_db" to keep sessions in the
+# database, with Redis in front of it.
+SESSION_ENGINE = env("DJANGO_SESSION_ENGINE", default="signsecure.core.sessions")
+# https://docs.djangoproject.com/en/dev/ref/settings/#session-cache-alias
+SESSION_CACHE_ALIAS = "sessions"
+
 # SECURITY
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#secure-proxy-ssl-header
@@ -50,6 +101,7 @@ SECURE_SSL_REDIRECT = env.bool("DJANGO_SECURE_SSL_REDIRECT", default=True)
 SESSION_COOKIE_SECURE = True
 # https://docs.djangoproject.com/en/dev/ref/settings/#session-cookie-name
 SESSION_COOKIE_NAME = "__Secure-sessionid"
+SIGNER_SESSION_COOKIE_NAME = "__Secure-signer_session"
 # https://docs.djangoproject.com/en/dev/ref/settings/#csrf-cookie-secure
 CSRF_COOKIE_SECURE = True
 # https://docs.djangoproject.com/en/dev/ref/settings/#csrf-cookie-name
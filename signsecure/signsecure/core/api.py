@@ -0,0 +1,64 @@
+"""
+Async API views.
+
+DRF views are sync: under ASGI each request runs in a worker thread, so how
+many are served at once is bounded by the thread pool. The hottest read
+paths are plain async Django views instead, wrapped in ``async_api_view``,
+which answers the way the DRF API does: session or token authentication,
+JSON responses and ``{"detail": ...}`` errors.
+"""
+
+from collections.abc import Callable
+from collections.abc import Coroutine
+from functools import wraps
+from http import HTTPStatus
+from typing import Any
+
+from django.db import transaction
+from django.http import Http404
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+from rest_framework.authtoken.models import Token
+
+from signsecure.users.models import User
+
+AsyncView = Callable[..., Coroutine[Any, Any, HttpResponse]]
+
+
+async def authenticate(request: HttpRequest) -> User | None:
+    """Get the user a request is authenticated as, by token or session."""
+    keyword, _, key = request.headers.get("Authorization", "").partition(" ")
+    if keyword == "Token":
+        token = await Token.objects.select_related("user").filter(key=key).afirst()
+        return token.user if token is not None and token.user.is_active else None
+    user = await request.auser()
+    return user if isinstance(user, User) and user.is_active else None
+
+
+def async_api_view(view: AsyncView) -> AsyncView:
+    """
+    Serve a read-only async view as part of the API.
+
+    The view is called with the authenticated user after the request, and
+    may raise ``Http404``. It runs outside ``ATOMIC_REQUESTS``, which async
+    views cannot use.
+    """
+
+    @transaction.non_atomic_requests
+    @require_safe
+    @wraps(view)
+    async def api_view(request, *args, **kwargs):
+        user = await authenticate(request)
+        if user is None:
+            return JsonResponse(
+                {"detail": "Authentication credentials were not provided."},
+                status=HTTPStatus.FORBIDDEN,
+            )
+        try:
+            return await view(request, user, *args, **kwargs)
+        except Http404 as exc:
+            return JsonResponse({"detail": str(exc)}, status=HTTPStatus.NOT_FOUND)
+
+    return api_view
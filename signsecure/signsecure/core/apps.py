@@ -0,0 +1,13 @@
+import contextlib
+
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class CoreConfig(AppConfig):
+    name = "signsecure.core"
+    verbose_name = _("Core")
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import signsecure.core.signals  # noqa: F401
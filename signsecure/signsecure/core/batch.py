@@ -0,0 +1,150 @@
+"""
+Batched API reads.
+
+A client that needs several API resources at once, as the frontend does when
+it starts, can fetch them in one round trip: ``GET /api/batch/?url=...`` with
+one ``url`` parameter per resource, each the path and query string of an API
+GET request. The response lists, in the same order, the status and JSON body
+each request would have had on its own.
+
+Sub-requests are dispatched straight to their views, in-process, so the
+middleware only runs once, for the batch itself: sub-requests are not
+wrapped by it, and have no session or cookies of their own. They are
+authenticated once, for the batch. Async views wait side by side, but sync
+(DRF) views run one after the other on the batch's thread, sharing its
+database connection, so a batch of them takes as long as their sum. Long
+polls are cut short: a ``wait`` parameter is capped at ``MAX_WAIT`` seconds,
+so one sub-request cannot hold up the whole batch.
+"""
+
+import asyncio
+import json
+import logging
+from http import HTTPStatus
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db import transaction
+from django.http import HttpRequest
+from django.http import JsonResponse
+from django.http import QueryDict
+from django.urls import Resolver404
+from django.urls import resolve
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from signsecure.users.models import User
+
+from .api import async_api_view
+
+logger = logging.getLogger(__name__)
+
+MAX_REQUESTS = 20
+MAX_WAIT = 5
+URL_PARAM = "url"
+WAIT_PARAM = "wait"
+
+
+def _error(status: HTTPStatus, detail: str) -> dict:
+    return {"status": status, "body": {"detail": detail}}
+
+
+def _atomic(view):
+    # As ATOMIC_REQUESTS wraps the view of a request of its own (see
+    # BaseHandler.make_view_atomic), so that the view's errors roll back its
+    # own work only.
+    non_atomic: set[str] = getattr(view, "_non_atomic_requests", set())
+    for alias, settings_dict in connections.settings.items():
+        if settings_dict["ATOMIC_REQUESTS"] and alias not in non_atomic:
+            view = transaction.atomic(using=alias)(view)
+    return view
+
+
+def _cap_wait(query: str) -> str:
+    params = QueryDict(query, mutable=True)
+    try:
+        wait = float(str(params[WAIT_PARAM]))
+    except (KeyError, ValueError):
+        # Missing, or invalid and left for the view to reject.
+        return query
+    params[WAIT_PARAM] = f"{min(wait, MAX_WAIT):g}"
+    return params.urlencode()
+
+
+class SubRequest(HttpRequest):
+    """A GET request made for one of a batch's URLs."""
+
+    def __init__(self, request: HttpRequest, user: User, path: str, query: str):
+        super().__init__()
+        self._scheme = request.scheme or "http"
+        self._batch_user = user
+        query = _cap_wait(query)
+        self.method = "GET"
+        self.path = self.path_info = path
+        self.META = {
+            key: value
+            for key, value in request.META.items()
+            # Authenticated already: views find the user on the request
+            # rather than looking the token up again, and the batch's session
+            # cookie stays with the batch.
+            if key not in {"HTTP_AUTHORIZATION", "HTTP_COOKIE", "CONTENT_LENGTH"}
+        }
+        self.META.update(
+            {
+                "REQUEST_METHOD": "GET",
+                "PATH_INFO": path,
+                "QUERY_STRING": query,
+                "HTTP_ACCEPT": "application/json",
+            },
+        )
+        self.GET = QueryDict(query)
+        self.user = user
+
+    def _get_scheme(self) -> str:
+        return self._scheme
+
+    async def auser(self) -> User:
+        return self._batch_user
+
+
+async def _dispatch(request: HttpRequest, user: User, url: str) -> dict:
+    path, _, query = url.partition("?")
+    try:
+        match = resolve(path)
+    except Resolver404:
+        match = None
+    if match is None or match.namespace != "api" or match.func is batch:
+        return _error(HTTPStatus.NOT_FOUND, "Not found.")
+    subrequest = SubRequest(request, user, path, query)
+    subrequest.resolver_match = match
+    if iscoroutinefunction(match.func):
+        view = match.func
+    else:
+        view = sync_to_async(_atomic(match.func))
+    try:
+        response = await view(subrequest, *match.args, **match.kwargs)
+    except Exception:
+        logger.exception("Batched request to %s failed", url)
+        return _error(HTTPStatus.INTERNAL_SERVER_ERROR, "Server error.")
+    if isinstance(response, Response):
+        return {"status": response.status_code, "body": response.data}
+    if response.streaming or response.get("Content-Type") != "application/json":
+        response.close()
+        return _error(HTTPStatus.NOT_ACCEPTABLE, "Only JSON responses can be batched.")
+    return {"status": response.status_code, "body": json.loads(response.content)}
+
+
+@async_api_view
+async def batch(request, user):
+    """Answer several API GET requests at once."""
+    urls = request.GET.getlist(URL_PARAM)
+    if not 0 < len(urls) <= MAX_REQUESTS:
+        return JsonResponse(
+            {URL_PARAM: [f"Pass between 1 and {MAX_REQUESTS} URLs."]},
+            status=HTTPStatus.BAD_REQUEST,
+        )
+    responses = await asyncio.gather(
+        *(_dispatch(request, user, url) for url in urls),
+    )
+    return JsonResponse({"responses": responses}, encoder=JSONEncoder)
@@ -0,0 +1,162 @@
+"""
+Caching of API responses.
+
+Cached data is keyed by tenant, user, view, request path and the version of
+every resource it was built from. Saving or deleting a resource bumps its
+version once the transaction commits, so entries are never served stale
+and need no TTL to expire: ``RESPONSE_CACHE_TIMEOUT`` only bounds how long
+unused ones take up space. Versions start at a timestamp, so a version lost
+from the cache never comes back to match an old entry.
+
+Versions and entries are read through the two-tier cache in tiered.py, so a
+hot entry is served without a round trip to Redis; a bumped version is
+broadcast to every process.
+
+When an entry is missing, one request builds it while the others wait for
+it, rather than all of them querying at once (single flight). Entries are
+built from the primary database, since a replica could still be serving
+the data from before the change that bumped the version.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Sequence
+from functools import partial
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .replicas import primary_reads
+from .tiered import tiered_cache
+
+# A builder holds the lock for at most this long.
+LOCK_SECONDS = 10
+# How long to wait for another request's build, polling every POLL_SECONDS.
+WAIT_SECONDS = 2
+POLL_SECONDS = 0.02
+
+Scope = tuple[Any, ...]
+
+
+def _version_key(scope: Scope) -> str:
+    return "version:" + ":".join(map(str, scope))
+
+
+def bump_version(*scope) -> None:
+    """Invalidate what was cached of a resource, e.g. ``("document", pk)``."""
+    key = _version_key(scope)
+    try:
+        tiered_cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def invalidate_on_commit(*scope) -> None:
+    """Bump a resource's version once the current transaction commits."""
+    transaction.on_commit(partial(bump_version, *scope))
+
+
+def _versions(scopes: Sequence[Scope]) -> list[int]:
+    keys = [_version_key(scope) for scope in scopes]
+    versions = tiered_cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Whichever request adds the version first sets it for all.
+            cache.add(key, time.time_ns(), None)
+            versions[key] = tiered_cache.get(key)
+    return [versions[key] for key in keys]
+
+
+async def _aversions(scopes: Sequence[Scope]) -> list[int]:
+    keys = [_version_key(scope) for scope in scopes]
+    versions = await tiered_cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, time.time_ns(), None)
+            versions[key] = await tiered_cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+def _response_key(request, user_id, name: str, versions: list[int]) -> str:
+    path = hashlib.sha256(request.get_full_path().encode()).hexdigest()
+    version = ".".join(map(str, versions))
+    return f"response:{settings.SITE_ID}:{user_id}:{name}:{version}:{path}"
+
+
+def response_cache_key(request, name: str, scopes: Sequence[Scope]) -> str:
+    """The key of a view's data for a request, given what it is built from."""
+    return _response_key(request, request.user.id, name, _versions(scopes))
+
+
+async def aresponse_cache_key(
+    request,
+    user_id: int,
+    name: str,
+    scopes: Sequence[Scope],
+) -> str:
+    """Async version of ``response_cache_key()``, for the given user."""
+    return _response_key(request, user_id, name, await _aversions(scopes))
+
+
+def _wait_for(key: str, lock: str):
+    deadline = time.monotonic() + WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(POLL_SECONDS)
+        value = tiered_cache.get(key)
+        if value is not None or cache.get(lock) is None:
+            return value
+    return None
+
+
+def get_or_build(key: str, build: Callable[[], Any]) -> Any:
+    """Get a cached value, building it with ``build()`` only once at a time."""
+    if (value := tiered_cache.get(key)) is not None:
+        return value
+    lock = f"{key}:lock"
+    if not cache.add(lock, 1, LOCK_SECONDS):
+        if (value := _wait_for(key, lock)) is not None:
+            return value
+        # The build failed or is slow: take no chances and build it here.
+        with primary_reads():
+            return build()
+    try:
+        with primary_reads():
+            value = build()
+        tiered_cache.set(key, value, settings.RESPONSE_CACHE_TIMEOUT)
+    finally:
+        cache.delete(lock)
+    return value
+
+
+async def _await_for(key: str, lock: str):
+    deadline = time.monotonic() + WAIT_SECONDS
+    while time.monotonic() < deadline:
+        await asyncio.sleep(POLL_SECONDS)
+        value = await tiered_cache.aget(key)
+        if value is not None or await cache.aget(lock) is None:
+            return value
+    return None
+
+
+async def aget_or_build(key: str, build: Callable[[], Awaitable[Any]]) -> Any:
+    """Async version of ``get_or_build()``."""
+    if (value := await tiered_cache.aget(key)) is not None:
+        return value
+    lock = f"{key}:lock"
+    if not await cache.aadd(lock, 1, LOCK_SECONDS):
+        if (value := await _await_for(key, lock)) is not None:
+            return value
+        with primary_reads():
+            return await build()
+    try:
+        with primary_reads():
+            value = await build()
+        await tiered_cache.aset(key, value, settings.RESPONSE_CACHE_TIMEOUT)
+    finally:
+        await cache.adelete(lock)
+    return value
@@ -0,0 +1,83 @@
+"""
+Row counts that do not scan large tables.
+
+``COUNT(*)`` in Postgres reads every visible row. Small tables and result
+sets are still counted exactly, but beyond ``EXACT_COUNT_THRESHOLD`` rows
+counts come from the planner: ``pg_class.reltuples`` for a whole table, or
+the estimated rows of the query plan. Filtered querysets are counted with a
+``LIMIT`` of the threshold first, so the plan, whose estimate can be far off
+for selective filters, is only asked about result sets known to be large.
+Whole-table counts of the models in
+``APPROXIMATE_COUNT_MODELS`` are refreshed exactly, in the background, by
+the ``refresh_table_counts`` task, and served from the cache in between.
+"""
+
+import json
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Model
+from django.db.models import QuerySet
+
+EXACT_COUNT_THRESHOLD = 10_000
+
+
+def _cache_key(model: type[Model]) -> str:
+    return f"counts:table:{model._meta.label_lower}"  # noqa: SLF001
+
+
+def estimated_table_count(model: type[Model], using: str = "default") -> int | None:
+    """The planner's row count of the model's table, or None if it has none."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [model._meta.db_table],  # noqa: SLF001
+        )
+        row = cursor.fetchone()
+    # Tables never vacuumed nor analyzed have -1 (or 0 before Postgres 14).
+    if row is None or row[0] <= 0:
+        return None
+    return int(row[0])
+
+
+def estimated_count(queryset: QuerySet) -> int:
+    """The planner's estimate of the rows a query returns."""
+    plan = json.loads(queryset.explain(format="json"))
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+def table_count(model: type[Model], using: str = "default") -> int:
+    """Count all the rows of a model's table, approximately if it is large."""
+    estimate = estimated_table_count(model, using)
+    if estimate is None or estimate < EXACT_COUNT_THRESHOLD:
+        return model._default_manager.using(using).count()  # noqa: SLF001
+    cached = cache.get(_cache_key(model))
+    return estimate if cached is None else cached
+
+
+def queryset_count(queryset: QuerySet) -> int:
+    """Count a queryset's rows, approximately if there are a lot of them."""
+    query = queryset.query
+    if not (query.where or query.distinct or query.combinator or query.is_sliced):
+        return table_count(queryset.model, queryset.db)
+    # Reads at most the threshold's worth of rows, however many match.
+    count = queryset.order_by()[:EXACT_COUNT_THRESHOLD].count()
+    if count < EXACT_COUNT_THRESHOLD:
+        return count
+    return max(estimated_count(queryset), count)
+
+
+def refresh_table_counts() -> dict[str, int]:
+    """Count the tables in ``APPROXIMATE_COUNT_MODELS`` exactly, into the cache."""
+    counts = {}
+    for label in settings.APPROXIMATE_COUNT_MODELS:
+        model = apps.get_model(label)
+        counts[label] = model._default_manager.count()  # noqa: SLF001
+        cache.set(
+            _cache_key(model),
+            counts[label],
+            settings.APPROXIMATE_COUNT_TIMEOUT,
+        )
+    return counts
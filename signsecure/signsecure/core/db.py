@@ -0,0 +1,22 @@
+"""Database connections of threads that wait on the network."""
+
+from django.db import connections
+
+
+def release_connections() -> None:
+    """
+    Give this thread's pooled connections back to the pool.
+
+    A thread keeps the connection it takes from a pool until the connection
+    is closed, which Django and Celery do at the end of each request or task.
+    Call this before waiting on the network, so that the other threads of
+    the process can use the connection meanwhile; the next query takes one
+    from the pool again. Connections inside a transaction, and ones not from
+    a pool, are kept.
+    """
+    for connection in connections.all(initialized_only=True):
+        if (
+            connection.settings_dict["OPTIONS"].get("pool")
+            and not connection.in_atomic_block
+        ):
+            connection.close()
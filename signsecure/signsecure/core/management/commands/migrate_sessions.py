@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from signsecure.core.sessions import MIGRATE_BATCH_SIZE
+from signsecure.core.sessions import migrate_db_sessions
+
+
+class Command(BaseCommand):
+    help = "Move the unexpired database sessions to the session cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=MIGRATE_BATCH_SIZE)
+
+    def handle(self, *args, batch_size, **options):
+        if settings.SESSION_ENGINE != "signsecure.core.sessions":
+            msg = "SESSION_ENGINE is not signsecure.core.sessions."
+            raise CommandError(msg)
+        moved = migrate_db_sessions(batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Moved {moved} sessions."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from signsecure.core.sessions import PURGE_BATCH_SIZE
+from signsecure.core.sessions import purge_expired_sessions
+
+
+class Command(BaseCommand):
+    help = "Delete expired database sessions in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE)
+
+    def handle(self, *args, batch_size, **options):
+        deleted = purge_expired_sessions(batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired sessions."))
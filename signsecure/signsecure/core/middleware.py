@@ -0,0 +1,177 @@
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.sessions.backends.signed_cookies import (
+    SessionStore as SignedCookieSessionStore,
+)
+from django.contrib.sessions.middleware import (
+    SessionMiddleware as DjangoSessionMiddleware,
+)
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .replicas import PIN_COOKIE
+from .replicas import begin_request
+from .replicas import end_request
+from .replicas import pin_cache_key
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReplicaMiddleware:
+    """
+    Send the reads of safe requests to the read replicas.
+
+    Clients that wrote recently are pinned to the primary; see replicas.py.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        pin_key = self.pin_key(request)
+        replica = self.may_use_replica(request) and not (pin_key and cache.get(pin_key))
+        token = begin_request(replica=replica)
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = end_request(token)
+        if wrote and pin_key:
+            cache.set(pin_key, 1, settings.REPLICA_PIN_SECONDS)
+        return self.pin(response, wrote)
+
+    async def __acall__(self, request):
+        pin_key = self.pin_key(request)
+        replica = self.may_use_replica(request) and not (
+            pin_key and await cache.aget(pin_key)
+        )
+        token = begin_request(replica=replica)
+        try:
+            response = await self.get_response(request)
+        finally:
+            wrote = end_request(token)
+        if wrote and pin_key:
+            await cache.aset(pin_key, 1, settings.REPLICA_PIN_SECONDS)
+        return self.pin(response, wrote)
+
+    def may_use_replica(self, request) -> bool:
+        """Whether the request may read from a replica, unless pinned by key."""
+        return (
+            bool(settings.DATABASE_REPLICAS)
+            and request.method in SAFE_METHODS
+            and request.get_signed_cookie(
+                PIN_COOKIE,
+                default=None,
+                max_age=settings.REPLICA_PIN_SECONDS,
+            )
+            is None
+        )
+
+    def pin_key(self, request) -> str | None:
+        """The cache key pinning a client that keeps no cookies, e.g. API clients."""
+        authorization = request.headers.get("Authorization")
+        if not authorization or not settings.DATABASE_REPLICAS:
+            return None
+        return pin_cache_key(authorization)
+
+    def pin(self, response, wrote):
+        if wrote and settings.DATABASE_REPLICAS:
+            response.set_signed_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+                secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise, without a thread per request under ASGI.
+
+    WhiteNoise is sync only, which makes Django hand every request to a
+    thread to pass through it. Only requests for static files need that.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class SessionMiddleware(DjangoSessionMiddleware):
+    """
+    Sessions, kept in a signed cookie on the anonymous signing pages.
+
+    Requests under ``SIGNER_SESSION_PATHS`` get a session stored in the
+    ``SIGNER_SESSION_COOKIE_NAME`` cookie itself, which costs no lookup at
+    all. It is separate from the usual session, so users are anonymous on
+    those pages, and their own session is left alone.
+    """
+
+    def is_signer_request(self, request) -> bool:
+        return request.path_info.startswith(tuple(settings.SIGNER_SESSION_PATHS))
+
+    def process_request(self, request):
+        if not self.is_signer_request(request):
+            super().process_request(request)
+            return
+        request.session = SignedCookieSessionStore(
+            request.COOKIES.get(settings.SIGNER_SESSION_COOKIE_NAME),
+        )
+
+    def process_response(self, request, response):
+        if not self.is_signer_request(request) or not hasattr(request, "session"):
+            return super().process_response(request, response)
+        session = request.session
+        if session.accessed:
+            patch_vary_headers(response, ("Cookie",))
+        if session.is_empty():
+            if settings.SIGNER_SESSION_COOKIE_NAME in request.COOKIES:
+                response.delete_cookie(
+                    settings.SIGNER_SESSION_COOKIE_NAME,
+                    path=settings.SESSION_COOKIE_PATH,
+                    domain=settings.SESSION_COOKIE_DOMAIN,
+                    samesite=settings.SESSION_COOKIE_SAMESITE,
+                )
+        elif session.modified and response.status_code < 500:  # noqa: PLR2004
+            session.save()
+            response.set_cookie(
+                settings.SIGNER_SESSION_COOKIE_NAME,
+                session.session_key,
+                max_age=session.get_expiry_age(),
+                domain=settings.SESSION_COOKIE_DOMAIN,
+                path=settings.SESSION_COOKIE_PATH,
+                secure=settings.SESSION_COOKIE_SECURE or None,
+                httponly=True,
+                samesite=settings.SESSION_COOKIE_SAMESITE,
+            )
+        return response
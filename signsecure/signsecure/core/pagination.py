@@ -0,0 +1,32 @@
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import LimitOffsetPagination
+
+from .counts import queryset_count
+
+
+class ApproximateCountPaginator(Paginator):
+    """A paginator that estimates the number of rows of large querysets."""
+
+    @cached_property
+    def count(self) -> int:
+        if isinstance(self.object_list, QuerySet):
+            return queryset_count(self.object_list)
+        return len(self.object_list)
+
+
+class ApproximateCountPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination with estimated counts for large result sets.
+
+    Lists are only paginated when the client passes ``limit``, so responses
+    without it are unchanged.
+    """
+
+    max_limit = 100
+
+    def get_count(self, queryset) -> int:
+        if isinstance(queryset, QuerySet):
+            return queryset_count(queryset)
+        return len(queryset)
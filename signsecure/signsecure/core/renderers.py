@@ -0,0 +1,56 @@
+"""
+API response formats.
+
+JSON is encoded with orjson, several times faster than the standard library
+on large pages. Server-to-server integrators can ask for MessagePack instead
+with ``Accept: application/msgpack`` (or ``?format=msgpack``): the same data,
+smaller and quicker to decode. Datetimes, decimals and the like are turned
+into the same strings in both formats.
+
+orjson and msgpack are in the base requirements; without orjson, JSON is
+rendered by DRF's ``JSONRenderer``.
+"""
+
+import msgpack
+from rest_framework.renderers import BaseRenderer
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Datetimes and the like go through DRF's encoder, so the output is
+        # the same as JSONRenderer's.
+        content = orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            # Like json.dumps, accept integer and other non-string keys.
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+        # Like JSONRenderer, keep the output a strict subset of JavaScript.
+        return content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9",
+            b"\\u2029",
+        )
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = MSGPACK_MEDIA_TYPE
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=JSONEncoder().default, datetime=False)
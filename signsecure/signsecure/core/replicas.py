@@ -0,0 +1,156 @@
+"""
+Read replicas.
+
+Reads made while handling a safe (GET, HEAD, OPTIONS) request go to one of
+the ``DATABASE_REPLICAS``, chosen on the first read and kept for the rest of
+the request, so that its reads are consistent with each other; everything
+else, including Celery tasks and management commands, uses the primary. A
+request that writes switches to the primary for the rest of its reads, and
+``ReplicaMiddleware`` then pins the client to the primary for
+``REPLICA_PIN_SECONDS``, so it reads its own writes however far the replicas
+lag behind: browsers with a signed cookie, API clients by their
+``Authorization`` header, which they send with every request.
+
+Replicas lagging by more than ``REPLICA_MAX_LAG_SECONDS``, or unreachable,
+are passed over; the lag of each is checked at most every
+``REPLICA_LAG_CHECK_SECONDS`` per process.
+"""
+
+import hashlib
+import logging
+import random
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from contextvars import Token
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import DatabaseError
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = "primary_pin"
+PIN_CACHE_PREFIX = "replicas:pin:"
+REPLICA_LAG_CHECK_SECONDS = 5
+
+# Zero when the replica has replayed everything it received, since the last
+# replayed transaction can be old if the primary is idle.
+LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(
+        EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+    )
+END::float
+"""
+
+
+@dataclass
+class ReadState:
+    # Whether reads may go to a replica.
+    replica: bool
+    # Whether anything was written.
+    wrote: bool = False
+    # The alias reads go to, once the first is made.
+    alias: str | None = None
+
+
+_read_state: ContextVar[ReadState | None] = ContextVar("read_state", default=None)
+# Replica alias to (monotonic time checked, whether usable).
+_health: dict[str, tuple[float, bool]] = {}
+
+
+def replica_lag(alias: str) -> float | None:
+    """How many seconds a replica is behind, or None if it cannot be reached."""
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        # SQLite stand-ins for replicas in development.
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(LAG_SQL)
+            (lag,) = cursor.fetchone()
+    except DatabaseError:
+        logger.warning("Read replica %s is unreachable.", alias, exc_info=True)
+        return None
+    return lag
+
+
+def is_usable(alias: str) -> bool:
+    """Whether a replica is reachable and close enough behind the primary."""
+    now = time.monotonic()
+    checked, usable = _health.get(alias, (float("-inf"), False))
+    if now - checked >= REPLICA_LAG_CHECK_SECONDS:
+        lag = replica_lag(alias)
+        usable = lag is not None and lag <= settings.REPLICA_MAX_LAG_SECONDS
+        if lag is not None and not usable:
+            logger.warning("Read replica %s is %.1f s behind.", alias, lag)
+        _health[alias] = (now, usable)
+    return usable
+
+
+def choose_replica() -> str | None:
+    usable = [alias for alias in settings.DATABASE_REPLICAS if is_usable(alias)]
+    return random.choice(usable) if usable else None  # noqa: S311
+
+
+def pin_cache_key(authorization: str) -> str:
+    """The cache key pinning the client sending ``authorization`` to the primary."""
+    digest = hashlib.sha256(authorization.encode()).hexdigest()
+    return f"{PIN_CACHE_PREFIX}{digest}"
+
+
+def begin_request(*, replica: bool) -> Token[ReadState | None]:
+    """Start routing the reads of a request; returns a token for end_request()."""
+    return _read_state.set(ReadState(replica=replica))
+
+
+def end_request(token: Token[ReadState | None]) -> bool:
+    """Stop routing a request's reads; returns whether it wrote anything."""
+    state = _read_state.get()
+    _read_state.reset(token)
+    return state is not None and state.wrote
+
+
+@contextmanager
+def primary_reads() -> Iterator[None]:
+    """Read from the primary within the block, whatever the request."""
+    outer = _read_state.get()
+    state = ReadState(replica=False)
+    token = _read_state.set(state)
+    try:
+        yield
+    finally:
+        _read_state.reset(token)
+        if outer is not None and state.wrote:
+            outer.replica = False
+            outer.wrote = True
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _read_state.get()
+        if state is None or not state.replica:
+            return DEFAULT_DB_ALIAS
+        if state.alias is None:
+            state.alias = choose_replica() or DEFAULT_DB_ALIAS
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        if (state := _read_state.get()) is not None:
+            state.replica = False
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias holds the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema by replication.
+        return db not in settings.DATABASE_REPLICAS
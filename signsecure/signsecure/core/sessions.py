@@ -0,0 +1,73 @@
+"""
+A session engine keeping sessions in Redis, for ``SESSION_ENGINE``.
+
+Sessions live in the ``SESSION_CACHE_ALIAS`` cache only, so reading one is a
+single Redis round trip and Redis expires them. Sessions created while they
+were still stored in the database are moved over the first time they are
+used, as long as ``SESSION_DB_FALLBACK`` is on; ``migrate_sessions`` moves
+them all at once, after which it can be turned off. ``purge_sessions``
+deletes expired database sessions in batches.
+"""
+
+from django.conf import settings
+from django.contrib.sessions.backends.cache import SessionStore as CacheSessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.utils import timezone
+
+PURGE_BATCH_SIZE = 10_000
+MIGRATE_BATCH_SIZE = 1000
+
+
+class SessionStore(CacheSessionStore):
+    def load(self):
+        session_key = self.session_key
+        data = super().load()
+        if data or session_key is None or not settings.SESSION_DB_FALLBACK:
+            return data
+        session = Session.objects.filter(
+            session_key=session_key,
+            expire_date__gt=timezone.now(),
+        ).first()
+        if session is None:
+            return {}
+        self._session_key = session_key
+        return move_to_cache(session)
+
+
+def move_to_cache(session: Session) -> dict:
+    """Copy a database session to the cache, then delete it; returns its data."""
+    store = SessionStore(session.session_key)
+    data = store.decode(session.session_data)
+    timeout = (session.expire_date - timezone.now()).total_seconds()
+    if data and timeout > 0:
+        caches[settings.SESSION_CACHE_ALIAS].set(store.cache_key, data, timeout)
+    session.delete()
+    return data
+
+
+def migrate_db_sessions(batch_size: int = MIGRATE_BATCH_SIZE) -> int:
+    """Move every unexpired database session to the cache; returns how many."""
+    moved = 0
+    sessions = Session.objects.filter(expire_date__gt=timezone.now())
+    while batch := list(sessions.order_by("pk")[:batch_size]):
+        for session in batch:
+            move_to_cache(session)
+        moved += len(batch)
+    return moved
+
+
+def purge_expired_sessions(batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """
+    Delete expired database sessions, a batch at a time.
+
+    Unlike ``clearsessions``, which deletes them in one statement, this
+    never holds locks on more than ``batch_size`` rows. Returns how many
+    were deleted.
+    """
+    deleted = 0
+    expired = Session.objects.filter(expire_date__lt=timezone.now())
+    while keys := list(expired.values_list("pk", flat=True)[:batch_size]):
+        count, _ = Session.objects.filter(pk__in=keys).delete()
+        deleted += count
+    return deleted
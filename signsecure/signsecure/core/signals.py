@@ -0,0 +1,25 @@
+from django.contrib.sites.models import SITE_CACHE
+from django.contrib.sites.models import Site
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .tiered import tiered_cache
+
+SITE_KEY_PREFIX = "site:"
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def broadcast_site_change(sender, instance, **kwargs):
+    """Have every process drop the sites it cached, not only this one."""
+    tiered_cache.invalidate(f"{SITE_KEY_PREFIX}{instance.pk}")
+
+
+def drop_cached_sites(key: str) -> None:
+    # Django caches sites per process, by ID and by domain.
+    if key.startswith(SITE_KEY_PREFIX):
+        SITE_CACHE.clear()
+
+
+tiered_cache.invalidation_handlers.append(drop_cached_sites)
@@ -0,0 +1,16 @@
+from celery import shared_task
+
+from .counts import refresh_table_counts as refresh_counts
+from .sessions import purge_expired_sessions as purge_sessions
+
+
+@shared_task()
+def refresh_table_counts():
+    """Recount the large tables whose counts are served from the cache."""
+    return refresh_counts()
+
+
+@shared_task()
+def purge_expired_sessions():
+    """Delete expired database sessions, which nothing else removes."""
+    return purge_sessions()
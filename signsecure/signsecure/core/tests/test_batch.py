@@ -0,0 +1,124 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.core.files.base import ContentFile
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from signsecure.core.batch import MAX_REQUESTS
+from signsecure.core.batch import MAX_WAIT
+from signsecure.core.batch import SubRequest
+from signsecure.documents.certificates import generate_certificate
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.documents.tests.factories import make_pdf
+from signsecure.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def test_batch(user: User, client):
+    document = DocumentFactory(owner=user)
+    urls = [
+        reverse("api:user-me"),
+        reverse("api:document-list") + "?fields=id,title",
+        reverse("api:document-counts"),
+        reverse("api:document-session", kwargs={"pk": document.pk}),
+    ]
+    client.force_login(user)
+
+    response = client.get(reverse("api:batch"), {"url": urls})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["responses"] == [
+        {"status": HTTPStatus.OK, "body": client.get(url).json()} for url in urls
+    ]
+
+
+def test_token_authentication(user: User, client):
+    token = Token.objects.create(user=user)
+
+    response = client.get(
+        reverse("api:batch"),
+        {"url": reverse("api:user-me")},
+        headers={"Authorization": f"Token {token.key}"},
+    )
+
+    (me,) = response.json()["responses"]
+    assert me["body"]["name"] == user.name
+
+
+def test_errors(user: User, client):
+    document = DocumentFactory(
+        owner=user,
+        file=ContentFile(make_pdf(["Lease"]), "lease.pdf"),
+    )
+    generate_certificate(document.pk)
+    urls = [
+        reverse("api:document-detail", kwargs={"pk": DocumentFactory().pk}),
+        "/about/",
+        reverse("api:batch"),
+        reverse("api:document-list") + "?fields=owner",
+        reverse("api:document-certificate", kwargs={"pk": document.pk}),
+    ]
+    client.force_login(user)
+
+    response = client.get(reverse("api:batch"), {"url": urls})
+
+    assert [r["status"] for r in response.json()["responses"]] == [
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.BAD_REQUEST,
+        HTTPStatus.NOT_ACCEPTABLE,
+    ]
+
+
+@pytest.mark.parametrize("count", [0, MAX_REQUESTS + 1])
+def test_url_count(user: User, client, count):
+    client.force_login(user)
+
+    response = client.get(reverse("api:batch"), {"url": ["/api/users/me/"] * count})
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_requires_authentication(client):
+    response = client.get(reverse("api:batch"), {"url": reverse("api:user-me")})
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+class TestSubRequest:
+    def test_shares_no_session_or_credentials(self, user: User, rf: RequestFactory):
+        request = rf.get(
+            "/api/batch/",
+            headers={"Authorization": "Token secret", "Cookie": "sessionid=abc"},
+            secure=True,
+        )
+        request.session = SessionStore()
+
+        subrequest = SubRequest(request, user, "/api/users/me/", "a=1")
+
+        assert subrequest.user == user
+        assert subrequest.GET.dict() == {"a": "1"}
+        assert subrequest.COOKIES == {}
+        assert "HTTP_AUTHORIZATION" not in subrequest.META
+        assert not hasattr(subrequest, "session")
+        assert subrequest.build_absolute_uri() == "https://testserver/api/users/me/?a=1"
+
+    @pytest.mark.parametrize(
+        ("wait", "capped"),
+        [("25", str(MAX_WAIT)), ("1.5", "1.5"), ("soon", "soon")],
+    )
+    def test_wait_capped(self, user: User, rf: RequestFactory, wait, capped):
+        subrequest = SubRequest(
+            rf.get("/api/batch/"),
+            user,
+            "/api/documents/1/status/",
+            f"status=sent&wait={wait}",
+        )
+
+        assert subrequest.GET["wait"] == capped
+        assert subrequest.META["QUERY_STRING"] == f"status=sent&wait={capped}"
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
+
+from signsecure.core import caching
+from signsecure.core.caching import aget_or_build
+from signsecure.core.caching import bump_version
+from signsecure.core.caching import get_or_build
+from signsecure.core.caching import invalidate_on_commit
+from signsecure.core.caching import response_cache_key
+from signsecure.core.tiered import tiered_cache
+from signsecure.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    tiered_cache.clear()
+    yield
+    tiered_cache.clear()
+
+
+@pytest.fixture
+def request_():
+    request = RequestFactory().get("/api/documents/1/?expand=signers")
+    request.user = UserFactory.build(id=7)
+    return request
+
+
+def test_key_changes_with_version(request_):
+    key = response_cache_key(request_, "document", [("document", 1)])
+    assert response_cache_key(request_, "document", [("document", 1)]) == key
+
+    bump_version("document", 1)
+
+    assert response_cache_key(request_, "document", [("document", 1)]) != key
+    assert response_cache_key(request_, "document", [("document", 2)]) != key
+
+
+def test_lost_version_never_matches_again(request_):
+    key = response_cache_key(request_, "document", [("document", 1)])
+
+    # Evicted from Redis, and from the local tier of a process starting up.
+    cache.delete("version:document:1")
+    tiered_cache.local.clear()
+
+    assert response_cache_key(request_, "document", [("document", 1)]) != key
+
+
+def test_invalidated_on_commit(request_, django_capture_on_commit_callbacks):
+    key = response_cache_key(request_, "document", [("document", 1)])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_on_commit("document", 1)
+        assert response_cache_key(request_, "document", [("document", 1)]) == key
+
+    assert response_cache_key(request_, "document", [("document", 1)]) != key
+
+
+def test_get_or_build_caches():
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"value": len(calls)}
+
+    assert get_or_build("key", build) == {"value": 1}
+    assert get_or_build("key", build) == {"value": 1}
+    assert len(calls) == 1
+
+
+def test_get_or_build_waits_for_builder():
+    cache.add("key:lock", 1)
+    builder = threading.Timer(0.1, cache.set, ["key", "built elsewhere"])
+    builder.start()
+
+    assert get_or_build("key", lambda: "built here") == "built elsewhere"
+    builder.join()
+
+
+def test_get_or_build_after_failed_build(monkeypatch):
+    monkeypatch.setattr(caching, "WAIT_SECONDS", 0.1)
+    cache.add("key:lock", 1)
+
+    assert get_or_build("key", lambda: "built here") == "built here"
+
+
+def test_get_or_build_releases_lock_on_error():
+    def build():
+        raise LookupError
+
+    with pytest.raises(LookupError):
+        get_or_build("key", build)
+
+    assert cache.get("key:lock") is None
+
+
+def test_aget_or_build():
+    async def build():
+        return "built"
+
+    assert asyncio.run(aget_or_build("key", build)) == "built"
+    assert cache.get("key") == "built"
@@ -0,0 +1,84 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+
+from signsecure.core import counts
+from signsecure.core.counts import queryset_count
+from signsecure.core.counts import refresh_table_counts
+from signsecure.core.counts import table_count
+from signsecure.core.pagination import ApproximateCountPaginator
+from signsecure.users.models import User
+from signsecure.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def analyzed_users():
+    users = UserFactory.create_batch(5)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE users_user")
+    return users
+
+
+def test_small_table_counted_exactly(analyzed_users):
+    UserFactory()
+
+    assert table_count(User) == len(analyzed_users) + 1
+
+
+def test_large_table_estimated(analyzed_users, monkeypatch):
+    monkeypatch.setattr(counts, "EXACT_COUNT_THRESHOLD", 2)
+    UserFactory()
+
+    # The estimate is as of the last ANALYZE, until the counts are refreshed.
+    assert table_count(User) == len(analyzed_users)
+    assert refresh_table_counts()["users.User"] == len(analyzed_users) + 1
+    assert table_count(User) == len(analyzed_users) + 1
+
+
+def test_queryset_counted_exactly(analyzed_users, django_assert_num_queries):
+    users = User.objects.filter(pk__gte=analyzed_users[1].pk)
+
+    with django_assert_num_queries(1) as context:
+        assert queryset_count(users) == len(analyzed_users) - 1
+
+    assert "EXPLAIN" not in context.captured_queries[0]["sql"]
+
+
+def test_large_queryset_estimated(analyzed_users, monkeypatch):
+    monkeypatch.setattr(counts, "EXACT_COUNT_THRESHOLD", 2)
+    monkeypatch.setattr(counts, "estimated_count", lambda queryset: 1000)
+    users = User.objects.filter(pk__gte=analyzed_users[1].pk)
+
+    assert queryset_count(users) == 1000  # noqa: PLR2004
+
+
+def test_large_queryset_estimate_at_least_threshold(analyzed_users, monkeypatch):
+    monkeypatch.setattr(counts, "EXACT_COUNT_THRESHOLD", 2)
+    monkeypatch.setattr(counts, "estimated_count", lambda queryset: 0)
+    users = User.objects.filter(pk__gte=analyzed_users[1].pk)
+
+    assert queryset_count(users) == 2  # noqa: PLR2004
+
+
+def test_small_queryset_of_large_table_counted_exactly(analyzed_users, monkeypatch):
+    monkeypatch.setattr(counts, "EXACT_COUNT_THRESHOLD", 2)
+    monkeypatch.setattr(counts, "estimated_count", lambda queryset: 1000)
+    users = User.objects.filter(pk=analyzed_users[0].pk)
+
+    assert queryset_count(users) == 1
+
+
+def test_paginator(analyzed_users):
+    paginator = ApproximateCountPaginator(User.objects.order_by("pk"), 2)
+
+    assert paginator.count == len(analyzed_users)
+    assert paginator.num_pages == 3  # noqa: PLR2004
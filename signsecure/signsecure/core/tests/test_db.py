@@ -0,0 +1,39 @@
+from signsecure.core import db
+from signsecure.core.db import release_connections
+
+
+class FakeConnection:
+    def __init__(self, *, pool: bool, in_atomic_block: bool = False) -> None:
+        self.settings_dict = {"OPTIONS": {"pool": {"max_size": 4}} if pool else {}}
+        self.in_atomic_block = in_atomic_block
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeConnections:
+    def __init__(self, *connections: FakeConnection) -> None:
+        self.connections = connections
+
+    def all(self, *, initialized_only: bool = False):
+        return list(self.connections)
+
+
+def test_release_connections(monkeypatch):
+    pooled = FakeConnection(pool=True)
+    in_transaction = FakeConnection(pool=True, in_atomic_block=True)
+    persistent = FakeConnection(pool=False)
+    monkeypatch.setattr(
+        db,
+        "connections",
+        FakeConnections(pooled, in_transaction, persistent),
+    )
+
+    release_connections()
+
+    assert [pooled.closed, in_transaction.closed, persistent.closed] == [
+        True,
+        False,
+        False,
+    ]
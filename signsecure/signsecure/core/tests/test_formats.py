@@ -0,0 +1,88 @@
+from datetime import UTC
+from datetime import datetime
+from decimal import Decimal
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from django.urls import reverse
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from signsecure.core.parsers import MessagePackParser
+from signsecure.core.parsers import ORJSONParser
+from signsecure.core.renderers import MessagePackRenderer
+from signsecure.core.renderers import ORJSONRenderer
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.users.models import User
+
+DATA = {
+    "title": "Contrat signé\u2028",
+    "created": datetime(2025, 5, 1, tzinfo=UTC),
+    "amount": Decimal("12.50"),
+    "signers": [{"id": 1, "order": 1.5, "signed_at": None}],
+}
+
+
+def test_orjson_renderer_matches_json_renderer():
+    assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+
+def test_orjson_renderer_non_string_keys():
+    data = {1: "one", None: "none", "counts": {2: 3}}
+
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_orjson_parser():
+    parsed = ORJSONParser().parse(BytesIO(b'{"title": "Contrat sign\\u00e9"}'))
+
+    assert parsed == {"title": "Contrat signé"}
+    with pytest.raises(ParseError):
+        ORJSONParser().parse(BytesIO(b'{"title": '))
+
+
+class TestMessagePack:
+    def test_round_trip(self):
+        content = MessagePackRenderer().render(DATA)
+
+        assert MessagePackParser().parse(BytesIO(content)) == {
+            "title": "Contrat signé\u2028",
+            "created": "2025-05-01T00:00:00Z",
+            "amount": 12.5,  # As JSONRenderer renders it.
+            "signers": [{"id": 1, "order": 1.5, "signed_at": None}],
+        }
+
+    def test_parse_error(self):
+        with pytest.raises(ParseError):
+            MessagePackParser().parse(BytesIO(b"\xc1"))
+
+    @pytest.mark.django_db
+    def test_negotiated(self, user: User, client):
+        client.force_login(user)
+        body = MessagePackRenderer().render({"name": "Ada"})
+
+        response = client.patch(
+            reverse("api:user-detail", kwargs={"pk": user.pk}),
+            body,
+            content_type="application/msgpack",
+            headers={"Accept": "application/msgpack"},
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"] == "application/msgpack"
+        assert MessagePackParser().parse(BytesIO(response.content))["name"] == "Ada"
+
+    @pytest.mark.django_db
+    def test_document_detail(self, user: User, client):
+        document = DocumentFactory(owner=user)
+        client.force_login(user)
+
+        response = client.get(
+            reverse("api:document-detail", kwargs={"pk": document.pk}),
+            headers={"Accept": "application/msgpack"},
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        body = MessagePackParser().parse(BytesIO(response.content))
+        assert body["id"] == document.pk
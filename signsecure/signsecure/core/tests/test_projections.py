@@ -0,0 +1,27 @@
+from datetime import UTC
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from django.utils import timezone
+from rest_framework.fields import DateTimeField
+from rest_framework.test import APIRequestFactory
+
+from signsecure.core.projections import datetime_repr
+from signsecure.core.projections import detail_url
+
+
+def test_datetime_repr():
+    value = datetime(2025, 5, 1, 12, 30, 15, 250, tzinfo=UTC)
+
+    for tz in [UTC, ZoneInfo("America/New_York")]:
+        with timezone.override(tz):
+            assert datetime_repr(value, tz) == DateTimeField().to_representation(value)
+    assert datetime_repr(None, UTC) is None
+
+
+def test_detail_url():
+    request = APIRequestFactory().get("/")
+
+    url = detail_url(request, "api:document-detail")
+
+    assert url(42) == "http://testserver/api/documents/42/"
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+from django.core.signing import get_cookie_signer
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from signsecure.core import replicas
+from signsecure.core.middleware import ReplicaMiddleware
+from signsecure.core.replicas import PIN_COOKIE
+from signsecure.core.replicas import begin_request
+from signsecure.core.replicas import end_request
+from signsecure.core.replicas import replica_lag
+from signsecure.users.models import User
+from signsecure.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def lags(settings, monkeypatch):
+    """Two replicas, with lags set by the test."""
+    settings.DATABASE_REPLICAS = ["replica1", "replica2"]
+    settings.REPLICA_MAX_LAG_SECONDS = 5
+    lags: dict[str, float | None] = {"replica1": 0.0, "replica2": 0.0}
+    monkeypatch.setattr(replicas, "replica_lag", lags.__getitem__)
+    monkeypatch.setattr(replicas, "_health", {})
+    return lags
+
+
+def read_alias(request):
+    """Handle ``request``, returning the alias users were read from."""
+    aliases = []
+
+    def view(request):
+        aliases.append(router.db_for_read(User))
+        return HttpResponse()
+
+    ReplicaMiddleware(view)(request)
+    return aliases[0]
+
+
+def test_safe_request_reads_from_replica(lags):
+    assert read_alias(RequestFactory().get("/")) in {"replica1", "replica2"}
+
+
+def test_unsafe_request_reads_from_primary(lags):
+    assert read_alias(RequestFactory().post("/")) == "default"
+
+
+def test_reads_outside_requests_use_primary(lags):
+    assert router.db_for_read(User) == "default"
+
+
+def test_lagging_replica_skipped(lags):
+    lags["replica1"] = 30.0
+    lags["replica2"] = None
+
+    assert read_alias(RequestFactory().get("/")) == "default"
+
+    replicas._health.clear()  # noqa: SLF001
+    lags["replica2"] = 1.0
+    assert read_alias(RequestFactory().get("/")) == "replica2"
+
+
+def test_replica_chosen_once_per_request(lags, monkeypatch):
+    chosen = iter(["replica1", "replica2"])
+    monkeypatch.setattr(replicas, "choose_replica", lambda: next(chosen))
+    token = begin_request(replica=True)
+
+    aliases = {router.db_for_read(User) for _ in range(3)}
+
+    end_request(token)
+    assert aliases == {"replica1"}
+
+
+def test_reads_after_write_use_primary(lags):
+    token = begin_request(replica=True)
+    assert router.db_for_read(User) != "default"
+    UserFactory()
+    assert router.db_for_read(User) == "default"
+    assert end_request(token)
+
+
+def test_write_pins_client_to_primary(lags):
+    def view(request):
+        UserFactory()
+        return HttpResponse()
+
+    response = ReplicaMiddleware(view)(RequestFactory().get("/"))
+
+    cookie = response.cookies[PIN_COOKIE]
+    assert cookie["max-age"] == 15  # noqa: PLR2004
+    request = RequestFactory().get("/")
+    request.COOKIES[PIN_COOKIE] = cookie.value
+    assert read_alias(request) == "default"
+
+
+def test_write_pins_token_client_to_primary(lags):
+    def view(request):
+        UserFactory()
+        return HttpResponse()
+
+    factory = RequestFactory(headers={"Authorization": "Token abc"})
+    response = ReplicaMiddleware(view)(factory.get("/"))
+
+    assert PIN_COOKIE in response.cookies
+    # Without the cookie, which API clients do not keep.
+    assert read_alias(factory.get("/")) == "default"
+    other = RequestFactory(headers={"Authorization": "Token def"})
+    assert read_alias(other.get("/")) != "default"
+
+
+def test_forged_pin_ignored(lags):
+    request = RequestFactory().get("/")
+    request.COOKIES[PIN_COOKIE] = get_cookie_signer(salt="other").sign("1")
+
+    assert read_alias(request) != "default"
+
+
+def test_async_middleware(lags):
+    aliases = []
+
+    async def view(request):
+        aliases.append(router.db_for_read(User))
+        return HttpResponse()
+
+    response = asyncio.run(ReplicaMiddleware(view)(RequestFactory().get("/")))
+
+    assert aliases[0] in {"replica1", "replica2"}
+    assert PIN_COOKIE not in response.cookies
+
+
+def test_primary_has_no_lag():
+    assert replica_lag("default") == 0.0
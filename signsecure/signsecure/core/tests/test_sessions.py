@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.sessions.backends.db import SessionStore as DBSessionStore
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils import timezone
+
+from signsecure.core.middleware import SessionMiddleware
+from signsecure.core.sessions import SessionStore
+from signsecure.core.tiered import tiered_cache
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    tiered_cache.clear()
+    yield
+    tiered_cache.clear()
+
+
+def db_session(**data) -> str:
+    store = DBSessionStore()
+    store.update(data)
+    store.create()
+    assert store.session_key is not None
+    return store.session_key
+
+
+class TestSessionStore:
+    def test_database_session_moved_to_cache(self, settings):
+        settings.SESSION_DB_FALLBACK = True
+        key = db_session(step=1)
+
+        assert SessionStore(key).load() == {"step": 1}
+        assert not Session.objects.filter(pk=key).exists()
+        assert SessionStore(key).load() == {"step": 1}
+
+    def test_without_fallback(self, settings):
+        settings.SESSION_DB_FALLBACK = False
+        key = db_session(step=1)
+
+        assert SessionStore(key).load() == {}
+
+    def test_expired_database_session_ignored(self, settings):
+        settings.SESSION_DB_FALLBACK = True
+        key = db_session(step=1)
+        Session.objects.filter(pk=key).update(expire_date=timezone.now())
+
+        store = SessionStore(key)
+
+        assert store.load() == {}
+        assert store.session_key is None
+
+    def test_migrate_sessions(self, settings):
+        settings.SESSION_ENGINE = "signsecure.core.sessions"
+        keys = [db_session(step=step) for step in range(3)]
+
+        call_command("migrate_sessions", batch_size=2)
+
+        assert not Session.objects.exists()
+        settings.SESSION_DB_FALLBACK = False
+        assert [SessionStore(key).load()["step"] for key in keys] == [0, 1, 2]
+
+
+def test_purge_sessions():
+    live = db_session()
+    for _ in range(5):
+        db_session()
+    Session.objects.exclude(pk=live).update(
+        expire_date=timezone.now() - timedelta(days=1),
+    )
+
+    call_command("purge_sessions", batch_size=2)
+
+    assert list(Session.objects.values_list("pk", flat=True)) == [live]
+
+
+class TestSignerSessions:
+    def handle(self, request, **data):
+        def view(request):
+            request.session.update(data)
+            return HttpResponse()
+
+        return SessionMiddleware(view)(request)
+
+    def test_signer_session_in_signed_cookie(self, settings):
+        response = self.handle(RequestFactory().get("/sign/abc/"), step=2)
+
+        assert settings.SESSION_COOKIE_NAME not in response.cookies
+        cookie = response.cookies[settings.SIGNER_SESSION_COOKIE_NAME].value
+        assert not Session.objects.exists()
+
+        request = RequestFactory().get("/sign/abc/")
+        request.COOKIES[settings.SIGNER_SESSION_COOKIE_NAME] = cookie
+        self.handle(request)
+        assert request.session["step"] == 2  # noqa: PLR2004
+
+    def test_other_pages_use_session_engine(self, settings):
+        response = self.handle(RequestFactory().get("/about/"), step=2)
+
+        assert settings.SIGNER_SESSION_COOKIE_NAME not in response.cookies
+        key = response.cookies[settings.SESSION_COOKIE_NAME].value
+        assert Session.objects.filter(pk=key).exists()
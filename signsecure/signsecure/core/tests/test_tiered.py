@@ -0,0 +1,172 @@
+import queue
+import threading
+
+import pytest
+import redis
+from django.contrib.sites.models import SITE_CACHE
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+
+from signsecure.core import tiered
+from signsecure.core.tiered import LocalCache
+from signsecure.core.tiered import TieredCache
+from signsecure.core.tiered import tiered_cache
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    tiered_cache.clear()
+    yield
+    tiered_cache.clear()
+
+
+class FakeRedis:
+    """One Redis server's pub/sub: every subscriber gets every message."""
+
+    def __init__(self) -> None:
+        self.subscribers: list[queue.Queue] = []
+        self.subscribed = threading.Semaphore(0)
+
+    def publish(self, channel: str, message: str) -> None:
+        for subscriber in self.subscribers:
+            subscriber.put({"data": message.encode()})
+
+    def pubsub(self, **kwargs):
+        return FakePubSub(self)
+
+
+class FakePubSub:
+    def __init__(self, server: FakeRedis) -> None:
+        self.server = server
+        self.messages: queue.Queue = queue.Queue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def subscribe(self, channel: str) -> None:
+        self.server.subscribers.append(self.messages)
+        self.server.subscribed.release()
+
+    def listen(self):
+        while True:
+            yield self.messages.get()
+
+
+@pytest.fixture
+def broadcast(settings, monkeypatch):
+    """Broadcast invalidations between TieredCache instances, as processes."""
+    server = FakeRedis()
+    settings.LOCAL_CACHE_REDIS_URL = "redis://broadcast"
+    monkeypatch.setattr(tiered, "get_redis", lambda: server)
+    monkeypatch.setattr(redis.Redis, "from_url", lambda url: server)
+    return server
+
+
+def listening(cache: TieredCache, server: FakeRedis) -> TieredCache:
+    """Start ``cache`` listening for invalidations, as its first read does."""
+    cache.get("unused")
+    assert server.subscribed.acquire(timeout=5)
+    return cache
+
+
+def invalidated(cache: TieredCache) -> threading.Event:
+    """An event set once ``cache`` has handled an invalidation."""
+    event = threading.Event()
+    cache.invalidation_handlers.append(lambda key: event.set())
+    return event
+
+
+def test_local_cache_evicts_least_recently_used():
+    local = LocalCache(max_size=2, timeout=60)
+    local.set("a", 1)
+    local.set("b", 2)
+    local.get("a")
+
+    local.set("c", 3)
+
+    assert (local.get("a"), local.get("b"), local.get("c")) == (1, None, 3)
+
+
+def test_local_cache_expires():
+    local = LocalCache(max_size=2, timeout=-1)
+    local.set("a", 1)
+
+    assert local.get("a") is None
+
+
+def test_hot_reads_served_locally():
+    tiered_cache.set("key", "value", None)
+    cache.delete("key")
+
+    assert tiered_cache.get("key") == "value"
+    assert tiered_cache.get_many(["key", "other"]) == {"key": "value"}
+
+
+def test_reads_fill_local_tier():
+    cache.set("key", "value")
+    assert tiered_cache.get("key") == "value"
+
+    cache.set("key", "changed")
+
+    assert tiered_cache.get("key") == "value"
+
+
+def test_changes_invalidate_local_tier():
+    tiered_cache.set("key", 1, None)
+    tiered_cache.set("other", 1, None)
+
+    tiered_cache.incr("key")
+    tiered_cache.delete("other")
+
+    assert tiered_cache.get("key") == 2  # noqa: PLR2004
+    assert tiered_cache.get("other") is None
+
+
+def test_broadcast_drops_other_processes_copies(broadcast):
+    process = TieredCache()
+    other = listening(TieredCache(), broadcast)
+    tiered_cache.set("key", "value", None)
+    assert other.get("key") == "value"
+    other_invalidated = invalidated(other)
+
+    process.delete("key")
+
+    assert other_invalidated.wait(5)
+    assert other.get("key") is None
+
+
+def test_invalidation_during_read_not_undone(broadcast, monkeypatch):
+    process = listening(TieredCache(), broadcast)
+    cache.set("key", "old")
+
+    class ChangedWhileRead:
+        """Another process changes the key as its old value is read."""
+
+        def get(self, key):
+            value = cache.get(key)
+            cache.set(key, "new")
+            event = invalidated(process)
+            broadcast.publish("", key)
+            assert event.wait(5)
+            return value
+
+    monkeypatch.setattr(tiered, "shared_cache", ChangedWhileRead())
+    assert process.get("key") == "old"
+    monkeypatch.setattr(tiered, "shared_cache", cache)
+
+    assert process.get("key") == "new"
+
+
+def test_site_change_drops_cached_sites():
+    site = Site.objects.get_current()
+    # Cached by a request for another host, which Django does not drop.
+    SITE_CACHE["alias.example.com"] = site
+
+    site.save()
+
+    assert "alias.example.com" not in SITE_CACHE
@@ -0,0 +1,227 @@
+"""
+A two-tier cache: an LRU in each process in front of the shared cache.
+
+Reads served by the process's own LRU cost no round trip to Redis. Entries
+stay there for at most ``LOCAL_CACHE_TIMEOUT`` seconds. Changing a key
+through ``delete()`` or ``incr()`` also broadcasts it on the Redis channel
+``LOCAL_CACHE_CHANNEL``, and every process, each listening from a daemon
+thread, drops its copy at once; the timeout only bounds how stale a process
+that missed a broadcast, e.g. while reconnecting, can be. Without
+``LOCAL_CACHE_REDIS_URL`` nothing is broadcast.
+
+Values are shared by every caller in the process: do not modify them.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Iterable
+from functools import cache
+from typing import Any
+
+import redis
+from django.conf import settings
+from django.core.cache import cache as shared_cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before listening again after losing the connection.
+RECONNECT_SECONDS = 5
+
+
+class LocalCache:
+    """
+    A thread-safe LRU of at most ``max_size`` entries, each kept ``timeout``.
+
+    ``generation`` changes whenever an entry is deleted or the cache cleared.
+    A value read from elsewhere is only stored if the generation is the one
+    read before fetching it, so that an invalidation arriving in between is
+    not undone by storing the value it invalidated.
+    """
+
+    def __init__(self, max_size: int, timeout: float) -> None:
+        self.max_size = max_size
+        self.timeout = timeout
+        self.generation = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, generation: int | None = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+
+@cache
+def get_redis() -> redis.Redis | None:
+    """The client invalidations are broadcast with, or None if there is none."""
+    if not settings.LOCAL_CACHE_REDIS_URL:
+        return None
+    return redis.Redis.from_url(settings.LOCAL_CACHE_REDIS_URL)
+
+
+class TieredCache:
+    def __init__(self) -> None:
+        self.local = LocalCache(
+            settings.LOCAL_CACHE_MAX_SIZE,
+            settings.LOCAL_CACHE_TIMEOUT,
+        )
+        # Called with every key invalidated, in any process.
+        self.invalidation_handlers: list[Callable[[str], None]] = []
+        self._listening_pid: int | None = None
+        self._listen_lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        self._listen()
+        generation = self.local.generation
+        value = self.local.get(key)
+        if value is None:
+            value = shared_cache.get(key)
+            if value is not None:
+                self.local.set(key, value, generation)
+        return value
+
+    async def aget(self, key: str) -> Any:
+        self._listen()
+        generation = self.local.generation
+        value = self.local.get(key)
+        if value is None:
+            value = await shared_cache.aget(key)
+            if value is not None:
+                self.local.set(key, value, generation)
+        return value
+
+    def _local_many(
+        self,
+        keys: Iterable[str],
+    ) -> tuple[int, dict[str, Any], list[str]]:
+        self._listen()
+        generation = self.local.generation
+        values, missing = {}, []
+        for key in keys:
+            if (value := self.local.get(key)) is None:
+                missing.append(key)
+            else:
+                values[key] = value
+        return generation, values, missing
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        generation, values, missing = self._local_many(keys)
+        if missing:
+            found = shared_cache.get_many(missing)
+            for key, value in found.items():
+                self.local.set(key, value, generation)
+            values.update(found)
+        return values
+
+    async def aget_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        generation, values, missing = self._local_many(keys)
+        if missing:
+            found = await shared_cache.aget_many(missing)
+            for key, value in found.items():
+                self.local.set(key, value, generation)
+            values.update(found)
+        return values
+
+    def set(self, key: str, value: Any, timeout: float | None) -> None:
+        """Set a key that was missing; use ``delete()`` to change one."""
+        generation = self.local.generation
+        shared_cache.set(key, value, timeout)
+        self.local.set(key, value, generation)
+
+    async def aset(
+        self,
+        key: str,
+        value: Any,
+        timeout: float | None,  # noqa: ASYNC109
+    ) -> None:
+        generation = self.local.generation
+        await shared_cache.aset(key, value, timeout)
+        self.local.set(key, value, generation)
+
+    def incr(self, key: str) -> int:
+        """Increment a number in the shared cache, raising ValueError if missing."""
+        try:
+            return shared_cache.incr(key)
+        finally:
+            self.invalidate(key)
+
+    def delete(self, key: str) -> None:
+        shared_cache.delete(key)
+        self.invalidate(key)
+
+    def invalidate(self, key: str) -> None:
+        """Drop the local copies of a key, in this process and all others."""
+        self._drop(key)
+        if (client := get_redis()) is not None:
+            try:
+                client.publish(settings.LOCAL_CACHE_CHANNEL, key)
+            except redis.RedisError:
+                logger.warning("Could not broadcast invalidation of %s.", key)
+
+    def clear(self) -> None:
+        """Clear the shared cache and this process's local copies."""
+        shared_cache.clear()
+        self.local.clear()
+
+    def _drop(self, key: str) -> None:
+        self.local.delete(key)
+        for handler in self.invalidation_handlers:
+            handler(key)
+
+    def _listen(self) -> None:
+        """Start listening for invalidations, once per process."""
+        if self._listening_pid == os.getpid() or get_redis() is None:
+            return
+        with self._listen_lock:
+            if self._listening_pid == os.getpid():
+                return
+            self._listening_pid = os.getpid()
+            # Forked processes inherit the parent's entries, not its thread.
+            self.local.clear()
+            threading.Thread(target=self._listener, daemon=True).start()
+
+    def _listener(self) -> None:
+        client = redis.Redis.from_url(settings.LOCAL_CACHE_REDIS_URL)
+        while True:
+            try:
+                with client.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    pubsub.subscribe(settings.LOCAL_CACHE_CHANNEL)
+                    # Anything may have changed while disconnected.
+                    self.local.clear()
+                    for message in pubsub.listen():
+                        self._drop(message["data"].decode())
+            except redis.RedisError:
+                logger.warning("Lost the cache invalidation channel.", exc_info=True)
+                time.sleep(RECONNECT_SECONDS)
+
+
+tiered_cache = TieredCache()
@@ -0,0 +1,52 @@
+from django.contrib import admin
+
+from .models import Document
+from .models import FormField
+from .models import Signer
+from .models import Template
+from .models import TemplateField
+from .models import TemplatePage
+from .models import TemplateRole
+
+
+class TemplatePageInline(admin.TabularInline):
+    model = TemplatePage
+    extra = 0
+
+
+class TemplateRoleInline(admin.TabularInline):
+    model = TemplateRole
+    extra = 0
+
+
+class TemplateFieldInline(admin.TabularInline):
+    model = TemplateField
+    extra = 0
+
+
+@admin.register(Template)
+class TemplateAdmin(admin.ModelAdmin):
+    list_display = ["title", "owner", "page_count", "created"]
+    search_fields = ["title"]
+    raw_id_fields = ["owner"]
+    inlines = [TemplatePageInline, TemplateRoleInline, TemplateFieldInline]
+
+
+class SignerInline(admin.TabularInline):
+    model = Signer
+    extra = 0
+
+
+class FormFieldInline(admin.TabularInline):
+    model = FormField
+    extra = 0
+    raw_id_fields = ["signer"]
+
+
+@admin.register(Document)
+class DocumentAdmin(admin.ModelAdmin):
+    list_display = ["title", "owner", "status", "created"]
+    list_filter = ["status"]
+    search_fields = ["title"]
+    raw_id_fields = ["owner", "template"]
+    inlines = [SignerInline, FormFieldInline]
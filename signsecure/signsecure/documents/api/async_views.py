@@ -0,0 +1,90 @@
+"""
+Async views for the document reads made on every signing page load and poll.
+
+See signsecure/core/api.py. The ORM is used through its async methods and
+status changes are waited for on Redis with an async client, so none of
+these hold a thread while they wait.
+"""
+
+import asyncio
+import contextlib
+from http import HTTPStatus
+
+from django.conf import settings
+from django.http import Http404
+from django.http import JsonResponse
+
+from signsecure.core.api import async_api_view
+from signsecure.core.caching import aget_or_build
+from signsecure.core.caching import aresponse_cache_key
+from signsecure.core.replicas import primary_reads
+from signsecure.documents.models import Document
+from signsecure.documents.models import DocumentCounter
+from signsecure.outbox.subscriptions import event_subscription
+from signsecure.outbox.subscriptions import next_event
+
+from .serializers import DocumentSerializer
+from .serializers import DocumentStatusQuerySerializer
+from .serializers import DocumentStatusSerializer
+
+
+async def _get_document(user, pk, *lookups) -> Document:
+    document = (
+        await Document.objects.prefetch_related(*lookups)
+        .filter(owner_id=user.id, pk=pk)
+        .afirst()
+    )
+    if document is None:
+        msg = "No Document matches the given query."
+        raise Http404(msg)
+    return document
+
+
+@async_api_view
+async def document_session(request, user, pk):
+    """The document as the signing page loads it, with its signers and fields."""
+
+    async def build():
+        document = await _get_document(user, pk, "signers", "fields__image")
+        return DocumentSerializer(document, context={"request": request}).data
+
+    key = await aresponse_cache_key(request, user.id, "document", [("document", pk)])
+    return JsonResponse(await aget_or_build(key, build))
+
+
+@async_api_view
+async def document_status(request, user, pk):
+    """
+    The status of a document and its signers.
+
+    With ``?status=<status>&wait=<seconds>``, waits up to that long for the
+    status to change from the one given before answering.
+    """
+    params = DocumentStatusQuerySerializer(data=request.GET)
+    if not params.is_valid():
+        return JsonResponse(params.errors, status=HTTPStatus.BAD_REQUEST)
+    known, wait = params.validated_data.get("status"), params.validated_data["wait"]
+    subscription = (
+        event_subscription("document.status")
+        if known and wait
+        else contextlib.nullcontext()
+    )
+    async with subscription as pubsub:
+        document = await _get_document(user, pk, "signers")
+        if pubsub is not None and document.status == known:
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(wait):
+                    await next_event(pubsub, document)
+                # The replicas may not have the change the event was about yet.
+                with primary_reads():
+                    document = await _get_document(user, pk, "signers")
+    return JsonResponse(DocumentStatusSerializer(document).data)
+
+
+@async_api_view
+async def document_counts(request, user):
+    """The user's document count per status, and the tenant's for staff."""
+    data = {"user": await DocumentCounter.objects.acounts(settings.SITE_ID, user.id)}
+    if user.is_staff:
+        data["tenant"] = await DocumentCounter.objects.acounts(settings.SITE_ID)
+    return JsonResponse(data)
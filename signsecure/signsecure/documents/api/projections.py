@@ -0,0 +1,174 @@
+from collections import defaultdict
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Sequence
+from operator import itemgetter
+
+from django.http import HttpRequest
+from django.utils import timezone
+
+from signsecure.core.projections import Projection
+from signsecure.core.projections import datetime_repr
+from signsecure.core.projections import file_url
+from signsecure.documents.models import AuditEvent
+from signsecure.documents.models import Document
+from signsecure.documents.models import FormField
+from signsecure.documents.models import SignatureImage
+from signsecure.documents.models import Signer
+
+from .serializers import DocumentSerializer
+
+
+class DocumentProjection(Projection):
+    """
+    The rows of ``DocumentSerializer``, limited to a fieldset.
+
+    Only the columns of the fields in the fieldset are read, and signers,
+    form fields and audit events only when they are in it.
+    """
+
+    # The document column each field is read from.
+    columns = {
+        "id": "id",
+        "title": "title",
+        "description": "description",
+        "status": "status",
+        "template": "template_id",
+        "file": "file",
+        "file_type": "file_type",
+        "expires_at": "expires_at",
+        "created": "created",
+        "modified": "modified",
+    }
+    signer_fields = (
+        "document_id",
+        "id",
+        "email",
+        "name",
+        "role",
+        "order",
+        "status",
+        "signed_at",
+        "viewed_at",
+    )
+    form_field_fields = (
+        "document_id",
+        "id",
+        "type",
+        "x",
+        "y",
+        "width",
+        "height",
+        "page",
+        "required",
+        "signer_id",
+        "value",
+        "image__file",
+        "label",
+    )
+    audit_event_fields = (
+        "document_id",
+        "id",
+        "timestamp",
+        "action",
+        "user_id",
+        "email",
+        "ip_address",
+        "user_agent",
+        "details",
+        "hash",
+    )
+
+    def __init__(self, fieldset: Sequence[str] | None = None) -> None:
+        self.fieldset = tuple(fieldset or DocumentSerializer.default_fields())
+        self.fields = (
+            "id",
+            *(self.columns[name] for name in self.fieldset if name in self.columns),
+        )
+
+    def project(self, rows: Iterable[dict], request: HttpRequest) -> list[dict]:
+        rows = list(rows)
+        ids = [row["id"] for row in rows]
+        tz = timezone.get_current_timezone()
+        document_file_url = file_url(request, Document._meta.get_field("file").storage)  # noqa: SLF001
+
+        getters: dict[str, Callable[[dict], object]] = {
+            "template": itemgetter("template_id"),
+            "file": lambda row: document_file_url(row["file"]),
+            "expires_at": lambda row: datetime_repr(row["expires_at"], tz),
+            "created": lambda row: datetime_repr(row["created"], tz),
+            "modified": lambda row: datetime_repr(row["modified"], tz),
+        }
+        if "signers" in self.fieldset:
+            signers = self._signers(ids)
+            getters["signers"] = lambda row: signers[row["id"]]
+        if "fields" in self.fieldset:
+            form_fields = self._form_fields(ids, request)
+            getters["fields"] = lambda row: form_fields[row["id"]]
+        if "audit_trail" in self.fieldset:
+            audit_trail = self._audit_trail(ids)
+            getters["audit_trail"] = lambda row: audit_trail[row["id"]]
+        fields = [(name, getters.get(name, itemgetter(name))) for name in self.fieldset]
+        return [{name: get(row) for name, get in fields} for row in rows]
+
+    def _signers(self, ids: list[int]) -> dict[int, list[dict]]:
+        tz = timezone.get_current_timezone()
+        signers = defaultdict(list)
+        for signer in Signer.objects.filter(document_id__in=ids).values(
+            *self.signer_fields,
+        ):
+            signers[signer.pop("document_id")].append(signer)
+            signer["signed_at"] = datetime_repr(signer["signed_at"], tz)
+            signer["viewed_at"] = datetime_repr(signer["viewed_at"], tz)
+        return signers
+
+    def _form_fields(
+        self,
+        ids: list[int],
+        request: HttpRequest,
+    ) -> dict[int, list[dict]]:
+        image_url = file_url(request, SignatureImage._meta.get_field("file").storage)  # noqa: SLF001
+        form_fields = defaultdict(list)
+        for field in (
+            FormField.objects.filter(document_id__in=ids)
+            .order_by("pk")
+            .values(*self.form_field_fields)
+        ):
+            form_fields[field.pop("document_id")].append(
+                {
+                    "id": field["id"],
+                    "type": field["type"],
+                    "x": field["x"],
+                    "y": field["y"],
+                    "width": field["width"],
+                    "height": field["height"],
+                    "page": field["page"],
+                    "required": field["required"],
+                    "signer": field["signer_id"],
+                    "value": field["value"],
+                    "image": image_url(field["image__file"]),
+                    "label": field["label"],
+                },
+            )
+        return form_fields
+
+    def _audit_trail(self, ids: list[int]) -> dict[int, list[dict]]:
+        tz = timezone.get_current_timezone()
+        audit_trail = defaultdict(list)
+        for event in AuditEvent.objects.filter(document_id__in=ids).values(
+            *self.audit_event_fields,
+        ):
+            audit_trail[event.pop("document_id")].append(
+                {
+                    "id": event["id"],
+                    "timestamp": datetime_repr(event["timestamp"], tz),
+                    "action": event["action"],
+                    "user": event["user_id"],
+                    "email": event["email"],
+                    "ip_address": event["ip_address"],
+                    "user_agent": event["user_agent"],
+                    "details": event["details"],
+                    "hash": event["hash"],
+                },
+            )
+        return audit_trail
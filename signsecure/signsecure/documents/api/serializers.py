@@ -0,0 +1,298 @@
+import base64
+
+from rest_framework import serializers
+
+from signsecure.core.fieldsets import FieldsetSerializerMixin
+from signsecure.documents.models import ArchiveExport
+from signsecure.documents.models import ArchiveExportPart
+from signsecure.documents.models import AuditEvent
+from signsecure.documents.models import Document
+from signsecure.documents.models import FormField
+from signsecure.documents.models import Signer
+from signsecure.documents.models import Template
+from signsecure.documents.models import TemplateField
+from signsecure.documents.models import TemplatePage
+from signsecure.documents.models import TemplateRole
+from signsecure.documents.models import TimestampLeaf
+
+
+class SignerSerializer(serializers.ModelSerializer[Signer]):
+    class Meta:
+        model = Signer
+        fields = [
+            "id",
+            "email",
+            "name",
+            "role",
+            "order",
+            "status",
+            "signed_at",
+            "viewed_at",
+        ]
+
+
+class FormFieldSerializer(serializers.ModelSerializer[FormField]):
+    image = serializers.FileField(source="image.file", read_only=True, allow_null=True)
+
+    class Meta:
+        model = FormField
+        fields = [
+            "id",
+            "type",
+            "x",
+            "y",
+            "width",
+            "height",
+            "page",
+            "required",
+            "signer",
+            "value",
+            "image",
+            "label",
+        ]
+
+
+class AuditEventSerializer(serializers.ModelSerializer[AuditEvent]):
+    class Meta:
+        model = AuditEvent
+        fields = [
+            "id",
+            "timestamp",
+            "action",
+            "user",
+            "email",
+            "ip_address",
+            "user_agent",
+            "details",
+            "hash",
+        ]
+
+
+class DocumentSerializer(
+    FieldsetSerializerMixin,
+    serializers.ModelSerializer[Document],
+):
+    signers = SignerSerializer(many=True, read_only=True)
+    fields = FormFieldSerializer(many=True, read_only=True)  # type: ignore[assignment]
+    audit_trail = AuditEventSerializer(many=True, read_only=True)
+
+    # Left out unless asked for with ?expand=, see core/fieldsets.py.
+    expandable_fields = ("audit_trail",)
+    field_prefetches = {
+        "signers": ["signers"],
+        "fields": ["fields__image"],
+        "audit_trail": ["audit_trail"],
+    }
+
+    class Meta:
+        model = Document
+        fields = [
+            "id",
+            "title",
+            "description",
+            "status",
+            "template",
+            "file",
+            "file_type",
+            "expires_at",
+            "created",
+            "modified",
+            "signers",
+            "fields",
+            "audit_trail",
+        ]
+        read_only_fields = ["status", "template", "created", "modified"]
+
+
+class DocumentStatusSerializer(serializers.ModelSerializer[Document]):
+    signers = SignerSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Document
+        fields = ["id", "status", "modified", "signers"]
+
+
+class DocumentStatusQuerySerializer(serializers.Serializer):
+    # Long polling: wait up to ``wait`` seconds while the status is ``status``.
+    status = serializers.ChoiceField(choices=Document.Status.choices, required=False)
+    wait = serializers.FloatField(min_value=0, max_value=25, default=0)
+
+
+class DocumentSearchSerializer(serializers.ModelSerializer[Document]):
+    signers = SignerSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Document
+        fields = [
+            "id",
+            "title",
+            "description",
+            "status",
+            "created",
+            "modified",
+            "signers",
+        ]
+
+
+class DocumentSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=255)
+    status = serializers.ChoiceField(choices=Document.Status.choices, required=False)
+
+
+class AuditTimestampSerializer(serializers.ModelSerializer[TimestampLeaf]):
+    """An audit event's timestamp, with what is needed to verify it offline."""
+
+    action = serializers.CharField(source="audit_event.action")
+    recorded_at = serializers.DateTimeField(source="audit_event.timestamp")
+    merkle_root = serializers.CharField(source="batch.root")
+    timestamped_at = serializers.DateTimeField(source="batch.timestamped_at")
+    token = serializers.SerializerMethodField()
+    verified = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TimestampLeaf
+        fields = [
+            "action",
+            "recorded_at",
+            "digest",
+            "proof",
+            "merkle_root",
+            "timestamped_at",
+            "token",
+            "verified",
+        ]
+
+    def get_token(self, leaf: TimestampLeaf) -> str:
+        """The DER-encoded RFC 3161 timestamp token, in base64."""
+        return base64.b64encode(bytes(leaf.batch.token)).decode()  # type: ignore[union-attr]
+
+    def get_verified(self, leaf: TimestampLeaf) -> bool:
+        return leaf.pk in self.context["verified"]
+
+
+class TemplatePageSerializer(serializers.ModelSerializer[TemplatePage]):
+    class Meta:
+        model = TemplatePage
+        fields = ["number", "image", "width", "height"]
+
+
+class TemplateRoleSerializer(serializers.ModelSerializer[TemplateRole]):
+    class Meta:
+        model = TemplateRole
+        fields = ["id", "name", "order"]
+
+
+class TemplateFieldSerializer(serializers.ModelSerializer[TemplateField]):
+    class Meta:
+        model = TemplateField
+        fields = [
+            "id",
+            "type",
+            "x",
+            "y",
+            "width",
+            "height",
+            "page",
+            "required",
+            "role",
+            "label",
+        ]
+
+
+class TemplateSerializer(serializers.ModelSerializer[Template]):
+    pages = TemplatePageSerializer(many=True, read_only=True)
+    roles = TemplateRoleSerializer(many=True, read_only=True)
+    fields = TemplateFieldSerializer(many=True, read_only=True)  # type: ignore[assignment]
+
+    class Meta:
+        model = Template
+        fields = [
+            "id",
+            "title",
+            "description",
+            "file",
+            "file_type",
+            "page_count",
+            "created",
+            "modified",
+            "pages",
+            "roles",
+            "fields",
+        ]
+
+
+class FieldValueSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    # A data: URL for signature and initials fields, see images.py.
+    value = serializers.CharField(allow_blank=True, trim_whitespace=False)
+
+
+class FillFieldsSerializer(serializers.Serializer):
+    fields = FieldValueSerializer(many=True, allow_empty=False)  # type: ignore[assignment]
+
+
+class TemplateSignerSerializer(serializers.Serializer):
+    role = serializers.CharField(max_length=100)
+    name = serializers.CharField(max_length=255)
+    email = serializers.EmailField()
+
+
+class TemplateInstantiateSerializer(serializers.Serializer):
+    title = serializers.CharField(max_length=255, required=False)
+    description = serializers.CharField(required=False, allow_blank=True)
+    expires_at = serializers.DateTimeField(required=False, allow_null=True)
+    signers = TemplateSignerSerializer(many=True)
+
+
+class ArchiveExportPartSerializer(serializers.ModelSerializer[ArchiveExportPart]):
+    class Meta:
+        model = ArchiveExportPart
+        fields = ["number", "file", "document_count"]
+
+
+class ArchiveExportSerializer(serializers.ModelSerializer[ArchiveExport]):
+    parts = ArchiveExportPartSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ArchiveExport
+        fields = [
+            "id",
+            "tenant",
+            "completed_from",
+            "completed_until",
+            "status",
+            "document_count",
+            "created",
+            "parts",
+        ]
+        read_only_fields = ["status", "document_count", "created"]
+
+    def validate_tenant(self, value):
+        if value and not self.context["request"].user.is_staff:
+            msg = "Only staff can export the whole tenant."
+            raise serializers.ValidationError(msg)
+        return value
+
+    def validate(self, attrs):
+        if attrs["completed_from"] >= attrs["completed_until"]:
+            msg = "The date range is empty."
+            raise serializers.ValidationError(msg)
+        return attrs
+
+
+class ArchiveExportQuerySerializer(serializers.Serializer):
+    completed_from = serializers.DateTimeField()
+    completed_until = serializers.DateTimeField()
+
+
+class AuditExportQuerySerializer(serializers.Serializer):
+    file_format = serializers.ChoiceField(choices=["ndjson", "csv"], default="ndjson")
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+    tenant = serializers.BooleanField(default=False)
+
+    def validate_tenant(self, value):
+        if value and not self.context["request"].user.is_staff:
+            msg = "Only staff can export the whole tenant."
+            raise serializers.ValidationError(msg)
+        return value
@@ -0,0 +1,342 @@
+from django.conf import settings
+from django.http import FileResponse
+from django.http import Http404
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import serializers
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.mixins import CreateModelMixin
+from rest_framework.mixins import ListModelMixin
+from rest_framework.mixins import RetrieveModelMixin
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from signsecure.core.caching import get_or_build
+from signsecure.core.caching import response_cache_key
+from signsecure.core.pagination import ApproximateCountPagination
+from signsecure.documents.exports import AUDIT_EXPORT_FORMATS
+from signsecure.documents.exports import archive_entries
+from signsecure.documents.exports import iter_export_documents
+from signsecure.documents.exports import stream_zip
+from signsecure.documents.images import fill_field
+from signsecure.documents.models import ArchiveExport
+from signsecure.documents.models import AuditEvent
+from signsecure.documents.models import Certificate
+from signsecure.documents.models import Document
+from signsecure.documents.models import Signer
+from signsecure.documents.models import Template
+from signsecure.documents.models import TimestampBatch
+from signsecure.documents.models import TimestampLeaf
+from signsecure.documents.search import search_documents
+from signsecure.documents.search import status_facets
+from signsecure.documents.tasks import build_archive_export
+from signsecure.documents.timestamps import merkle_root
+from signsecure.documents.timestamps import verify_batch
+from signsecure.outbox.messages import enqueue
+
+from .projections import DocumentProjection
+from .serializers import ArchiveExportQuerySerializer
+from .serializers import ArchiveExportSerializer
+from .serializers import AuditExportQuerySerializer
+from .serializers import AuditTimestampSerializer
+from .serializers import DocumentSearchQuerySerializer
+from .serializers import DocumentSearchSerializer
+from .serializers import DocumentSerializer
+from .serializers import FillFieldsSerializer
+from .serializers import FormFieldSerializer
+from .serializers import TemplateInstantiateSerializer
+from .serializers import TemplateSerializer
+
+
+class DocumentSearchPagination(ApproximateCountPagination):
+    default_limit = 20
+
+
+class DocumentViewSet(RetrieveModelMixin, ListModelMixin, GenericViewSet):
+    serializer_class = DocumentSerializer
+    queryset = Document.objects.all()
+    lookup_field = "pk"
+
+    def get_queryset(self, *args, **kwargs):
+        assert isinstance(self.request.user.id, int)
+        if self.action == "fill":
+            # Filled in by their signers, who need not own them.
+            return self.queryset.filter(
+                status=Document.Status.SENT,
+                signers__email__iexact=self.request.user.email,
+            ).distinct()
+        queryset = self.queryset.filter(owner_id=self.request.user.id)
+        if self.action == "retrieve":
+            fieldset = DocumentSerializer.fieldset(self.request)
+            queryset = DocumentSerializer.trim_queryset(queryset, fieldset)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action == "retrieve":
+            kwargs["fieldset"] = DocumentSerializer.fieldset(self.request)
+        return super().get_serializer(*args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        projection = DocumentProjection(DocumentSerializer.fieldset(request))
+        return projection.list_response(self, self.get_queryset())
+
+    def retrieve(self, request, *args, **kwargs):
+        # Reject unknown fields before looking in the cache.
+        DocumentSerializer.fieldset(request)
+        key = response_cache_key(request, "document", [("document", kwargs["pk"])])
+        retrieve = super().retrieve
+        return Response(
+            get_or_build(key, lambda: retrieve(request, *args, **kwargs).data),
+        )
+
+    @action(detail=True)
+    def certificate(self, request, pk=None):
+        return self._certificate_download(request, "file")
+
+    @action(detail=True)
+    def final(self, request, pk=None):
+        return self._certificate_download(request, "final_file")
+
+    def _certificate_download(self, request, field_name):
+        document = self.get_object()
+        certificate = Certificate.objects.filter(document=document).first()
+        if certificate is None:
+            msg = "The certificate of completion has not been generated yet."
+            raise Http404(msg)
+        field_file = getattr(certificate, field_name)
+        etag = f"{certificate.audit_hash}-{field_name}"
+        if field_name == "final_file" and certificate.signed_at:
+            etag += "-signed"
+        etag = quote_etag(etag)
+        response = get_conditional_response(request, etag=etag) or FileResponse(
+            field_file.open("rb"),
+            as_attachment=True,
+            filename=field_file.name.rsplit("/", 1)[-1],
+            content_type="application/pdf",
+        )
+        if (
+            field_name == "final_file"
+            and certificate.signed_at is None
+            and settings.DOCUMENT_SIGNING_KEY_FILE
+        ):
+            # Still waiting to be signed, see tasks.sign_unsigned_documents.
+            response["Cache-Control"] = "private, no-cache"
+        else:
+            # The stored files never change once rendered and signed.
+            response["Cache-Control"] = "private, max-age=31536000, immutable"
+        response["ETag"] = etag
+        return response
+
+    @action(detail=True, methods=["post"], serializer_class=FillFieldsSerializer)
+    def fill(self, request, pk=None):
+        """Fill in the requesting signer's fields, before they sign."""
+        document = self.get_object()
+        serializer = FillFieldsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        values = {
+            item["id"]: item["value"] for item in serializer.validated_data["fields"]
+        }
+        fields = document.fields.filter(
+            pk__in=values,
+            signer__email__iexact=request.user.email,
+            signer__status__in=[Signer.Status.PENDING, Signer.Status.VIEWED],
+        ).in_bulk()
+        if unknown := sorted(values.keys() - fields.keys()):
+            msg = f"Not fields you can fill: {', '.join(map(str, unknown))}."
+            raise serializers.ValidationError({"fields": [msg]})
+        errors = {}
+        for field_id, field in fields.items():
+            try:
+                fill_field(field, values[field_id])
+            except ValueError as exc:
+                errors[str(field_id)] = [str(exc)]
+        if errors:
+            # The fields filled already are rolled back with the request.
+            raise serializers.ValidationError({"fields": errors})
+        return Response(
+            FormFieldSerializer(
+                fields.values(),
+                many=True,
+                context={"request": request},
+            ).data,
+        )
+
+    @action(detail=True, serializer_class=AuditTimestampSerializer)
+    def timestamps(self, request, pk=None):
+        document = self.get_object()
+        leaves = (
+            TimestampLeaf.objects.filter(
+                audit_event__document=document,
+                batch__isnull=False,
+            )
+            .select_related("audit_event", "batch")
+            .order_by("audit_event__timestamp", "audit_event__pk")
+        )
+        # Tokens are checked when stored. Those stored before that are
+        # checked here, once, and the result kept.
+        checked: dict[int, bool] = {}
+        verified = set()
+        for leaf in leaves:
+            batch, event = leaf.batch, leaf.audit_event
+            assert batch is not None
+            assert event is not None
+            if batch.verified is None:
+                if batch.pk not in checked:
+                    checked[batch.pk] = verify_batch(batch) is not None
+                    TimestampBatch.objects.filter(pk=batch.pk).update(
+                        verified=checked[batch.pk],
+                    )
+                batch.verified = checked[batch.pk]
+            if (
+                batch.verified
+                and leaf.digest == event.hash
+                and merkle_root(leaf.digest, leaf.proof) == batch.root
+            ):
+                verified.add(leaf.pk)
+        serializer = AuditTimestampSerializer(
+            leaves,
+            many=True,
+            context={"verified": verified},
+        )
+        return Response(status=status.HTTP_200_OK, data=serializer.data)
+
+    @action(detail=False, url_path="audit-export")
+    def audit_export(self, request):
+        """
+        Stream the audit trail of the user's documents, or of the tenant's.
+
+        The rows come from an async generator, so under ASGI the export does
+        not tie up a worker thread while it is sent.
+        """
+        params = AuditExportQuerySerializer(
+            data=request.query_params,
+            context={"request": request},
+        )
+        params.is_valid(raise_exception=True)
+        events = AuditEvent.objects.order_by("pk")
+        if not params.validated_data["tenant"]:
+            events = events.filter(document__owner_id=request.user.id)
+        if since := params.validated_data.get("since"):
+            events = events.filter(timestamp__gte=since)
+        if until := params.validated_data.get("until"):
+            events = events.filter(timestamp__lt=until)
+        file_format = params.validated_data["file_format"]
+        content_type, stream = AUDIT_EXPORT_FORMATS[file_format]
+        response = StreamingHttpResponse(stream(events), content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="audit-trail.{file_format}"'
+        )
+        return response
+
+    @action(detail=False, serializer_class=DocumentSearchSerializer)
+    def search(self, request):
+        params = DocumentSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        assert isinstance(request.user.id, int)
+        matches = search_documents(request.user.id, params.validated_data["q"])
+        facets = {"status": status_facets(matches)}
+        if document_status := params.validated_data.get("status"):
+            matches = matches.filter(status=document_status)
+
+        paginator = DocumentSearchPagination()
+        page = paginator.paginate_queryset(
+            matches.prefetch_related("signers"),
+            request,
+            view=self,
+        )
+        serializer = DocumentSearchSerializer(page, many=True)
+        response = paginator.get_paginated_response(serializer.data)
+        response.data["facets"] = facets
+        return response
+
+
+class TemplateViewSet(RetrieveModelMixin, ListModelMixin, GenericViewSet):
+    serializer_class = TemplateSerializer
+    queryset = Template.objects.prefetch_related("pages", "roles", "fields")
+    lookup_field = "pk"
+
+    def get_queryset(self, *args, **kwargs):
+        assert isinstance(self.request.user.id, int)
+        return self.queryset.filter(owner_id=self.request.user.id)
+
+    def list(self, request, *args, **kwargs):
+        key = response_cache_key(request, "templates", [("templates", request.user.id)])
+        list_ = super().list
+        return Response(
+            get_or_build(key, lambda: list_(request, *args, **kwargs).data),
+        )
+
+    @action(
+        detail=True,
+        methods=["post"],
+        serializer_class=TemplateInstantiateSerializer,
+    )
+    def instantiate(self, request, pk=None):
+        template = self.get_object()
+        serializer = TemplateInstantiateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = dict(serializer.validated_data)
+        try:
+            document = Document.objects.create_from_template(
+                template,
+                owner=request.user,
+                signers=data.pop("signers"),
+                **data,
+            )
+        except ValueError as exc:
+            raise serializers.ValidationError({"signers": [str(exc)]}) from exc
+        document = Document.objects.prefetch_related("signers", "fields__image").get(
+            pk=document.pk,
+        )
+        return Response(
+            status=status.HTTP_201_CREATED,
+            data=DocumentSerializer(document, context={"request": request}).data,
+        )
+
+
+class ArchiveExportViewSet(
+    CreateModelMixin,
+    RetrieveModelMixin,
+    ListModelMixin,
+    GenericViewSet,
+):
+    serializer_class = ArchiveExportSerializer
+    queryset = ArchiveExport.objects.prefetch_related("parts")
+    lookup_field = "pk"
+
+    def get_queryset(self, *args, **kwargs):
+        assert isinstance(self.request.user.id, int)
+        return self.queryset.filter(user_id=self.request.user.id)
+
+    def perform_create(self, serializer):
+        export = serializer.save(user=self.request.user)
+        enqueue(build_archive_export, export.pk, aggregate=export)
+
+    @action(detail=True, methods=["post"])
+    def resume(self, request, pk=None):
+        export = self.get_object()
+        if export.status != ArchiveExport.Status.FAILED:
+            msg = "Only failed exports can be resumed."
+            raise serializers.ValidationError(msg)
+        export.status = ArchiveExport.Status.PENDING
+        export.save(update_fields=["status", "modified"])
+        enqueue(build_archive_export, export.pk, aggregate=export)
+        return Response(
+            status=status.HTTP_202_ACCEPTED,
+            data=self.get_serializer(export).data,
+        )
+
+    @action(detail=False)
+    def stream(self, request):
+        """Stream the archive of the user's documents straight to the client."""
+        params = ArchiveExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        export = ArchiveExport(user=request.user, **params.validated_data)
+        response = StreamingHttpResponse(
+            stream_zip(archive_entries(iter_export_documents(export))),
+            content_type="application/zip",
+        )
+        response["Content-Disposition"] = 'attachment; filename="documents.zip"'
+        return response
@@ -0,0 +1,13 @@
+import contextlib
+
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class DocumentsConfig(AppConfig):
+    name = "signsecure.documents"
+    verbose_name = _("Documents")
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import signsecure.documents.signals  # noqa: F401
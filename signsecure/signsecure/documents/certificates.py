@@ -0,0 +1,229 @@
+"""
+Certificates of completion.
+
+A certificate is rendered once, when its document is completed, and stored
+next to a final PDF that has the certificate pages appended and, once a
+signing key is configured, is sealed with the platform's digital signature
+(see signing.py). Downloads are then served from storage without rendering
+anything again.
+
+The final PDF is written to a temporary file, which spills to disk past
+``SPOOL_SIZE``, and signed from there into another, so that neither copy of
+a large document is kept in memory.
+"""
+
+import hashlib
+import tempfile
+import textwrap
+from io import BytesIO
+from typing import IO
+
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from pypdf import PageObject
+from pypdf import PdfReader
+from pypdf import PdfWriter
+from pypdf.generic import ContentStream
+from pypdf.generic import DictionaryObject
+from pypdf.generic import NameObject
+
+from .models import AuditEvent
+from .models import Certificate
+from .models import Document
+from .signing import SPOOL_SIZE
+from .signing import get_signer
+from .signing import sign_pdf
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 54
+FONT_SIZE = 9
+LINE_HEIGHT = 13
+LINE_WIDTH = 110
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+HASH_CHUNK_SIZE = 64 * 1024
+# Renders of a certificate outdated by changes to its document before saving.
+RENDER_ATTEMPTS = 3
+
+_FONT = DictionaryObject(
+    {
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+        NameObject("/Encoding"): NameObject("/WinAnsiEncoding"),
+    },
+)
+
+
+def _file_sha256(field_file) -> str:
+    digest = hashlib.sha256()
+    with field_file.open("rb") as stream:
+        while chunk := stream.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _format_time(value) -> str:
+    if value is None:
+        return "-"
+    return timezone.localtime(value).strftime("%Y-%m-%d %H:%M:%S %Z")
+
+
+def certificate_lines(document: Document, audit_hash: str) -> list[str]:
+    """Lay out the certificate's content as lines of text."""
+    events = list(
+        AuditEvent.objects.filter(document=document).order_by("timestamp", "pk"),
+    )
+    signers = list(document.signers.order_by("order"))
+    completed_at = max(
+        (signer.signed_at for signer in signers if signer.signed_at),
+        default=document.modified,
+    )
+    signer_ips = {
+        event.email: event.ip_address
+        for event in events
+        if event.action == "document_signed" and event.ip_address
+    }
+    lines = [
+        "CERTIFICATE OF COMPLETION",
+        "",
+        f"Document: {document.title}",
+        f"Document ID: {document.pk}",
+        f"Created: {_format_time(document.created)}",
+        f"Completed: {_format_time(completed_at)}",
+        f"Original file SHA-256: {_file_sha256(document.file)}",
+        "",
+        "SIGNERS",
+    ]
+    for signer in signers:
+        lines += [
+            f"{signer.order}. {signer.name} <{signer.email}>"
+            + (f" ({signer.role})" if signer.role else ""),
+            f"    Status: {signer.get_status_display()}"
+            f"    Viewed: {_format_time(signer.viewed_at)}"
+            f"    Signed: {_format_time(signer.signed_at)}"
+            f"    IP: {signer_ips.get(signer.email) or '-'}",
+        ]
+    lines += ["", "AUDIT TRAIL"]
+    for event in events:
+        lines.append(
+            f"{_format_time(event.timestamp)}  {event.action}"
+            f"  {event.email or '-'}  {event.ip_address or '-'}"
+            f"  {event.hash[:16]}",
+        )
+    lines += ["", f"Audit hash chain head: {audit_hash or '-'}"]
+    return [
+        wrapped
+        for line in lines
+        for wrapped in (textwrap.wrap(line, LINE_WIDTH) or [""])
+    ]
+
+
+def _escape(line: str) -> bytes:
+    encoded = line.encode("cp1252", "replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _add_text_page(writer: PdfWriter, lines: list[str]) -> PageObject:
+    page = writer.add_blank_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    page[NameObject("/Resources")] = DictionaryObject(
+        {NameObject("/Font"): DictionaryObject({NameObject("/F1"): _FONT})},
+    )
+    content = [
+        b"BT /F1 %d Tf %d TL %d %d Td"
+        % (FONT_SIZE, LINE_HEIGHT, MARGIN, PAGE_HEIGHT - MARGIN),
+    ]
+    content += [b"(%s) Tj T*" % _escape(line) for line in lines]
+    content.append(b"ET")
+    stream = ContentStream(None, writer)
+    stream.set_data(b"\n".join(content))
+    page.replace_contents(stream)
+    return page
+
+
+def render_certificate(lines: list[str]) -> bytes:
+    """Render certificate lines into a PDF."""
+    writer = PdfWriter()
+    for start in range(0, len(lines), LINES_PER_PAGE):
+        _add_text_page(writer, lines[start : start + LINES_PER_PAGE])
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def append_certificate(
+    document: Document,
+    certificate_pdf: bytes,
+    output: IO[bytes],
+) -> None:
+    """Write the final PDF: the signed document followed by its certificate."""
+    writer = PdfWriter()
+    with document.file.open("rb") as stream:
+        writer.append(PdfReader(stream))
+        writer.append(PdfReader(BytesIO(certificate_pdf)))
+        writer.write(output)
+
+
+def _render(document: Document) -> Certificate:
+    """Render a document's certificate and store its files, without saving it."""
+    audit_hash = AuditEvent.objects.verify_chain(document)
+    if audit_hash is None:
+        msg = f"The audit trail of document {document.pk} fails verification"
+        raise ValueError(msg)
+    certificate_pdf = render_certificate(certificate_lines(document, audit_hash))
+    certificate = Certificate(document=document, audit_hash=audit_hash)
+    certificate.file.save(
+        f"certificate-{document.pk}.pdf",
+        ContentFile(certificate_pdf),
+        save=False,
+    )
+    with (
+        tempfile.SpooledTemporaryFile(SPOOL_SIZE) as final_pdf,
+        tempfile.SpooledTemporaryFile(SPOOL_SIZE) as signed_pdf,
+    ):
+        append_certificate(document, certificate_pdf, final_pdf)
+        final_pdf.seek(0)
+        output = final_pdf
+        if signer := get_signer():
+            sign_pdf(final_pdf, signed_pdf, signer)
+            signed_pdf.seek(0)
+            output = signed_pdf
+            certificate.signed_at = timezone.now()
+        certificate.final_file.save(
+            f"document-{document.pk}.pdf",
+            File(output),
+            save=False,
+        )
+    return certificate
+
+
+def generate_certificate(document_id: int) -> Certificate:
+    """
+    Render and store the certificate of a completed document.
+
+    Does nothing but return the stored certificate if there already is one.
+    Nothing is locked while rendering and storing the files: the document is
+    only locked to check that it and its audit trail are as they were
+    rendered, and to save the certificate. If they changed meanwhile, it is
+    rendered again; if another run saved one first, that one is kept.
+    """
+    for _ in range(RENDER_ATTEMPTS):
+        if certificate := Certificate.objects.filter(document_id=document_id).first():
+            return certificate
+        document = Document.objects.get(pk=document_id)
+        certificate = _render(document)
+        with transaction.atomic():
+            current = Document.objects.select_for_update().get(pk=document_id)
+            if (
+                current.modified == document.modified
+                and AuditEvent.objects.chain_head(current) == certificate.audit_hash
+                and not Certificate.objects.filter(document_id=document_id).exists()
+            ):
+                certificate.save()
+                return certificate
+        certificate.file.delete(save=False)
+        certificate.final_file.delete(save=False)
+    msg = f"Document {document_id} kept changing while its certificate was rendered"
+    raise RuntimeError(msg)
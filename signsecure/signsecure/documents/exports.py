@@ -0,0 +1,263 @@
+"""
+Streaming exports: ZIP archives of completed documents, and audit trails.
+
+Archives are produced by a generator pipeline: documents are read from the
+database in chunks, each file is copied from storage in chunks into a ZIP64
+entry, and the archive bytes are yielded as soon as they are written. The
+same stream is either saved to storage, one part at a time by the
+``build_archive_export`` task, or sent out as a ``StreamingHttpResponse``.
+Memory use does not grow with the size of the export.
+
+Audit trails are exported as NDJSON or CSV by async generators reading
+through the async ORM, so under ASGI a long export holds neither a worker
+thread nor more than one chunk of rows at a time.
+
+Both read rows in primary key order, one short query per chunk, rather than
+from a server-side cursor: that needs no transaction held open for the whole
+export and works through PgBouncer in transaction pooling mode.
+"""
+
+import csv
+import io
+import json
+import time
+import zipfile
+from collections.abc import AsyncIterator
+from collections.abc import Iterable
+from collections.abc import Iterator
+from datetime import datetime
+
+from django.core.files import File
+from django.db import IntegrityError
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.fields.files import FieldFile
+from django.utils.text import slugify
+
+from .models import ArchiveExport
+from .models import ArchiveExportPart
+from .models import AuditEvent
+from .models import Document
+
+CHUNK_SIZE = 1024 * 1024
+# Documents per stored part, i.e. per resume checkpoint.
+PART_SIZE = 1000
+# Documents fetched at a time while streaming an archive.
+STREAM_CHUNK_SIZE = 200
+# Audit events fetched, and written out, per keyset query.
+AUDIT_CHUNK_SIZE = 2000
+
+AUDIT_FIELDS = [
+    "timestamp",
+    "action",
+    "user_id",
+    "email",
+    "ip_address",
+    "user_agent",
+    "details",
+    "hash",
+]
+
+
+class _Pipe:
+    """The write end of the pipeline, buffering what ZipFile writes."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes, /) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _IterStream(io.RawIOBase):
+    """A readable, unseekable file over an iterable of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def stream_zip(entries: Iterable[tuple[str, Iterable[bytes]]]) -> Iterator[bytes]:
+    """Yield a ZIP64 archive of ``(name, chunks)`` entries as it is written."""
+    pipe = _Pipe()
+    with zipfile.ZipFile(pipe, "w") as archive:
+        for name, chunks in entries:
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            # PDFs are compressed already.
+            if not name.endswith(".pdf"):
+                info.compress_type = zipfile.ZIP_DEFLATED
+            with archive.open(info, "w", force_zip64=True) as entry:
+                for chunk in chunks:
+                    entry.write(chunk)
+                    if data := pipe.drain():
+                        yield data
+            yield pipe.drain()
+    yield pipe.drain()
+
+
+def _file_chunks(field_file: FieldFile) -> Iterator[bytes]:
+    with field_file.open("rb") as stream:
+        while chunk := stream.read(CHUNK_SIZE):
+            yield chunk
+
+
+def _audit_json(document: Document) -> Iterator[bytes]:
+    events = AuditEvent.objects.filter(document=document).order_by("timestamp", "pk")
+    trail = list(events.values(*AUDIT_FIELDS))
+    yield json.dumps(trail, default=str, indent=2).encode()
+
+
+def document_entries(document: Document) -> Iterator[tuple[str, Iterable[bytes]]]:
+    """The archive entries of one document: its PDFs and audit trail."""
+    folder = f"{document.pk}-{slugify(document.title)[:50] or 'document'}"
+    certificate = document.certificate
+    yield f"{folder}/final.pdf", _file_chunks(certificate.final_file)
+    yield f"{folder}/certificate.pdf", _file_chunks(certificate.file)
+    yield f"{folder}/audit.json", _audit_json(document)
+
+
+def archive_entries(
+    documents: Iterable[Document],
+) -> Iterator[tuple[str, Iterable[bytes]]]:
+    for document in documents:
+        yield from document_entries(document)
+
+
+def export_documents(export: ArchiveExport) -> QuerySet[Document]:
+    """The documents an export covers, in the order they are archived."""
+    documents = Document.objects.filter(
+        status=Document.Status.COMPLETED,
+        certificate__created__gte=export.completed_from,
+        certificate__created__lt=export.completed_until,
+    )
+    if not export.tenant:
+        documents = documents.filter(owner=export.user)
+    return documents.select_related("certificate").order_by("pk")
+
+
+def iter_export_documents(export: ArchiveExport) -> Iterator[Document]:
+    """Every document of an export, fetched a chunk at a time."""
+    documents = export_documents(export)
+    last_pk = 0
+    while chunk := list(documents.filter(pk__gt=last_pk)[:STREAM_CHUNK_SIZE]):
+        yield from chunk
+        last_pk = chunk[-1].pk
+
+
+def build_next_part(export: ArchiveExport) -> ArchiveExportPart | None:
+    """
+    Archive the next documents of an export into storage as a new part.
+
+    Returns the part, or None once every document has been archived.
+
+    Raises:
+        IntegrityError: If another run stored a part with the same number
+            first, as a task run twice for one message would.
+
+    """
+    last_part = export.parts.order_by("-number").first()
+    documents = list(
+        export_documents(export).filter(
+            pk__gt=last_part.last_document_pk if last_part else 0,
+        )[:PART_SIZE],
+    )
+    if not documents:
+        return None
+    number = last_part.number + 1 if last_part else 1
+    part = ArchiveExportPart(
+        export=export,
+        number=number,
+        last_document_pk=documents[-1].pk,
+        document_count=len(documents),
+    )
+    stream = io.BufferedReader(
+        _IterStream(stream_zip(archive_entries(documents))),
+        buffer_size=CHUNK_SIZE,
+    )
+    part.file.save(f"export-{export.pk}-{number:04d}.zip", File(stream), save=False)
+    try:
+        with transaction.atomic():
+            part.save()
+    except IntegrityError:
+        part.file.delete(save=False)
+        raise
+    return part
+
+
+AUDIT_EXPORT_FIELDS = ["id", "document_id", *AUDIT_FIELDS]
+
+
+async def _audit_rows(events: QuerySet[AuditEvent]) -> AsyncIterator[list[tuple]]:
+    """Fetch audit event rows in primary key order, a chunk at a time."""
+    rows = events.values_list(*AUDIT_EXPORT_FIELDS).order_by("pk")
+    last_pk = 0
+    while chunk := [
+        row async for row in rows.filter(pk__gt=last_pk)[:AUDIT_CHUNK_SIZE]
+    ]:
+        yield chunk
+        last_pk = chunk[-1][0]
+
+
+def _json_default(value) -> str:
+    # Full precision: the audit hash chain covers the microseconds too.
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+async def stream_audit_ndjson(events: QuerySet[AuditEvent]) -> AsyncIterator[bytes]:
+    """Yield audit events as newline-delimited JSON."""
+    async for chunk in _audit_rows(events):
+        yield "".join(
+            json.dumps(
+                dict(zip(AUDIT_EXPORT_FIELDS, row, strict=True)),
+                default=_json_default,
+            )
+            + "\n"
+            for row in chunk
+        ).encode()
+
+
+async def stream_audit_csv(events: QuerySet[AuditEvent]) -> AsyncIterator[bytes]:
+    """Yield audit events as CSV, with a header row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(AUDIT_EXPORT_FIELDS)
+    async for chunk in _audit_rows(events):
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if header := buffer.getvalue():
+        yield header.encode()
+
+
+# Content type and audit trail stream of each export format.
+AUDIT_EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", stream_audit_ndjson),
+    "csv": ("text/csv", stream_audit_csv),
+}
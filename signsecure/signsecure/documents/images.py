@@ -0,0 +1,107 @@
+"""
+Signature and initials images.
+
+Signers submit what they drew as a ``data:`` URL. The image is decoded,
+trimmed to the ink, downscaled and re-encoded as a grayscale PNG, then stored
+once per distinct result: form fields only reference the stored image, so
+document rows and payloads stay small.
+"""
+
+import base64
+import binascii
+import hashlib
+import re
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image
+from PIL import ImageChops
+from PIL import UnidentifiedImageError
+
+from .models import FieldType
+from .models import FormField
+from .models import SignatureImage
+
+IMAGE_FIELD_TYPES = frozenset({FieldType.SIGNATURE, FieldType.INITIAL})
+MAX_DATA_URL_LENGTH = 2 * 1024 * 1024
+MAX_PIXELS = 4096 * 4096
+MAX_WIDTH = 600
+MAX_HEIGHT = 200
+# Pixels lighter than this count as paper rather than ink.
+INK_THRESHOLD = 240
+
+_DATA_URL = re.compile(r"data:image/(?:png|jpeg|webp);base64,(?P<data>.+)", re.DOTALL)
+
+
+def decode_data_url(value: str) -> bytes:
+    """Get the image bytes out of a base64 ``data:image/...`` URL."""
+    if len(value) > MAX_DATA_URL_LENGTH:
+        msg = "The image is too large."
+        raise ValueError(msg)
+    match = _DATA_URL.fullmatch(value.strip())
+    if match is None:
+        msg = "Expected a base64 PNG, JPEG or WebP data URL."
+        raise ValueError(msg)
+    try:
+        return base64.b64decode(match["data"], validate=True)
+    except binascii.Error as exc:
+        msg = "The image data is not valid base64."
+        raise ValueError(msg) from exc
+
+
+def normalize_signature(data: bytes) -> Image.Image:
+    """Trim an image to its ink and scale it down to fit the maximum size."""
+    try:
+        with Image.open(BytesIO(data)) as submitted:
+            if submitted.width * submitted.height > MAX_PIXELS:
+                msg = "The image is too large."
+                raise ValueError(msg)
+            image = submitted.convert("LA")
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        msg = "The image could not be read."
+        raise ValueError(msg) from exc
+    gray, alpha = image.split()
+    # Ink is whatever is both visible and darker than the paper, so white
+    # backgrounds are trimmed as well as transparent ones.
+    dark = gray.point(lambda value: 255 if value < INK_THRESHOLD else 0)
+    ink = ImageChops.multiply(alpha, dark)
+    bbox = ink.getbbox()
+    if bbox is None:
+        msg = "The image is blank."
+        raise ValueError(msg)
+    image = Image.merge("LA", (gray, ink)).crop(bbox)
+    image.thumbnail((MAX_WIDTH, MAX_HEIGHT), Image.Resampling.LANCZOS)
+    return image
+
+
+def store_signature_image(data_url: str) -> SignatureImage:
+    """Normalize a submitted image and store it, unless it is stored already."""
+    image = normalize_signature(decode_data_url(data_url))
+    output = BytesIO()
+    image.save(output, format="PNG", optimize=True)
+    png = output.getvalue()
+    digest = hashlib.sha256(png).hexdigest()
+    signature_image, _ = SignatureImage.objects.get_or_create(
+        digest=digest,
+        defaults={
+            "file": ContentFile(png, name=f"{digest}.png"),
+            "width": image.width,
+            "height": image.height,
+        },
+    )
+    return signature_image
+
+
+def fill_field(field: FormField, value: str) -> None:
+    """
+    Set the value a signer entered into a form field.
+
+    Signature and initials fields take a ``data:`` URL, which is stored as a
+    ``SignatureImage``; other fields keep their value as text.
+    """
+    if field.type in IMAGE_FIELD_TYPES:
+        field.image = store_signature_image(value)
+        field.value = ""
+    else:
+        field.value = value
+    field.save(update_fields=["image", "value"])
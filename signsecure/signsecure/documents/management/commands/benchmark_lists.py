@@ -0,0 +1,124 @@
+import time
+from collections.abc import Callable
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from django.test import override_settings
+
+from signsecure.documents.api.projections import DocumentProjection
+from signsecure.documents.api.serializers import DocumentSerializer
+from signsecure.documents.models import Document
+from signsecure.documents.models import FieldType
+from signsecure.documents.models import FormField
+from signsecure.documents.models import Signer
+from signsecure.users.api.projections import UserProjection
+from signsecure.users.api.serializers import UserSerializer
+from signsecure.users.models import User
+
+BENCHMARK_DOMAIN = "benchmark.invalid"
+SIGNERS_PER_DOCUMENT = 2
+FIELDS_PER_SIGNER = 2
+
+
+def _best_time(function: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time a page of the user and document lists through their serializers "
+        "and through their projections. Rows are created in a transaction that "
+        "is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, rows, repeat, **options):
+        # The URLs in the output are built for the test client's host.
+        with override_settings(ALLOWED_HOSTS=["testserver"]), transaction.atomic():
+            owner = self._create_rows(rows)
+            request = RequestFactory().get("/")
+            context = {"request": request}
+
+            users = User.objects.filter(email__endswith=BENCHMARK_DOMAIN)
+            documents = Document.objects.filter(owner=owner)
+            self._report(
+                "users",
+                lambda: UserSerializer(users, many=True, context=context).data,
+                lambda: UserProjection().project(
+                    UserProjection().values(users),
+                    request,
+                ),
+                repeat,
+            )
+            self._report(
+                "documents",
+                lambda: DocumentSerializer(
+                    documents.prefetch_related("signers", "fields__image"),
+                    many=True,
+                    context=context,
+                ).data,
+                lambda: DocumentProjection().project(
+                    DocumentProjection().values(documents),
+                    request,
+                ),
+                repeat,
+            )
+            transaction.set_rollback(True)
+
+    def _create_rows(self, rows: int) -> User:
+        users = User.objects.bulk_create(
+            User(email=f"{number}@{BENCHMARK_DOMAIN}", name=f"User {number}")
+            for number in range(rows)
+        )
+        owner = users[0]
+        documents = Document.objects.bulk_create(
+            Document(
+                owner=owner,
+                title=f"Document {number}",
+                file=f"documents/benchmark-{number}.pdf",
+            )
+            for number in range(rows)
+        )
+        signers = Signer.objects.bulk_create(
+            Signer(document=document, email=f"{order}@{BENCHMARK_DOMAIN}", order=order)
+            for document in documents
+            for order in range(1, SIGNERS_PER_DOCUMENT + 1)
+        )
+        FormField.objects.bulk_create(
+            FormField(
+                document_id=signer.document_id,
+                signer=signer,
+                type=FieldType.SIGNATURE,
+                x=10,
+                y=10 + 40 * number,
+                width=120,
+                height=30,
+            )
+            for signer in signers
+            for number in range(FIELDS_PER_SIGNER)
+        )
+        return owner
+
+    def _report(
+        self,
+        name: str,
+        serializer: Callable[[], object],
+        projection: Callable[[], object],
+        repeat: int,
+    ) -> None:
+        serializer_time = _best_time(serializer, repeat)
+        projection_time = _best_time(projection, repeat)
+        self.stdout.write(
+            f"{name}: serializer {serializer_time * 1000:.1f} ms, "
+            f"projection {projection_time * 1000:.1f} ms "
+            f"({serializer_time / projection_time:.1f}x)",
+        )
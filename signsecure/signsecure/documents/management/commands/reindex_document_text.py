@@ -0,0 +1,78 @@
+import os
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from multiprocessing import get_context
+
+import django
+from django.core.management.base import BaseCommand
+
+from signsecure.documents.models import Document
+from signsecure.documents.text import index_document_text
+
+
+class Command(BaseCommand):
+    help = "Re-extract the text of every document's PDF using a pool of processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes; 1 indexes in this process.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of document ids fetched from the database at a time.",
+        )
+
+    def handle(self, *args, processes, chunk_size, **options):
+        self.documents = self.pages = self.failed = 0
+        document_ids = (
+            Document.objects.exclude(file="")
+            .order_by("pk")
+            .values_list("pk", flat=True)
+            .iterator(chunk_size=chunk_size)
+        )
+        if processes == 1:
+            for document_id in document_ids:
+                self.pages += index_document_text(document_id)
+                self.documents += 1
+        else:
+            self.index_in_pool(document_ids, processes)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {self.pages} pages from {self.documents} documents "
+                f"({self.failed} failed).",
+            ),
+        )
+
+    def index_in_pool(self, document_ids, processes):
+        # Only a few documents per worker are queued at any time, so memory
+        # does not grow with the size of the table.
+        max_pending = processes * 4
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=get_context("spawn"),
+            initializer=django.setup,
+        ) as executor:
+            pending: set[Future] = set()
+            for document_id in document_ids:
+                pending.add(executor.submit(index_document_text, document_id))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self.collect(done)
+            self.collect(wait(pending).done)
+
+    def collect(self, futures):
+        for future in futures:
+            if future.exception():
+                self.failed += 1
+                self.stderr.write(str(future.exception()))
+            else:
+                self.documents += 1
+                self.pages += future.result()
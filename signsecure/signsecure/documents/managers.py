@@ -0,0 +1,252 @@
+import random
+from collections.abc import Iterable
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+from django.db import connections
+from django.db import transaction
+from django.db.models import Manager
+from django.db.models import Sum
+
+if TYPE_CHECKING:
+    from .models import AuditEvent
+    from .models import Document
+    from .models import DocumentCounter  # noqa: F401
+    from .models import Template
+
+
+class DocumentManager(Manager["Document"]):
+    """Custom manager for the Document model."""
+
+    def update_search_vector(self, *pks: int) -> int:
+        """Recompute the full-text search vector of the given documents."""
+        from .search import document_search_vector
+
+        return self.filter(pk__in=pks).update(search_vector=document_search_vector())
+
+    def create_from_template(
+        self,
+        template: "Template",
+        owner,
+        signers: Iterable[Mapping[str, str]],
+        **extra_fields,
+    ) -> "Document":
+        """
+        Create a document from a template without copying its file or pages.
+
+        ``signers`` holds one ``{"role", "name", "email"}`` mapping per
+        template role. The document reuses the template's stored PDF and
+        prerendered pages, so only the signer and field rows are written,
+        each with a single bulk insert. So are its search pages, copied from
+        the template's text once that has been extracted.
+        """
+        from .models import FormField
+        from .models import Signer
+        from .text import copy_template_text
+
+        roles = {role.name: role for role in template.roles.all()}
+        signers_by_role = {signer["role"]: signer for signer in signers}
+        if missing := sorted(roles.keys() - signers_by_role.keys()):
+            msg = f"No signer given for role(s): {', '.join(missing)}"
+            raise ValueError(msg)
+        if unknown := sorted(signers_by_role.keys() - roles.keys()):
+            msg = f"Unknown template role(s): {', '.join(unknown)}"
+            raise ValueError(msg)
+
+        extra_fields.setdefault("title", template.title)
+        extra_fields.setdefault("description", template.description)
+        with transaction.atomic(using=self.db):
+            document = self.create(
+                owner=owner,
+                template=template,
+                file=template.file.name,
+                file_type=template.file_type,
+                **extra_fields,
+            )
+            created_signers = Signer.objects.using(self.db).bulk_create(
+                Signer(
+                    document=document,
+                    email=signers_by_role[role.name]["email"],
+                    name=signers_by_role[role.name]["name"],
+                    role=role.name,
+                    order=role.order,
+                )
+                for role in roles.values()
+            )
+            signer_ids = {
+                role.pk: signer.pk
+                for role, signer in zip(roles.values(), created_signers, strict=True)
+            }
+            FormField.objects.using(self.db).bulk_create(
+                FormField(
+                    document=document,
+                    signer_id=signer_ids.get(field["role_id"]),
+                    type=field["type"],
+                    x=field["x"],
+                    y=field["y"],
+                    width=field["width"],
+                    height=field["height"],
+                    page=field["page"],
+                    required=field["required"],
+                    label=field["label"],
+                )
+                for field in template.fields.values(
+                    "role_id",
+                    "type",
+                    "x",
+                    "y",
+                    "width",
+                    "height",
+                    "page",
+                    "required",
+                    "label",
+                )
+            )
+            if template.has_page_texts:
+                copy_template_text(document.pk, template)
+            self.update_search_vector(document.pk)
+        return document
+
+
+class DocumentCounterManager(Manager["DocumentCounter"]):
+    """Custom manager for the DocumentCounter model."""
+
+    def add(
+        self,
+        site_id: int,
+        owner_id: int | None,
+        deltas: Mapping[str, int],
+    ) -> None:
+        """
+        Apply per-status ``deltas`` to an owner's and the tenant's counters.
+
+        Only the tenant's counters change when ``owner_id`` is None. All rows
+        are upserted with a single ``INSERT ... ON CONFLICT`` statement, so a
+        status change costs one query inside the transaction that made it.
+        Rows are written in a fixed order, so that concurrent changes lock
+        them in the same order and cannot deadlock.
+        """
+        changes = sorted((status, delta) for status, delta in deltas.items() if delta)
+        shard = random.randrange(self.model.TENANT_SHARDS)  # noqa: S311
+        rows: list[tuple[int, int | None, str, int, int]] = [
+            (site_id, None, status, shard, delta) for status, delta in changes
+        ]
+        if owner_id is not None:
+            rows += [(site_id, owner_id, status, 0, delta) for status, delta in changes]
+        self._upsert(rows)
+
+    def merge(
+        self,
+        site_id: int,
+        owner_id: int | None,
+        status: str,
+        delta: int = 0,
+    ) -> None:
+        """
+        Move a counter's shards into shard 0, adding ``delta``.
+
+        Only that counter's rows are locked, and only while they are merged.
+        """
+        with transaction.atomic(using=self.db):
+            rows = self.filter(site_id=site_id, owner_id=owner_id, status=status)
+            counters = list(rows.select_for_update().order_by("shard"))
+            moved = sum(counter.count for counter in counters if counter.shard)
+            rows.exclude(shard=0).update(count=0)
+            self._upsert([(site_id, owner_id, status, 0, moved + delta)])
+
+    def _upsert(self, rows: list[tuple[int, int | None, str, int, int]]) -> None:
+        # Add each row's count to the stored one, creating it if need be.
+        if not rows:
+            return
+        table = self.model._meta.db_table  # noqa: SLF001
+        values = ", ".join(["(%s, %s, %s, %s, %s)"] * len(rows))
+        sql = (
+            f"INSERT INTO {table} (site_id, owner_id, status, shard, count) "  # noqa: S608
+            f"VALUES {values} "
+            "ON CONFLICT (site_id, owner_id, status, shard) "
+            f"DO UPDATE SET count = {table}.count + EXCLUDED.count"
+        )
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(sql, [value for row in rows for value in row])
+
+    def _totals(self, site_id: int, owner_id: int | None):
+        return (
+            self.filter(site_id=site_id, owner_id=owner_id)
+            .order_by()
+            .values("status")
+            .annotate(total=Sum("count"))
+            .values_list("status", "total")
+        )
+
+    def counts(self, site_id: int, owner_id: int | None = None) -> dict[str, int]:
+        """Get the document count per status of an owner, or of the tenant."""
+        from .models import Document
+
+        counts = dict(self._totals(site_id, owner_id))
+        return {status: counts.get(status, 0) for status in Document.Status.values}
+
+    async def acounts(
+        self,
+        site_id: int,
+        owner_id: int | None = None,
+    ) -> dict[str, int]:
+        """Async version of ``counts()``."""
+        from .models import Document
+
+        counts = {
+            status: count async for status, count in self._totals(site_id, owner_id)
+        }
+        return {status: counts.get(status, 0) for status in Document.Status.values}
+
+
+class AuditEventManager(Manager["AuditEvent"]):
+    """Custom manager for the AuditEvent model."""
+
+    def record(self, document: "Document", action: str, **extra_fields) -> "AuditEvent":
+        """
+        Append an event to the document's audit trail and hash chain.
+
+        The document row is locked while the event is chained, so concurrent
+        events for the same document are serialized instead of forking the
+        chain. The event's hash is queued for the next batched timestamp.
+        """
+        from .models import Document
+        from .models import TimestampLeaf
+
+        with transaction.atomic(using=self.db):
+            Document.objects.using(self.db).select_for_update().filter(
+                pk=document.pk,
+            ).values_list("pk").get()
+            event = self.model(document=document, action=action, **extra_fields)
+            event.hash = event.compute_hash(self.chain_head(document))
+            event.save(using=self.db)
+            TimestampLeaf.objects.using(self.db).create(
+                audit_event=event,
+                digest=event.hash,
+            )
+        return event
+
+    def chain_head(self, document: "Document") -> str:
+        """The hash at the head of the document's chain, without checking it."""
+        return (
+            self.filter(document=document)
+            .order_by("-timestamp", "-pk")
+            .values_list("hash", flat=True)
+            .first()
+        ) or ""
+
+    def verify_chain(self, document: "Document") -> str | None:
+        """
+        Check the document's audit trail against its hash chain.
+
+        Returns:
+            str | None: The hash at the head of the chain, or None if any
+            event has been altered, removed or reordered.
+
+        """
+        previous_hash = ""
+        for event in self.filter(document=document).order_by("timestamp", "pk"):
+            if event.hash != event.compute_hash(previous_hash):
+                return None
+            previous_hash = event.hash
+        return previous_hash
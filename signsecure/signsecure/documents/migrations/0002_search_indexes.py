@@ -0,0 +1,99 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db import models
+from django.db.models.functions import Coalesce
+from django.db.models.functions import Concat
+
+
+def populate_search_vector(apps, schema_editor):
+    Document = apps.get_model("documents", "Document")
+    Signer = apps.get_model("documents", "Signer")
+    signers = (
+        Signer.objects.filter(document=models.OuterRef("pk"))
+        .order_by()
+        .values("document")
+        .annotate(
+            text=StringAgg(
+                Concat(
+                    "name",
+                    models.Value(" "),
+                    "email",
+                    output_field=models.TextField(),
+                ),
+                delimiter=" ",
+            ),
+        )
+        .values("text")
+    )
+    Document.objects.update(
+        search_vector=(
+            SearchVector("title", weight="A", config="simple")
+            + SearchVector("description", weight="B", config="simple")
+            + SearchVector(
+                Coalesce(
+                    models.Subquery(signers),
+                    models.Value(""),
+                    output_field=models.TextField(),
+                ),
+                weight="C",
+                config="simple",
+            )
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("documents", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="document",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(
+                fields=["owner", "status"], name="document_owner_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="document_search_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass("title", name="gin_trgm_ops"),
+                name="document_title_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="signer",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass("name", name="gin_trgm_ops"),
+                name="signer_name_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="signer",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass("email", name="gin_trgm_ops"),
+                name="signer_email_trgm_idx",
+            ),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
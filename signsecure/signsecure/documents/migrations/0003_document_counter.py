@@ -0,0 +1,94 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations
+from django.db import models
+
+
+def populate_counters(apps, schema_editor):
+    Document = apps.get_model("documents", "Document")
+    DocumentCounter = apps.get_model("documents", "DocumentCounter")
+    counts = {}
+    for owner_id, status, count in (
+        Document.objects.order_by()
+        .values_list("owner_id", "status")
+        .annotate(count=models.Count("pk"))
+    ):
+        counts[(owner_id, status)] = count
+        counts[(None, status)] = counts.get((None, status), 0) + count
+    DocumentCounter.objects.bulk_create(
+        DocumentCounter(
+            site_id=settings.SITE_ID,
+            owner_id=owner_id,
+            status=status,
+            count=count,
+        )
+        for (owner_id, status), count in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("documents", "0002_search_indexes"),
+        ("sites", "0004_alter_options_ordering_domain"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DocumentCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("draft", "Draft"),
+                            ("sent", "Sent"),
+                            ("completed", "Completed"),
+                            ("declined", "Declined"),
+                            ("expired", "Expired"),
+                        ],
+                        max_length=20,
+                        verbose_name="Status",
+                    ),
+                ),
+                ("count", models.BigIntegerField(default=0, verbose_name="Count")),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "site",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="sites.site",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("site", "owner", "status"),
+                        name="unique_document_counter",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,127 @@
+import hashlib
+import json
+
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations
+from django.db import models
+
+
+def compute_hash(event, previous_hash):
+    content = {
+        "previous": previous_hash,
+        "document": event.document_id,
+        "user": event.user_id,
+        "email": event.email,
+        "action": event.action,
+        "timestamp": event.timestamp.isoformat(),
+        "ip_address": event.ip_address,
+        "user_agent": event.user_agent,
+        "details": event.details,
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def chain_existing_events(apps, schema_editor):
+    AuditEvent = apps.get_model("documents", "AuditEvent")
+    events = AuditEvent.objects.order_by("document_id", "timestamp", "pk")
+    previous_document_id, previous_hash = None, ""
+    changed = []
+    for event in events.iterator(chunk_size=2000):
+        if event.document_id != previous_document_id:
+            previous_document_id, previous_hash = event.document_id, ""
+        event.hash = compute_hash(event, previous_hash)
+        previous_hash = event.hash
+        changed.append(event)
+        if len(changed) >= 2000:  # noqa: PLR2004
+            AuditEvent.objects.bulk_update(changed, ["hash"])
+            changed = []
+    AuditEvent.objects.bulk_update(changed, ["hash"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("documents", "0004_document_page"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="auditevent",
+            options={"ordering": ["document", "timestamp", "pk"]},
+        ),
+        migrations.AddField(
+            model_name="auditevent",
+            name="hash",
+            field=models.CharField(
+                blank=True, editable=False, max_length=64, verbose_name="Hash"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="auditevent",
+            name="timestamp",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                editable=False,
+                verbose_name="Timestamp",
+            ),
+        ),
+        migrations.CreateModel(
+            name="Certificate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        upload_to="certificates/%Y/%m/", verbose_name="File"
+                    ),
+                ),
+                (
+                    "final_file",
+                    models.FileField(
+                        upload_to="documents/final/%Y/%m/", verbose_name="Final file"
+                    ),
+                ),
+                (
+                    "audit_hash",
+                    models.CharField(max_length=64, verbose_name="Audit hash"),
+                ),
+                (
+                    "document",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="certificate",
+                        to="documents.document",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.RunPython(chain_existing_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("documents", "0005_completion_certificate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="certificate",
+            name="signed_at",
+            field=models.DateTimeField(blank=True, null=True, verbose_name="Signed at"),
+        ),
+    ]
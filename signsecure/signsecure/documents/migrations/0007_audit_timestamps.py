@@ -0,0 +1,107 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations
+from django.db import models
+
+
+def queue_existing_events(apps, schema_editor):
+    AuditEvent = apps.get_model("documents", "AuditEvent")
+    TimestampLeaf = apps.get_model("documents", "TimestampLeaf")
+    leaves = []
+    for pk, digest in AuditEvent.objects.values_list("pk", "hash").iterator(
+        chunk_size=2000,
+    ):
+        leaves.append(TimestampLeaf(audit_event_id=pk, digest=digest))
+        if len(leaves) >= 2000:  # noqa: PLR2004
+            TimestampLeaf.objects.bulk_create(leaves)
+            leaves = []
+    TimestampLeaf.objects.bulk_create(leaves)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("documents", "0006_certificate_signed_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimestampBatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("root", models.CharField(max_length=64, verbose_name="Merkle root")),
+                ("token", models.BinaryField(verbose_name="Timestamp token")),
+                ("timestamped_at", models.DateTimeField(verbose_name="Timestamped at")),
+                ("size", models.PositiveIntegerField(verbose_name="Size")),
+            ],
+            options={
+                "ordering": ["-timestamped_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="TimestampLeaf",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("digest", models.CharField(max_length=64, verbose_name="Digest")),
+                (
+                    "proof",
+                    models.JSONField(
+                        blank=True, default=list, verbose_name="Inclusion proof"
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="Created",
+                    ),
+                ),
+                (
+                    "audit_event",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timestamp_leaf",
+                        to="documents.auditevent",
+                    ),
+                ),
+                (
+                    "batch",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="leaves",
+                        to="documents.timestampbatch",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("batch__isnull", True)),
+                        fields=["id"],
+                        name="timestamp_leaf_pending_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(queue_existing_events, migrations.RunPython.noop),
+    ]
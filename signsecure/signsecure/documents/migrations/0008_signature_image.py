@@ -0,0 +1,63 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations
+from django.db import models
+
+import signsecure.documents.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("documents", "0007_audit_timestamps"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SignatureImage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "digest",
+                    models.CharField(
+                        max_length=64, unique=True, verbose_name="SHA-256"
+                    ),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        upload_to=signsecure.documents.models.signature_image_path,
+                        verbose_name="File",
+                    ),
+                ),
+                ("width", models.PositiveSmallIntegerField(verbose_name="Width")),
+                ("height", models.PositiveSmallIntegerField(verbose_name="Height")),
+                (
+                    "created",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="Created",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="formfield",
+            name="image",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="documents.signatureimage",
+            ),
+        ),
+    ]
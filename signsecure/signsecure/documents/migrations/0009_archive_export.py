@@ -0,0 +1,130 @@
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.conf import settings
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("documents", "0008_signature_image"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchiveExport",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                (
+                    "tenant",
+                    models.BooleanField(default=False, verbose_name="Whole tenant"),
+                ),
+                ("completed_from", models.DateTimeField(verbose_name="Completed from")),
+                (
+                    "completed_until",
+                    models.DateTimeField(verbose_name="Completed until"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "document_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Document count"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archive_exports",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchiveExportPart",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("number", models.PositiveIntegerField(verbose_name="Part number")),
+                (
+                    "file",
+                    models.FileField(upload_to="exports/%Y/%m/", verbose_name="File"),
+                ),
+                (
+                    "last_document_pk",
+                    models.BigIntegerField(verbose_name="Last document ID"),
+                ),
+                (
+                    "document_count",
+                    models.PositiveIntegerField(verbose_name="Document count"),
+                ),
+                (
+                    "export",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="parts",
+                        to="documents.archiveexport",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["export", "number"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("export", "number"),
+                        name="unique_archive_export_part_number",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("documents", "0009_archive_export"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="document",
+            name="document_title_trgm_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="signer",
+            name="signer_name_trgm_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="signer",
+            name="signer_email_trgm_idx",
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("title"), name="gin_trgm_ops"
+                ),
+                name="document_title_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="signer",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="signer_name_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="signer",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"), name="gin_trgm_ops"
+                ),
+                name="signer_email_trgm_idx",
+            ),
+        ),
+    ]
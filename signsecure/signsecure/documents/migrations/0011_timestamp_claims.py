@@ -0,0 +1,23 @@
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("documents", "0010_upper_trgm_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="timestampbatch",
+            name="verified",
+            field=models.BooleanField(null=True, verbose_name="Verified"),
+        ),
+        migrations.AddField(
+            model_name="timestampleaf",
+            name="claimed_until",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Claimed until"
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("documents", "0011_timestamp_claims"),
+        ("sites", "0004_alter_options_ordering_domain"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="documentcounter",
+            name="unique_document_counter",
+        ),
+        migrations.AddField(
+            model_name="documentcounter",
+            name="shard",
+            field=models.PositiveSmallIntegerField(default=0, verbose_name="Shard"),
+        ),
+        migrations.AddConstraint(
+            model_name="documentcounter",
+            constraint=models.UniqueConstraint(
+                fields=("site", "owner", "status", "shard"),
+                name="unique_document_counter",
+                nulls_distinct=False,
+            ),
+        ),
+    ]
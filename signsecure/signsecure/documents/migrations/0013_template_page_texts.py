@@ -0,0 +1,30 @@
+import django.contrib.postgres.fields
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("documents", "0012_document_counter_shards"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="template",
+            name="page_texts",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.TextField(blank=True),
+                default=list,
+                editable=False,
+                size=None,
+                verbose_name="Page texts",
+            ),
+        ),
+        migrations.AddField(
+            model_name="template",
+            name="text_file",
+            field=models.CharField(
+                blank=True, editable=False, max_length=100, verbose_name="Text file"
+            ),
+        ),
+    ]
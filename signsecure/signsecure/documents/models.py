@@ -0,0 +1,595 @@
+import hashlib
+import json
+from typing import ClassVar
+
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.indexes import OpClass
+from django.contrib.postgres.search import SearchVector
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models import CASCADE
+from django.db.models import PROTECT
+from django.db.models import SET_NULL
+from django.db.models import BigIntegerField
+from django.db.models import BinaryField
+from django.db.models import BooleanField
+from django.db.models import CharField
+from django.db.models import DateTimeField
+from django.db.models import EmailField
+from django.db.models import FileField
+from django.db.models import FloatField
+from django.db.models import ForeignKey
+from django.db.models import GeneratedField
+from django.db.models import GenericIPAddressField
+from django.db.models import Index
+from django.db.models import JSONField
+from django.db.models import Model
+from django.db.models import OneToOneField
+from django.db.models import PositiveIntegerField
+from django.db.models import PositiveSmallIntegerField
+from django.db.models import Q
+from django.db.models import TextChoices
+from django.db.models import TextField
+from django.db.models import UniqueConstraint
+from django.db.models.functions import Upper
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from model_utils import FieldTracker
+from model_utils.models import TimeStampedModel
+
+from .managers import AuditEventManager
+from .managers import DocumentCounterManager
+from .managers import DocumentManager
+
+
+class FieldType(TextChoices):
+    SIGNATURE = "signature", _("Signature")
+    TEXT = "text", _("Text")
+    DATE = "date", _("Date")
+    CHECKBOX = "checkbox", _("Checkbox")
+    INITIAL = "initial", _("Initial")
+
+
+class Template(TimeStampedModel):
+    """
+    A reusable document layout.
+
+    The PDF blob and its prerendered page images are stored once on the
+    template; documents created from it reference the same storage names
+    instead of uploading or rendering them again. The text of its pages is
+    likewise extracted once, into ``page_texts``, and copied into the search
+    index of each document; see text.py.
+    """
+
+    owner = ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=CASCADE,
+        related_name="templates",
+    )
+    title = CharField(_("Title"), max_length=255)
+    description = TextField(_("Description"), blank=True)
+    file = FileField(_("File"), upload_to="templates/%Y/%m/")
+    file_type = CharField(_("File type"), max_length=100, default="application/pdf")
+    page_count = PositiveIntegerField(_("Page count"), default=0)
+    page_texts = ArrayField(
+        TextField(blank=True),
+        verbose_name=_("Page texts"),
+        default=list,
+        editable=False,
+    )
+    # The file ``page_texts`` were extracted from; they are stale once the
+    # template's file is replaced.
+    text_file = CharField(_("Text file"), max_length=100, blank=True, editable=False)
+
+    class Meta:
+        ordering = ["-created"]
+
+    def __str__(self) -> str:
+        return self.title
+
+    @property
+    def has_page_texts(self) -> bool:
+        """Whether ``page_texts`` hold the text of the current file."""
+        return bool(self.text_file) and self.text_file == self.file.name
+
+
+class TemplatePage(Model):
+    """A prerendered page image of a template's PDF."""
+
+    template = ForeignKey(Template, on_delete=CASCADE, related_name="pages")
+    number = PositiveIntegerField(_("Page number"))
+    image = FileField(_("Image"), upload_to="templates/pages/%Y/%m/")
+    width = FloatField(_("Width"))
+    height = FloatField(_("Height"))
+
+    class Meta:
+        ordering = ["template", "number"]
+        constraints = [
+            UniqueConstraint(
+                fields=["template", "number"],
+                name="unique_template_page_number",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.template} p.{self.number}"
+
+
+class TemplateRole(Model):
+    """A signer placeholder, filled with a real signer on instantiation."""
+
+    template = ForeignKey(Template, on_delete=CASCADE, related_name="roles")
+    name = CharField(_("Name"), max_length=100)
+    order = PositiveSmallIntegerField(_("Signing order"), default=1)
+
+    class Meta:
+        ordering = ["template", "order"]
+        constraints = [
+            UniqueConstraint(
+                fields=["template", "name"],
+                name="unique_template_role_name",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class TemplateField(Model):
+    """A field position in a template's layout, assigned to a role."""
+
+    template = ForeignKey(Template, on_delete=CASCADE, related_name="fields")
+    role = ForeignKey(
+        TemplateRole,
+        on_delete=SET_NULL,
+        null=True,
+        blank=True,
+        related_name="fields",
+    )
+    type = CharField(_("Type"), max_length=20, choices=FieldType.choices)
+    x = FloatField()
+    y = FloatField()
+    width = FloatField(_("Width"))
+    height = FloatField(_("Height"))
+    page = PositiveIntegerField(_("Page"), default=1)
+    required = BooleanField(_("Required"), default=True)
+    label = CharField(_("Label"), max_length=255, blank=True)
+
+    def __str__(self) -> str:
+        return self.label or self.get_type_display()
+
+
+class Document(TimeStampedModel):
+    """An envelope sent out for signing."""
+
+    class Status(TextChoices):
+        DRAFT = "draft", _("Draft")
+        SENT = "sent", _("Sent")
+        COMPLETED = "completed", _("Completed")
+        DECLINED = "declined", _("Declined")
+        EXPIRED = "expired", _("Expired")
+
+    owner = ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=CASCADE,
+        related_name="documents",
+    )
+    template = ForeignKey(
+        Template,
+        on_delete=SET_NULL,
+        null=True,
+        blank=True,
+        related_name="documents",
+    )
+    title = CharField(_("Title"), max_length=255)
+    description = TextField(_("Description"), blank=True)
+    status = CharField(
+        _("Status"),
+        max_length=20,
+        choices=Status.choices,
+        default=Status.DRAFT,
+    )
+    file = FileField(_("File"), upload_to="documents/%Y/%m/")
+    file_type = CharField(_("File type"), max_length=100, default="application/pdf")
+    expires_at = DateTimeField(_("Expires at"), null=True, blank=True)
+    # Maintained by DocumentManager.update_search_vector, see search.py.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects: ClassVar[DocumentManager] = DocumentManager()
+    tracker = FieldTracker(fields=["status", "file"])
+
+    class Meta:
+        ordering = ["-created"]
+        indexes = [
+            Index(fields=["owner", "status"], name="document_owner_status_idx"),
+            GinIndex(fields=["search_vector"], name="document_search_idx"),
+            # Matches UPPER(title::text) LIKE UPPER(...), what icontains runs.
+            GinIndex(
+                OpClass(Upper("title"), name="gin_trgm_ops"),
+                name="document_title_trgm_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.title
+
+    @property
+    def shares_template_file(self) -> bool:
+        """Whether the document still points at its template's PDF blob."""
+        return self.template is not None and self.file.name == self.template.file.name
+
+    def get_pages(self):
+        """Get the prerendered pages for the document.
+
+        Returns:
+            QuerySet: The template's pages while the file is shared with it,
+            otherwise an empty queryset since the document was re-uploaded.
+
+        """
+        if self.shares_template_file:
+            return self.template.pages.all()  # type: ignore[union-attr]
+        return TemplatePage.objects.none()
+
+
+class DocumentCounter(Model):
+    """
+    Number of documents per status, kept up to date on every status change.
+
+    Rows with an ``owner`` count that user's documents; the rows without one
+    count the whole tenant (the current ``Site``). Every status change in the
+    tenant updates a tenant row, so its counts are spread over
+    ``TENANT_SHARDS`` rows, one picked at random per change, and concurrent
+    changes seldom wait on each other. Reading the dashboard counts sums at
+    most that many rows per status.
+    """
+
+    TENANT_SHARDS = 8
+
+    site = ForeignKey("sites.Site", on_delete=CASCADE, related_name="+")
+    owner = ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    status = CharField(_("Status"), max_length=20, choices=Document.Status.choices)
+    shard = PositiveSmallIntegerField(_("Shard"), default=0)
+    count = BigIntegerField(_("Count"), default=0)
+
+    objects: ClassVar[DocumentCounterManager] = DocumentCounterManager()
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["site", "owner", "status", "shard"],
+                name="unique_document_counter",
+                nulls_distinct=False,
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.status}: {self.count}"
+
+
+class DocumentPage(Model):
+    """The text of one page of a document's PDF, indexed for full-text search."""
+
+    document = ForeignKey(Document, on_delete=CASCADE, related_name="pages")
+    number = PositiveIntegerField(_("Page number"))
+    text = TextField(_("Text"), blank=True)
+    search_vector = GeneratedField(
+        expression=SearchVector("text", config="simple"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        ordering = ["document", "number"]
+        constraints = [
+            UniqueConstraint(
+                fields=["document", "number"],
+                name="unique_document_page_number",
+            ),
+        ]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="document_page_search_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.document} p.{self.number}"
+
+
+class Signer(Model):
+    class Status(TextChoices):
+        PENDING = "pending", _("Pending")
+        VIEWED = "viewed", _("Viewed")
+        SIGNED = "signed", _("Signed")
+        DECLINED = "declined", _("Declined")
+
+    document = ForeignKey(Document, on_delete=CASCADE, related_name="signers")
+    email = EmailField(_("email address"))
+    name = CharField(_("Name"), max_length=255)
+    role = CharField(_("Role"), max_length=100, blank=True)
+    order = PositiveSmallIntegerField(_("Signing order"), default=1)
+    status = CharField(
+        _("Status"),
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    signed_at = DateTimeField(_("Signed at"), null=True, blank=True)
+    viewed_at = DateTimeField(_("Viewed at"), null=True, blank=True)
+
+    tracker = FieldTracker(fields=["status"])
+
+    class Meta:
+        ordering = ["document", "order"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="signer_name_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("email"), name="gin_trgm_ops"),
+                name="signer_email_trgm_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} <{self.email}>"
+
+
+def signature_image_path(instance: "SignatureImage", filename: str) -> str:
+    return f"signatures/{instance.digest[:2]}/{instance.digest}.png"
+
+
+class SignatureImage(Model):
+    """
+    A normalized signature or initials image, stored once per distinct image.
+
+    Form fields reference the image instead of holding it inline, see
+    images.py.
+    """
+
+    digest = CharField(_("SHA-256"), max_length=64, unique=True)
+    file = FileField(_("File"), upload_to=signature_image_path)
+    width = PositiveSmallIntegerField(_("Width"))
+    height = PositiveSmallIntegerField(_("Height"))
+    created = DateTimeField(_("Created"), default=timezone.now, editable=False)
+
+    def __str__(self) -> str:
+        return self.digest
+
+
+class FormField(Model):
+    document = ForeignKey(Document, on_delete=CASCADE, related_name="fields")
+    signer = ForeignKey(
+        Signer,
+        on_delete=SET_NULL,
+        null=True,
+        blank=True,
+        related_name="fields",
+    )
+    type = CharField(_("Type"), max_length=20, choices=FieldType.choices)
+    x = FloatField()
+    y = FloatField()
+    width = FloatField(_("Width"))
+    height = FloatField(_("Height"))
+    page = PositiveIntegerField(_("Page"), default=1)
+    required = BooleanField(_("Required"), default=True)
+    label = CharField(_("Label"), max_length=255, blank=True)
+    value = TextField(_("Value"), blank=True)
+    # The filled-in image of a signature or initials field.
+    image = ForeignKey(
+        SignatureImage,
+        on_delete=PROTECT,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
+    def __str__(self) -> str:
+        return self.label or self.get_type_display()
+
+
+class AuditEvent(Model):
+    """
+    An entry in a document's audit trail.
+
+    Each event stores a hash over its own content and the previous event's
+    hash, so any later edit, removal or reordering breaks the chain. Record
+    events with ``AuditEvent.objects.record()`` to keep the chain linear.
+    """
+
+    document = ForeignKey(Document, on_delete=CASCADE, related_name="audit_trail")
+    user = ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    email = EmailField(_("email address"), blank=True)
+    action = CharField(_("Action"), max_length=100)
+    timestamp = DateTimeField(_("Timestamp"), default=timezone.now, editable=False)
+    ip_address = GenericIPAddressField(_("IP address"), null=True, blank=True)
+    user_agent = TextField(_("User agent"), blank=True)
+    details = TextField(_("Details"), blank=True)
+    hash = CharField(_("Hash"), max_length=64, blank=True, editable=False)
+
+    objects: ClassVar[AuditEventManager] = AuditEventManager()
+
+    class Meta:
+        ordering = ["document", "timestamp", "pk"]
+
+    def __str__(self) -> str:
+        return f"{self.action} ({self.timestamp:%Y-%m-%d %H:%M:%S})"
+
+    def compute_hash(self, previous_hash: str) -> str:
+        """Hash the event's content chained onto ``previous_hash``."""
+        content = {
+            "previous": previous_hash,
+            "document": self.document_id,
+            "user": self.user_id,
+            "email": self.email,
+            "action": self.action,
+            "timestamp": self.timestamp.isoformat(),
+            "ip_address": self.ip_address,
+            "user_agent": self.user_agent,
+            "details": self.details,
+        }
+        return hashlib.sha256(
+            json.dumps(content, sort_keys=True).encode(),
+        ).hexdigest()
+
+
+class Certificate(TimeStampedModel):
+    """
+    The certificate of completion of a document, rendered once.
+
+    ``final_file`` is the signed PDF with the certificate pages appended,
+    carrying the platform's digital signature from ``signed_at`` on. Both
+    are served straight from storage on every later download.
+    """
+
+    document = OneToOneField(
+        Document,
+        on_delete=CASCADE,
+        related_name="certificate",
+    )
+    file = FileField(_("File"), upload_to="certificates/%Y/%m/")
+    final_file = FileField(_("Final file"), upload_to="documents/final/%Y/%m/")
+    audit_hash = CharField(_("Audit hash"), max_length=64)
+    signed_at = DateTimeField(_("Signed at"), null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"Certificate of {self.document}"
+
+
+class TimestampBatch(Model):
+    """
+    An RFC 3161 timestamp over the Merkle root of a batch of digests.
+
+    Only the root is sent to the timestamp authority; each digest in the
+    batch keeps the inclusion proof that links it to the root (see
+    timestamps.py).
+    """
+
+    root = CharField(_("Merkle root"), max_length=64)
+    token = BinaryField(_("Timestamp token"))
+    timestamped_at = DateTimeField(_("Timestamped at"))
+    size = PositiveIntegerField(_("Size"))
+    # Whether the token is a valid signature over the root, checked once when
+    # stored; None for batches stored before the result was kept.
+    verified = BooleanField(_("Verified"), null=True)
+
+    class Meta:
+        ordering = ["-timestamped_at"]
+
+    def __str__(self) -> str:
+        return f"{self.root[:16]} ({self.size})"
+
+
+class TimestampLeaf(Model):
+    """
+    A digest waiting for, or covered by, a batched timestamp.
+
+    ``proof`` holds the sibling hashes from the leaf up to its batch's root,
+    each as a ``[side, hash]`` pair where side is "L" or "R".
+    """
+
+    digest = CharField(_("Digest"), max_length=64)
+    audit_event = OneToOneField(
+        AuditEvent,
+        on_delete=CASCADE,
+        null=True,
+        blank=True,
+        related_name="timestamp_leaf",
+    )
+    batch = ForeignKey(
+        TimestampBatch,
+        on_delete=CASCADE,
+        null=True,
+        blank=True,
+        related_name="leaves",
+    )
+    proof = JSONField(_("Inclusion proof"), default=list, blank=True)
+    # Set while a run is timestamping the leaf, so that others pass it over.
+    claimed_until = DateTimeField(_("Claimed until"), null=True, blank=True)
+    created = DateTimeField(_("Created"), default=timezone.now, editable=False)
+
+    class Meta:
+        indexes = [
+            Index(
+                fields=["id"],
+                condition=Q(batch__isnull=True),
+                name="timestamp_leaf_pending_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.digest
+
+
+class ArchiveExport(TimeStampedModel):
+    """
+    A ZIP export of the documents completed in a date range.
+
+    The archive is written in parts of at most ``exports.PART_SIZE``
+    documents, in document order. Each stored part is a checkpoint: an
+    interrupted export resumes after the last document of its last part.
+    """
+
+    class Status(TextChoices):
+        PENDING = "pending", _("Pending")
+        RUNNING = "running", _("Running")
+        COMPLETED = "completed", _("Completed")
+        FAILED = "failed", _("Failed")
+
+    user = ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=CASCADE,
+        related_name="archive_exports",
+    )
+    # Whether to export the whole tenant's documents, or only the user's.
+    tenant = BooleanField(_("Whole tenant"), default=False)
+    completed_from = DateTimeField(_("Completed from"))
+    completed_until = DateTimeField(_("Completed until"))
+    status = CharField(
+        _("Status"),
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    document_count = PositiveIntegerField(_("Document count"), default=0)
+
+    class Meta:
+        ordering = ["-created"]
+
+    def __str__(self) -> str:
+        return f"Export {self.completed_from:%Y-%m-%d}-{self.completed_until:%Y-%m-%d}"
+
+
+class ArchiveExportPart(Model):
+    """One stored ZIP64 archive of an export."""
+
+    export = ForeignKey(ArchiveExport, on_delete=CASCADE, related_name="parts")
+    number = PositiveIntegerField(_("Part number"))
+    file = FileField(_("File"), upload_to="exports/%Y/%m/")
+    # The resume checkpoint; a plain ID since the document may be deleted.
+    last_document_pk = BigIntegerField(_("Last document ID"))
+    document_count = PositiveIntegerField(_("Document count"))
+
+    class Meta:
+        ordering = ["export", "number"]
+        constraints = [
+            UniqueConstraint(
+                fields=["export", "number"],
+                name="unique_archive_export_part_number",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.export} part {self.number}"
@@ -0,0 +1,99 @@
+"""
+Full-text and faceted search over documents.
+
+Every document carries a precomputed ``search_vector`` built from its title,
+description and signers, and each page of its PDF one built from the page
+text (see text.py), all backed by GIN indexes. Substring matches that the
+text parser cannot tokenize (parts of an email address, a misspelt name) fall
+back to ``icontains`` lookups, i.e. ``UPPER(column) LIKE UPPER(...)``, served
+by trigram indexes on ``UPPER(column)``. Signer names and emails are matched
+by a ``UNION`` of one query per column, so that each uses its own index, and
+only among the owner's documents. Trigrams cannot serve terms of fewer than
+``SUBSTRING_MIN_LENGTH`` characters, which are only matched as words.
+"""
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery
+from django.contrib.postgres.search import SearchRank
+from django.contrib.postgres.search import SearchVector
+from django.db.models import Count
+from django.db.models import Exists
+from django.db.models import Expression
+from django.db.models import F
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import QuerySet
+from django.db.models import Subquery
+from django.db.models import TextField
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.db.models.functions import Concat
+
+from .models import Document
+from .models import DocumentPage
+from .models import Signer
+
+# Names and email addresses do not stem, and tenants write in many languages.
+SEARCH_CONFIG = "simple"
+# A trigram index needs at least one whole trigram of the term.
+SUBSTRING_MIN_LENGTH = 3
+
+
+def document_search_vector() -> Expression:
+    """Build the expression stored in ``Document.search_vector``."""
+    signers = (
+        Signer.objects.filter(document=OuterRef("pk"))
+        .order_by()
+        .values("document")
+        .annotate(
+            text=StringAgg(
+                Concat("name", Value(" "), "email", output_field=TextField()),
+                delimiter=" ",
+            ),
+        )
+        .values("text")
+    )
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+        + SearchVector(
+            Coalesce(Subquery(signers), Value(""), output_field=TextField()),
+            weight="C",
+            config=SEARCH_CONFIG,
+        )
+    )
+
+
+def search_documents(owner_id: int, query: str) -> QuerySet[Document]:
+    """Find the owner's documents matching ``query``, best first."""
+    search_query = SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+    page_match = DocumentPage.objects.filter(
+        document=OuterRef("pk"),
+        search_vector=search_query,
+    )
+    matches = Q(search_vector=search_query) | Q(Exists(page_match))
+    if len(query.strip()) >= SUBSTRING_MIN_LENGTH:
+        # Unordered, or Signer.Meta.ordering joins each branch to its document.
+        signers = Signer.objects.filter(document__owner_id=owner_id).order_by()
+        signer_matches = (
+            signers.filter(name__icontains=query)
+            .values("document_id")
+            .union(signers.filter(email__icontains=query).values("document_id"))
+        )
+        matches |= Q(title__icontains=query) | Q(pk__in=signer_matches)
+    return (
+        Document.objects.filter(matches, owner_id=owner_id)
+        .annotate(rank=SearchRank(F("search_vector"), search_query))
+        .order_by("-rank", "-created")
+    )
+
+
+def status_facets(queryset: QuerySet[Document]) -> dict[str, int]:
+    """Count the documents in ``queryset`` per status, including empty ones."""
+    counts = dict(
+        queryset.order_by()
+        .values_list("status")
+        .annotate(count=Count("pk"))
+        .values_list("status", "count"),
+    )
+    return {status: counts.get(status, 0) for status in Document.Status.values}
@@ -0,0 +1,152 @@
+from django.conf import settings
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from signsecure.core.caching import invalidate_on_commit
+from signsecure.outbox.messages import event_message
+from signsecure.outbox.messages import task_message
+from signsecure.outbox.models import OutboxMessage
+
+from .models import AuditEvent
+from .models import Document
+from .models import DocumentCounter
+from .models import FormField
+from .models import Signer
+from .models import Template
+from .models import TemplateField
+from .models import TemplatePage
+from .models import TemplateRole
+from .tasks import extract_document_text
+from .tasks import generate_completion_certificate
+
+SEARCHABLE_DOCUMENT_FIELDS = frozenset({"title", "description"})
+
+
+@receiver(post_save, sender=Document)
+def update_document_search_vector(sender, instance, update_fields=None, **kwargs):
+    """Reindex a document whenever one of its searchable fields may have changed."""
+    if update_fields is not None and not (
+        SEARCHABLE_DOCUMENT_FIELDS & set(update_fields)
+    ):
+        return
+    Document.objects.update_search_vector(instance.pk)
+
+
+@receiver(post_save, sender=Signer)
+@receiver(post_delete, sender=Signer)
+def update_signer_document_search_vector(sender, instance, **kwargs):
+    """Signer names and emails are part of their document's search vector."""
+    Document.objects.update_search_vector(instance.document_id)
+
+
+@receiver(post_save, sender=Document)
+def count_document_status(sender, instance, created, **kwargs):
+    """Move a document between the dashboard counters when its status changes."""
+    if created:
+        deltas = {instance.status: 1}
+    elif instance.tracker.has_changed("status"):
+        deltas = {instance.tracker.previous("status"): -1, instance.status: 1}
+    else:
+        return
+    DocumentCounter.objects.add(settings.SITE_ID, instance.owner_id, deltas)
+
+
+@receiver(post_delete, sender=Document)
+def uncount_document_status(sender, instance, origin=None, **kwargs):
+    """Drop a deleted document from the dashboard counters."""
+    # When the owner is deleted, their counters are cascade-deleted as well.
+    owner_deleted = not (
+        isinstance(origin, Document) or getattr(origin, "model", None) is Document
+    )
+    DocumentCounter.objects.add(
+        settings.SITE_ID,
+        None if owner_deleted else instance.owner_id,
+        {instance.status: -1},
+    )
+
+
+@receiver(post_save, sender=Document)
+def write_document_outbox(sender, instance, created, **kwargs):
+    """
+    Queue the work and events that follow a change to a document.
+
+    Its text is indexed when a PDF is uploaded or replaced, its certificate
+    rendered when it is completed, and status changes are announced. All of
+    it happens once the change is committed, and takes a single insert.
+    Documents created from a template whose text is already extracted are
+    not indexed again: create_from_template copies the text.
+    """
+    status_changed = created or instance.tracker.has_changed("status")
+    messages = []
+    if status_changed:
+        messages.append(
+            event_message(
+                "document.status",
+                instance,
+                {
+                    "id": instance.pk,
+                    "owner": instance.owner_id,
+                    "status": instance.status,
+                },
+            ),
+        )
+    copied_text = (
+        created and instance.shares_template_file and instance.template.has_page_texts
+    )
+    if (
+        instance.file
+        and (created or instance.tracker.has_changed("file"))
+        and not copied_text
+    ):
+        messages.append(
+            task_message(extract_document_text, instance.pk, aggregate=instance),
+        )
+    if status_changed and instance.status == Document.Status.COMPLETED:
+        messages.append(
+            task_message(
+                generate_completion_certificate,
+                instance.pk,
+                aggregate=instance,
+            ),
+        )
+    OutboxMessage.objects.bulk_create(messages)
+
+
+@receiver(post_save, sender=Document)
+@receiver(post_delete, sender=Document)
+def invalidate_cached_document(sender, instance, **kwargs):
+    invalidate_on_commit("document", instance.pk)
+
+
+@receiver(post_save, sender=Signer)
+@receiver(post_delete, sender=Signer)
+@receiver(post_save, sender=FormField)
+@receiver(post_delete, sender=FormField)
+@receiver(post_save, sender=AuditEvent)
+def invalidate_cached_document_parts(sender, instance, **kwargs):
+    """Signers, fields and the audit trail are part of their document's data."""
+    invalidate_on_commit("document", instance.document_id)
+
+
+@receiver(post_save, sender=Template)
+@receiver(post_delete, sender=Template)
+def invalidate_cached_templates(sender, instance, **kwargs):
+    invalidate_on_commit("templates", instance.owner_id)
+
+
+@receiver(post_save, sender=TemplatePage)
+@receiver(post_delete, sender=TemplatePage)
+@receiver(post_save, sender=TemplateRole)
+@receiver(post_delete, sender=TemplateRole)
+@receiver(post_save, sender=TemplateField)
+@receiver(post_delete, sender=TemplateField)
+def invalidate_cached_template_parts(sender, instance, **kwargs):
+    """Pages, roles and fields are part of their owner's cached template list."""
+    owner_id = (
+        Template.objects.filter(pk=instance.template_id)
+        .values_list("owner_id", flat=True)
+        .first()
+    )
+    if owner_id is not None:
+        invalidate_on_commit("templates", owner_id)
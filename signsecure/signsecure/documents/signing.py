@@ -0,0 +1,136 @@
+"""
+Digital (PAdES) signatures on final PDFs.
+
+Final PDFs are sealed with the platform key, configured as PEM files through
+the ``DOCUMENT_SIGNING_*`` settings. The signature is added as an incremental
+update, and pyHanko hashes the signed byte ranges in chunks as it writes
+them, so a large PDF is streamed through a temporary file instead of being
+held in memory. Loaded keys are kept per process, so a worker parses the key
+once rather than once per document.
+"""
+
+import logging
+import tempfile
+from collections.abc import Iterable
+from functools import lru_cache
+from functools import partial
+from pathlib import Path
+from typing import IO
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from pyhanko.pdf_utils.incremental_writer import IncrementalPdfFileWriter
+from pyhanko.pdf_utils.misc import PdfError
+from pyhanko.sign.fields import SigSeedSubFilter
+from pyhanko.sign.general import SigningError
+from pyhanko.sign.signers import PdfSignatureMetadata
+from pyhanko.sign.signers import PdfSigner
+from pyhanko.sign.signers import SimpleSigner
+
+from .models import Certificate
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_FIELD = "SignSecure"
+HASH_CHUNK_SIZE = 64 * 1024
+# Spill signed PDFs larger than this to disk while they are written.
+SPOOL_SIZE = 8 * 1024 * 1024
+
+
+@lru_cache(maxsize=4)
+def _load_signer(
+    key_file: str,
+    cert_file: str,
+    passphrase: str,
+    key_mtime: int,
+) -> SimpleSigner:
+    # ``key_mtime`` is only part of the cache key: a replaced key is reloaded.
+    signer = SimpleSigner.load(
+        key_file,
+        cert_file,
+        key_passphrase=passphrase.encode() or None,
+    )
+    if signer is None:
+        msg = f"Could not load the document signing key from {key_file}"
+        raise ValueError(msg)
+    return signer
+
+
+def get_signer() -> SimpleSigner | None:
+    """Get the platform signer, or None if no signing key is configured."""
+    key_file = settings.DOCUMENT_SIGNING_KEY_FILE
+    if not key_file:
+        return None
+    return _load_signer(
+        key_file,
+        settings.DOCUMENT_SIGNING_CERT_FILE,
+        settings.DOCUMENT_SIGNING_KEY_PASSPHRASE,
+        Path(key_file).stat().st_mtime_ns,
+    )
+
+
+def sign_pdf(source: IO[bytes], output: IO[bytes], signer: SimpleSigner) -> None:
+    """Write the PDF in ``source`` to ``output`` with a PAdES signature added."""
+    metadata = PdfSignatureMetadata(
+        field_name=SIGNATURE_FIELD,
+        md_algorithm="sha256",
+        subfilter=SigSeedSubFilter.PADES,
+        reason="Certified by SignSecure",
+    )
+    PdfSigner(metadata, signer).sign_pdf(
+        IncrementalPdfFileWriter(source, strict=False),
+        output=output,
+        chunk_size=HASH_CHUNK_SIZE,
+    )
+
+
+def sign_final_file(certificate: Certificate, signer: SimpleSigner) -> None:
+    """Replace the certificate's final PDF with a signed copy."""
+    old_name = certificate.final_file.name
+    with (
+        certificate.final_file.open("rb") as source,
+        tempfile.SpooledTemporaryFile(SPOOL_SIZE) as output,
+    ):
+        sign_pdf(source, output, signer)
+        output.seek(0)
+        certificate.final_file.save(
+            f"document-{certificate.document_id}.pdf",
+            File(output),
+            save=False,
+        )
+    certificate.signed_at = timezone.now()
+    certificate.save(update_fields=["final_file", "signed_at", "modified"])
+    transaction.on_commit(partial(certificate.final_file.storage.delete, old_name))
+
+
+def sign_documents(document_ids: Iterable[int]) -> int:
+    """
+    Sign the final PDFs of the given documents that are not signed yet.
+
+    Certificates being signed elsewhere are skipped, so overlapping batches
+    do not sign a file twice. A file that cannot be signed is logged and left
+    for the next batch. Returns the number of files signed.
+    """
+    signer = get_signer()
+    if signer is None:
+        return 0
+    signed = 0
+    for document_id in document_ids:
+        with transaction.atomic():
+            certificate = (
+                Certificate.objects.select_for_update(skip_locked=True)
+                .filter(document_id=document_id, signed_at__isnull=True)
+                .first()
+            )
+            if certificate is None:
+                continue
+            try:
+                sign_final_file(certificate, signer)
+            except (PdfError, SigningError):
+                logger.exception("Could not sign document %s", document_id)
+                continue
+        signed += 1
+    logger.info("Signed %s final documents", signed)
+    return signed
@@ -0,0 +1,174 @@
+from itertools import batched
+
+from celery import shared_task
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import Count
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models import Sum
+
+from signsecure.jobs.chunking import chunked_job
+
+from .certificates import generate_certificate
+from .exports import build_next_part
+from .models import ArchiveExport
+from .models import ArchiveExportPart
+from .models import Certificate
+from .models import Document
+from .models import DocumentCounter
+from .signing import get_signer
+from .signing import sign_documents
+from .text import index_document_text
+from .timestamps import timestamp_pending_leaves
+
+SIGNING_BATCH_SIZE = 100
+
+
+@shared_task()
+def reconcile_document_counters():
+    """
+    Recount documents per owner and status and repair drifted counters.
+
+    Status changes made with ``QuerySet.update()`` or raw SQL bypass the
+    signals that keep the counters current; this brings them back in line.
+    Returns the number of counters that were corrected.
+    """
+    site_id = settings.SITE_ID
+    # Read without locks, so that status changes carry on during the recount.
+    counters = DocumentCounter.objects.filter(site_id=site_id).order_by()
+    stored = {
+        (owner_id, status): total
+        for owner_id, status, total in counters.values("owner_id", "status")
+        .annotate(total=Sum("count"))
+        .values_list("owner_id", "status", "total")
+    }
+    sharded = set(
+        counters.filter(shard__gt=0)
+        .exclude(count=0)
+        .values_list("owner_id", "status")
+        .distinct(),
+    )
+    actual: dict[tuple[int | None, str], int] = {}
+    for owner_id, status, count in (
+        Document.objects.order_by()
+        .values_list("owner_id", "status")
+        .annotate(count=Count("pk"))
+    ):
+        actual[(owner_id, status)] = count
+        actual[(None, status)] = actual.get((None, status), 0) + count
+
+    # Each counter is corrected by the difference, in a transaction of its
+    # own, so changes made since it was read are kept. A change made between
+    # the two reads is corrected by the next run.
+    corrected = 0
+    for owner_id, status in stored.keys() | actual.keys():
+        delta = actual.get((owner_id, status), 0) - stored.get((owner_id, status), 0)
+        if delta or (owner_id, status) in sharded:
+            DocumentCounter.objects.merge(site_id, owner_id, status, delta)
+            corrected += 1
+    return corrected
+
+
+@shared_task(soft_time_limit=4 * 60)
+def extract_document_text(document_id):
+    """Index the text of a newly uploaded PDF, page by page."""
+    return index_document_text(document_id)
+
+
+@shared_task(soft_time_limit=4 * 60)
+def generate_completion_certificate(document_id):
+    """Render and store the certificate of a completed document."""
+    return generate_certificate(document_id).pk
+
+
+@shared_task(soft_time_limit=4 * 60)
+def sign_final_documents(document_ids):
+    """Sign a batch of final PDFs with the platform key."""
+    return sign_documents(document_ids)
+
+
+@shared_task()
+def sign_unsigned_documents():
+    """
+    Queue the final PDFs that are not signed yet for signing, in batches.
+
+    Picks up certificates rendered before a signing key was configured, and
+    files whose signing failed. Returns the number of batches queued.
+    """
+    if get_signer() is None:
+        return 0
+    document_ids = (
+        Certificate.objects.filter(signed_at__isnull=True)
+        .order_by("pk")
+        .values_list("document_id", flat=True)
+    )
+    batches = 0
+    for batch in batched(document_ids.iterator(), SIGNING_BATCH_SIZE):
+        sign_final_documents.delay(list(batch))
+        batches += 1
+    return batches
+
+
+@shared_task()
+def timestamp_audit_events():
+    """Timestamp the audit events recorded since the last run, as one batch."""
+    return timestamp_pending_leaves()
+
+
+@shared_task(
+    acks_late=True,
+    reject_on_worker_lost=True,
+    soft_time_limit=55 * 60,
+    time_limit=60 * 60,
+)
+def build_archive_export(export_id):
+    """
+    Write the next part of an archive export, then queue the one after.
+
+    Each run stores one part, so a run lost with its worker is redelivered
+    and picks up from the last stored part. A second run for the same part
+    finds it stored and stops, leaving the first to carry on.
+    """
+    exports = ArchiveExport.objects.filter(pk=export_id)
+    export = exports.get()
+    if export.status == ArchiveExport.Status.COMPLETED:
+        return None
+    exports.update(status=ArchiveExport.Status.RUNNING)
+    try:
+        part = build_next_part(export)
+    except IntegrityError:
+        # Another run of this task stored the part first, and carries on.
+        return None
+    except Exception:
+        exports.update(status=ArchiveExport.Status.FAILED)
+        raise
+    if part is None:
+        exports.update(status=ArchiveExport.Status.COMPLETED)
+        return None
+    # Summed over the stored parts rather than incremented, so that a run
+    # lost between storing its part and this update is still counted.
+    exports.update(
+        document_count=Subquery(
+            ArchiveExportPart.objects.filter(export=OuterRef("pk"))
+            .values("export")
+            .annotate(total=Sum("document_count"))
+            .values("total"),
+        ),
+    )
+    build_archive_export.delay(export_id)
+    return part.pk
+
+
+@chunked_job(
+    "documents.reindex_text",
+    queryset=lambda: Document.objects.exclude(file=""),
+    queue="pdf",
+    # A PDF may take seconds to extract, and a chunk has four minutes.
+    chunk_size=20,
+)
+def reindex_text_chunk(documents):
+    """Re-extract the text of a chunk of documents."""
+    document_ids = list(documents.values_list("pk", flat=True))
+    pages = sum(index_document_text(document_id) for document_id in document_ids)
+    return {"documents": len(document_ids), "pages": pages}
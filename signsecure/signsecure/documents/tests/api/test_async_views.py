@@ -0,0 +1,155 @@
+import contextlib
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from signsecure.core import replicas
+from signsecure.documents.api import async_views
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.documents.tests.factories import FormFieldFactory
+from signsecure.documents.tests.factories import SignerFactory
+from signsecure.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+class TestDocumentSession:
+    def test_session(self, user: User, client):
+        document = DocumentFactory(owner=user)
+        signer = SignerFactory(document=document)
+        FormFieldFactory(document=document, signer=signer)
+        client.force_login(user)
+
+        response = client.get(
+            reverse("api:document-session", kwargs={"pk": document.pk}),
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data["id"] == document.pk
+        assert [s["id"] for s in data["signers"]] == [signer.pk]
+        assert len(data["fields"]) == 1
+
+    def test_other_users_document(self, user: User, client):
+        document = DocumentFactory()
+        client.force_login(user)
+
+        response = client.get(
+            reverse("api:document-session", kwargs={"pk": document.pk}),
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert response.json() == {"detail": "No Document matches the given query."}
+
+    def test_requires_authentication(self, client):
+        document = DocumentFactory()
+
+        response = client.get(
+            reverse("api:document-session", kwargs={"pk": document.pk}),
+        )
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_token_authentication(self, user: User, client):
+        document = DocumentFactory(owner=user)
+        token = Token.objects.create(user=user)
+
+        response = client.get(
+            reverse("api:document-session", kwargs={"pk": document.pk}),
+            headers={"Authorization": f"Token {token.key}"},
+        )
+
+        assert response.status_code == HTTPStatus.OK
+
+    def test_read_only(self, user: User, client):
+        document = DocumentFactory(owner=user)
+        client.force_login(user)
+
+        response = client.post(
+            reverse("api:document-session", kwargs={"pk": document.pk}),
+        )
+
+        assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+class TestDocumentStatus:
+    def test_status(self, user: User, client):
+        document = DocumentFactory(owner=user, status="sent")
+        signer = SignerFactory(document=document, status="signed")
+        client.force_login(user)
+
+        response = client.get(
+            reverse("api:document-status", kwargs={"pk": document.pk}),
+        )
+
+        data = response.json()
+        assert data["status"] == "sent"
+        assert [(s["id"], s["status"]) for s in data["signers"]] == [
+            (signer.pk, "signed"),
+        ]
+
+    def test_wait_without_redis(self, user: User, client, settings):
+        settings.OUTBOX_REDIS_URL = ""
+        document = DocumentFactory(owner=user, status="sent")
+        client.force_login(user)
+
+        response = client.get(
+            reverse("api:document-status", kwargs={"pk": document.pk}),
+            {"status": "sent", "wait": 20},
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["status"] == "sent"
+
+    def test_wait_rereads_from_primary(
+        self,
+        user: User,
+        client,
+        monkeypatch,
+        settings,
+    ):
+        # No replica is usable, so reads go to the primary, which the test
+        # has, whether or not they could go to a replica.
+        settings.DATABASE_REPLICAS = ["replica1"]
+        monkeypatch.setattr(replicas, "choose_replica", lambda: None)
+        document = DocumentFactory(owner=user, status="sent")
+        from_replica = []
+        read_document = async_views._get_document  # noqa: SLF001
+
+        async def get_document(user, pk, *lookups):
+            state = replicas._read_state.get()  # noqa: SLF001
+            from_replica.append(state is not None and state.replica)
+            return await read_document(user, pk, *lookups)
+
+        @contextlib.asynccontextmanager
+        async def event_subscription(topic):
+            yield object()
+
+        async def next_event(pubsub, aggregate):
+            return {}
+
+        monkeypatch.setattr(async_views, "_get_document", get_document)
+        monkeypatch.setattr(async_views, "event_subscription", event_subscription)
+        monkeypatch.setattr(async_views, "next_event", next_event)
+        client.force_login(user)
+
+        client.get(
+            reverse("api:document-status", kwargs={"pk": document.pk}),
+            {"status": "sent", "wait": 20},
+        )
+
+        assert from_replica == [True, False]
+
+    def test_wait_too_long(self, user: User, client):
+        document = DocumentFactory(owner=user)
+        client.force_login(user)
+
+        response = client.get(
+            reverse("api:document-status", kwargs={"pk": document.pk}),
+            {"status": "sent", "wait": 60},
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert "wait" in response.json()
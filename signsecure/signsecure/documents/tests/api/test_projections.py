@@ -0,0 +1,81 @@
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from signsecure.documents.api.projections import DocumentProjection
+from signsecure.documents.api.serializers import DocumentSerializer
+from signsecure.documents.models import AuditEvent
+from signsecure.documents.models import Document
+from signsecure.documents.models import SignatureImage
+from signsecure.documents.models import Signer
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.documents.tests.factories import FormFieldFactory
+from signsecure.documents.tests.factories import SignerFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestDocumentProjection:
+    def test_matches_serializer(self, user):
+        document = DocumentFactory(owner=user, expires_at=timezone.now())
+        signer = SignerFactory(
+            document=document,
+            status=Signer.Status.SIGNED,
+            signed_at=timezone.now(),
+        )
+        FormFieldFactory(
+            document=document,
+            signer=signer,
+            image=SignatureImage.objects.create(
+                digest="0" * 64,
+                file=ContentFile(b"PNG", name="signature.png"),
+                width=1,
+                height=1,
+            ),
+        )
+        FormFieldFactory(document=document, label="Date")
+        DocumentFactory(owner=user)
+        request = APIRequestFactory().get("/")
+        documents = Document.objects.filter(owner=user)
+
+        projected = DocumentProjection().project(
+            DocumentProjection().values(documents),
+            request,
+        )
+
+        serialized = DocumentSerializer(
+            documents.prefetch_related("signers", "fields__image"),
+            many=True,
+            context={"request": request},
+        ).data
+        assert projected == serialized
+
+    def test_fieldset_matches_serializer(self, user):
+        document = DocumentFactory(owner=user)
+        AuditEvent.objects.record(document, "document.created", ip_address="::1")
+        request = APIRequestFactory().get("/")
+        documents = Document.objects.filter(owner=user)
+        fieldset = ["id", "status", "template", "audit_trail"]
+
+        projection = DocumentProjection(fieldset)
+        projected = projection.project(projection.values(documents), request)
+
+        serialized = DocumentSerializer(
+            documents.prefetch_related("audit_trail"),
+            many=True,
+            fieldset=fieldset,
+        ).data
+        assert projected == serialized
+
+
+def test_benchmark_lists():
+    out = StringIO()
+
+    call_command("benchmark_lists", rows=5, repeat=1, stdout=out)
+
+    assert out.getvalue().startswith("users: serializer")
+    assert not Document.objects.exists()
@@ -0,0 +1,591 @@
+import json
+import zipfile
+from datetime import timedelta
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from signsecure.core.tiered import tiered_cache
+from signsecure.documents.api import views
+from signsecure.documents.certificates import generate_certificate
+from signsecure.documents.models import ArchiveExport
+from signsecure.documents.models import AuditEvent
+from signsecure.documents.models import Document
+from signsecure.documents.models import FieldType
+from signsecure.documents.models import Signer
+from signsecure.documents.models import TimestampBatch
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.documents.tests.factories import FormFieldFactory
+from signsecure.documents.tests.factories import SignerFactory
+from signsecure.documents.tests.factories import TemplateFactory
+from signsecure.documents.tests.factories import TemplateFieldFactory
+from signsecure.documents.tests.factories import TemplateRoleFactory
+from signsecure.documents.tests.factories import make_pdf
+from signsecure.documents.tests.test_images import data_url
+from signsecure.documents.timestamps import merkle_root
+from signsecure.documents.timestamps import timestamp_pending_leaves
+from signsecure.outbox.relay import relay_outbox
+from signsecure.users.models import User
+from signsecure.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestDocumentViewSet:
+    def test_list_only_own(self, user: User, client):
+        own = DocumentFactory(owner=user)
+        DocumentFactory()
+        client.force_login(user)
+
+        response = client.get(reverse("api:document-list"))
+
+        assert response.status_code == HTTPStatus.OK
+        assert [d["id"] for d in response.json()] == [own.pk]
+
+    def test_list_paginated_on_request(self, user: User, client):
+        documents = DocumentFactory.create_batch(3, owner=user)
+        client.force_login(user)
+
+        response = client.get(reverse("api:document-list"), {"limit": 2})
+
+        data = response.json()
+        assert data["count"] == len(documents)
+        assert len(data["results"]) == 2  # noqa: PLR2004
+
+
+class TestFieldsets:
+    def test_list_fields(self, user: User, client):
+        SignerFactory(document=DocumentFactory(owner=user))
+        client.force_login(user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(
+                reverse("api:document-list"),
+                {"fields": "id,title,status"},
+            )
+
+        assert list(response.json()[0]) == ["id", "title", "status"]
+        assert not any("documents_signer" in q["sql"] for q in queries)
+
+    def test_retrieve_fields(self, user: User, client):
+        document = DocumentFactory(owner=user)
+        client.force_login(user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(
+                reverse("api:document-detail", kwargs={"pk": document.pk}),
+                {"fields": "status,id"},
+            )
+
+        assert response.json() == {"id": document.pk, "status": document.status}
+        (select,) = [q["sql"] for q in queries if "documents_document" in q["sql"]]
+        assert '"documents_document"."title"' not in select
+
+    def test_expand_audit_trail(self, user: User, client):
+        document = DocumentFactory(owner=user)
+        AuditEvent.objects.record(document, "document.created", user=user)
+        client.force_login(user)
+
+        for url in [
+            reverse("api:document-list"),
+            reverse("api:document-detail", kwargs={"pk": document.pk}),
+        ]:
+            response = client.get(url, {"fields": "id", "expand": "audit_trail"})
+
+            data = response.json()
+            data = data[0] if isinstance(data, list) else data
+            assert list(data) == ["id", "audit_trail"]
+            assert [e["action"] for e in data["audit_trail"]] == ["document.created"]
+
+    def test_audit_trail_not_by_default(self, user: User, client):
+        document = DocumentFactory(owner=user)
+        client.force_login(user)
+
+        response = client.get(
+            reverse("api:document-detail", kwargs={"pk": document.pk}),
+        )
+
+        assert "audit_trail" not in response.json()
+
+    @pytest.mark.parametrize("params", [{"fields": "id,owner"}, {"expand": "fields"}])
+    def test_unknown_fields(self, user: User, client, params):
+        document = DocumentFactory(owner=user)
+        client.force_login(user)
+
+        for url in [
+            reverse("api:document-list"),
+            reverse("api:document-detail", kwargs={"pk": document.pk}),
+        ]:
+            assert client.get(url, params).status_code == HTTPStatus.BAD_REQUEST
+
+
+class TestFillFields:
+    @pytest.fixture
+    def signer(self, user: User):
+        return SignerFactory(
+            email=user.email.upper(),
+            document__status=Document.Status.SENT,
+        )
+
+    def fill(self, client, document, fields):
+        return client.post(
+            reverse("api:document-fill", kwargs={"pk": document.pk}),
+            {"fields": fields},
+            content_type="application/json",
+        )
+
+    def test_fill(self, user: User, client, signer):
+        signature = FormFieldFactory(document=signer.document, signer=signer)
+        company = FormFieldFactory(
+            document=signer.document,
+            signer=signer,
+            type=FieldType.TEXT,
+        )
+        client.force_login(user)
+
+        response = self.fill(
+            client,
+            signer.document,
+            [
+                {"id": signature.pk, "value": data_url()},
+                {"id": company.pk, "value": "Acme Ltd."},
+            ],
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        signature.refresh_from_db()
+        company.refresh_from_db()
+        assert signature.value == ""
+        assert signature.image is not None
+        assert company.value == "Acme Ltd."
+        by_id = {field["id"]: field for field in response.json()}
+        assert by_id[signature.pk]["image"].endswith(".png")
+
+    def test_other_signers_fields(self, user: User, client, signer):
+        other = SignerFactory(document=signer.document)
+        field = FormFieldFactory(document=signer.document, signer=other)
+        client.force_login(user)
+
+        response = self.fill(client, signer.document, [{"id": field.pk, "value": "x"}])
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        field.refresh_from_db()
+        assert field.value == ""
+
+    def test_not_a_signer(self, user: User, client):
+        field = FormFieldFactory(document__status=Document.Status.SENT)
+        client.force_login(user)
+
+        response = self.fill(client, field.document, [{"id": field.pk, "value": "x"}])
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_already_signed(self, user: User, client, signer):
+        signer.status = Signer.Status.SIGNED
+        signer.save()
+        field = FormFieldFactory(
+            document=signer.document,
+            signer=signer,
+            type=FieldType.TEXT,
+        )
+        client.force_login(user)
+
+        response = self.fill(client, signer.document, [{"id": field.pk, "value": "x"}])
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_invalid_image_fills_nothing(self, user: User, client, signer):
+        company = FormFieldFactory(
+            document=signer.document,
+            signer=signer,
+            type=FieldType.TEXT,
+        )
+        signature = FormFieldFactory(document=signer.document, signer=signer)
+        client.force_login(user)
+
+        response = self.fill(
+            client,
+            signer.document,
+            [
+                {"id": company.pk, "value": "Acme Ltd."},
+                {"id": signature.pk, "value": "not an image"},
+            ],
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert str(signature.pk) in response.json()["fields"]
+        company.refresh_from_db()
+        assert company.value == ""
+
+
+class TestTemplateViewSet:
+    def test_instantiate(self, user: User, client):
+        template = TemplateFactory(owner=user)
+        role = TemplateRoleFactory(template=template, name="Signer")
+        TemplateFieldFactory(template=template, role=role)
+        client.force_login(user)
+
+        response = client.post(
+            reverse("api:template-instantiate", kwargs={"pk": template.pk}),
+            data={
+                "title": "Acme NDA",
+                "signers": [
+                    {"role": "Signer", "name": "Ada", "email": "ada@example.com"},
+                ],
+            },
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.CREATED
+        data = response.json()
+        assert data["title"] == "Acme NDA"
+        assert data["template"] == template.pk
+        assert data["fields"][0]["signer"] == data["signers"][0]["id"]
+
+    def test_instantiate_missing_role(self, user: User, client):
+        template = TemplateFactory(owner=user)
+        TemplateRoleFactory(template=template, name="Signer")
+        client.force_login(user)
+
+        response = client.post(
+            reverse("api:template-instantiate", kwargs={"pk": template.pk}),
+            data={"signers": []},
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert "signers" in response.json()
+        assert not Document.objects.exists()
+
+    def test_instantiate_other_users_template(self, user: User, client):
+        template = TemplateFactory()
+        client.force_login(user)
+
+        response = client.post(
+            reverse("api:template-instantiate", kwargs={"pk": template.pk}),
+            data={"signers": []},
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+class TestDocumentSearch:
+    def test_search(self, user: User, client):
+        sent = DocumentFactory(owner=user, title="Acme NDA", status="sent")
+        DocumentFactory(owner=user, title="Acme lease", status="draft")
+        DocumentFactory(owner=user, title="Invoice")
+        DocumentFactory(title="Acme NDA")
+        client.force_login(user)
+
+        response = client.get(
+            reverse("api:document-search"),
+            data={"q": "acme", "status": "sent"},
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data["count"] == 1
+        assert [d["id"] for d in data["results"]] == [sent.pk]
+        assert data["facets"]["status"]["sent"] == 1
+        assert data["facets"]["status"]["draft"] == 1
+
+    def test_search_signers(self, user: User, client):
+        signed = DocumentFactory(owner=user)
+        SignerFactory(document=signed, email="grace@navy.example")
+        DocumentFactory(owner=user)
+        SignerFactory(document__title="Other owner", email="grace@navy.example")
+        client.force_login(user)
+
+        response = client.get(reverse("api:document-search"), data={"q": "navy"})
+
+        assert [d["id"] for d in response.json()["results"]] == [signed.pk]
+
+    def test_search_requires_query(self, user: User, client):
+        client.force_login(user)
+
+        response = client.get(reverse("api:document-search"))
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+class TestDocumentCounts:
+    def test_counts(self, user: User, client):
+        DocumentFactory(owner=user, status="sent")
+        DocumentFactory(status="sent")
+        client.force_login(user)
+
+        response = client.get(reverse("api:document-counts"))
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            "user": {
+                "draft": 0,
+                "sent": 1,
+                "completed": 0,
+                "declined": 0,
+                "expired": 0,
+            },
+        }
+
+    def test_counts_staff_see_tenant(self, admin_client):
+        DocumentFactory(status="sent")
+
+        response = admin_client.get(reverse("api:document-counts"))
+
+        assert response.json()["tenant"]["sent"] == 1
+
+
+class TestCertificateDownload:
+    def test_not_generated(self, user: User, client):
+        document = DocumentFactory(owner=user)
+        client.force_login(user)
+
+        response = client.get(
+            reverse("api:document-certificate", kwargs={"pk": document.pk}),
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_download(self, user: User, client):
+        document = DocumentFactory(
+            owner=user,
+            file=ContentFile(make_pdf(["Lease"]), "lease.pdf"),
+        )
+        generate_certificate(document.pk)
+        client.force_login(user)
+
+        response = client.get(reverse("api:document-final", kwargs={"pk": document.pk}))
+
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"] == "application/pdf"
+        assert b"".join(response.streaming_content).startswith(b"%PDF")
+
+    def test_not_modified(self, user: User, client):
+        document = DocumentFactory(
+            owner=user,
+            file=ContentFile(make_pdf(["Lease"]), "lease.pdf"),
+        )
+        generate_certificate(document.pk)
+        client.force_login(user)
+        url = reverse("api:document-final", kwargs={"pk": document.pk})
+        downloaded = client.get(url)
+        b"".join(downloaded.streaming_content)
+        etag = downloaded["ETag"]
+
+        response = client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert not response.content
+
+
+class TestAuditTimestamps:
+    def test_timestamps(self, user: User, client, settings, signing_cert):
+        settings.DOCUMENT_TIMESTAMPER = (
+            "signsecure.documents.timestamps.local_timestamper"
+        )
+        document = DocumentFactory(owner=user)
+        AuditEvent.objects.record(document, "document_sent")
+        AuditEvent.objects.record(DocumentFactory(), "document_sent")
+        AuditEvent.objects.record(document, "document_viewed")
+        timestamp_pending_leaves()
+        AuditEvent.objects.record(document, "document_signed")
+        client.force_login(user)
+
+        response = client.get(
+            reverse("api:document-timestamps", kwargs={"pk": document.pk}),
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [t["action"] for t in data] == ["document_sent", "document_viewed"]
+        for timestamp in data:
+            assert timestamp["verified"]
+            assert (
+                merkle_root(timestamp["digest"], timestamp["proof"])
+                == timestamp["merkle_root"]
+            )
+
+    def test_tokens_checked_once(
+        self,
+        user: User,
+        client,
+        settings,
+        monkeypatch,
+        signing_cert,
+    ):
+        settings.DOCUMENT_TIMESTAMPER = (
+            "signsecure.documents.timestamps.local_timestamper"
+        )
+        document = DocumentFactory(owner=user)
+        AuditEvent.objects.record(document, "document_sent")
+        timestamp_pending_leaves()
+        AuditEvent.objects.record(document, "document_viewed")
+        timestamp_pending_leaves()
+        # Stored before the result of the check was kept.
+        first = TimestampBatch.objects.earliest("pk")
+        TimestampBatch.objects.filter(pk=first.pk).update(verified=None)
+        verify_batch = views.verify_batch
+        checked = []
+
+        def check(batch):
+            checked.append(batch.pk)
+            return verify_batch(batch)
+
+        monkeypatch.setattr(views, "verify_batch", check)
+        client.force_login(user)
+        url = reverse("api:document-timestamps", kwargs={"pk": document.pk})
+
+        assert all(t["verified"] for t in client.get(url).json())
+        assert all(t["verified"] for t in client.get(url).json())
+        assert len(checked) == 1
+        assert not TimestampBatch.objects.filter(verified=None).exists()
+
+
+class TestArchiveExports:
+    @pytest.fixture
+    def date_range(self):
+        now = timezone.now()
+        return {
+            "completed_from": (now - timedelta(days=1)).isoformat(),
+            "completed_until": (now + timedelta(days=1)).isoformat(),
+        }
+
+    @pytest.fixture
+    def document(self, user: User):
+        document = DocumentFactory(
+            owner=user,
+            status=Document.Status.COMPLETED,
+            file=ContentFile(make_pdf(["Lease"]), "lease.pdf"),
+        )
+        generate_certificate(document.pk)
+        return document
+
+    @pytest.mark.usefixtures("document")
+    def test_create(
+        self,
+        user: User,
+        client,
+        date_range,
+        settings,
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        client.force_login(user)
+
+        response = client.post(reverse("api:archiveexport-list"), date_range)
+        relay_outbox()
+
+        assert response.status_code == HTTPStatus.CREATED
+        export = ArchiveExport.objects.get(pk=response.json()["id"])
+        assert export.status == ArchiveExport.Status.COMPLETED
+        assert export.parts.count() == 1
+
+    def test_tenant_requires_staff(self, user: User, client, date_range):
+        client.force_login(user)
+
+        response = client.post(
+            reverse("api:archiveexport-list"),
+            {**date_range, "tenant": True},
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_stream(self, user: User, client, document, date_range):
+        client.force_login(user)
+
+        response = client.get(reverse("api:archiveexport-stream"), date_range)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"] == "application/zip"
+        archive = BytesIO(b"".join(response.streaming_content))
+        with zipfile.ZipFile(archive) as reader:
+            assert reader.namelist()[0].startswith(f"{document.pk}-")
+
+
+class TestAuditExport:
+    def test_ndjson(self, user: User, client):
+        document = DocumentFactory(owner=user)
+        AuditEvent.objects.record(document, "document_sent")
+        AuditEvent.objects.record(DocumentFactory(), "document_sent")
+        client.force_login(user)
+
+        response = client.get(reverse("api:document-audit-export"))
+
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"] == "application/x-ndjson"
+        # The content is an async generator, meant to be served under ASGI.
+        with pytest.warns(Warning, match="asynchronous iterators"):
+            lines = b"".join(response).splitlines()
+        assert [json.loads(line)["document_id"] for line in lines] == [document.pk]
+
+    def test_tenant_requires_staff(self, user: User, client):
+        client.force_login(user)
+
+        response = client.get(
+            reverse("api:document-audit-export"),
+            {"tenant": "true", "file_format": "csv"},
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+class TestResponseCache:
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        tiered_cache.clear()
+        yield
+        tiered_cache.clear()
+
+    def test_document_invalidated_by_signer(
+        self,
+        user: User,
+        client,
+        django_capture_on_commit_callbacks,
+    ):
+        document = DocumentFactory(owner=user)
+        signer = SignerFactory(document=document, name="Before")
+        url = reverse("api:document-detail", kwargs={"pk": document.pk})
+        client.force_login(user)
+        assert client.get(url).json()["signers"][0]["name"] == "Before"
+
+        Signer.objects.filter(pk=signer.pk).update(name="Unsignalled")
+        assert client.get(url).json()["signers"][0]["name"] == "Before"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            signer.name = "After"
+            signer.save()
+
+        assert client.get(url).json()["signers"][0]["name"] == "After"
+
+    def test_document_cached_per_user(self, user: User, client):
+        document = DocumentFactory(owner=user)
+        url = reverse("api:document-detail", kwargs={"pk": document.pk})
+        client.force_login(user)
+        assert client.get(url).status_code == HTTPStatus.OK
+
+        client.force_login(UserFactory())
+
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+    def test_templates_invalidated_by_role(
+        self,
+        user: User,
+        client,
+        django_capture_on_commit_callbacks,
+    ):
+        template = TemplateFactory(owner=user)
+        url = reverse("api:template-list")
+        client.force_login(user)
+        assert client.get(url).json()[0]["roles"] == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            TemplateRoleFactory(template=template, name="Witness")
+
+        assert [r["name"] for r in client.get(url).json()[0]["roles"]] == ["Witness"]
@@ -0,0 +1,123 @@
+from collections.abc import Sequence as SequenceOf
+
+from factory import Faker
+from factory import Sequence
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+from factory.django import FileField
+
+from signsecure.documents.models import Document
+from signsecure.documents.models import FieldType
+from signsecure.documents.models import FormField
+from signsecure.documents.models import Signer
+from signsecure.documents.models import Template
+from signsecure.documents.models import TemplateField
+from signsecure.documents.models import TemplatePage
+from signsecure.documents.models import TemplateRole
+from signsecure.users.tests.factories import UserFactory
+
+
+def make_pdf(pages: SequenceOf[str]) -> bytes:
+    """Build a minimal PDF with one line of Helvetica text on each page."""
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % i for i in page_ids), len(pages)),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page_id, text in zip(page_ids, pages, strict=True):
+        content = b"BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text.encode("latin-1")
+        objects += [
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (page_id + 1),
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content),
+        ]
+    pdf = b"%PDF-1.7\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return pdf
+
+
+class TemplateFactory(DjangoModelFactory[Template]):
+    owner = SubFactory(UserFactory)
+    title = Faker("sentence", nb_words=3)
+    file = FileField(filename="template.pdf", data=b"%PDF-1.7\n")
+    page_count = 1
+
+    class Meta:
+        model = Template
+
+
+class TemplatePageFactory(DjangoModelFactory[TemplatePage]):
+    template = SubFactory(TemplateFactory)
+    number = Sequence(lambda n: n + 1)
+    image = FileField(filename="page.png", data=b"\x89PNG\r\n")
+    width = 612.0
+    height = 792.0
+
+    class Meta:
+        model = TemplatePage
+
+
+class TemplateRoleFactory(DjangoModelFactory[TemplateRole]):
+    template = SubFactory(TemplateFactory)
+    name = Sequence(lambda n: f"Role {n}")
+    order = 1
+
+    class Meta:
+        model = TemplateRole
+
+
+class TemplateFieldFactory(DjangoModelFactory[TemplateField]):
+    template = SubFactory(TemplateFactory)
+    type = FieldType.SIGNATURE
+    x = 100.0
+    y = 600.0
+    width = 200.0
+    height = 50.0
+    page = 1
+
+    class Meta:
+        model = TemplateField
+
+
+class DocumentFactory(DjangoModelFactory[Document]):
+    owner = SubFactory(UserFactory)
+    title = Faker("sentence", nb_words=3)
+    file = FileField(filename="document.pdf", data=b"%PDF-1.7\n")
+
+    class Meta:
+        model = Document
+
+
+class SignerFactory(DjangoModelFactory[Signer]):
+    document = SubFactory(DocumentFactory)
+    email = Faker("email")
+    name = Faker("name")
+
+    class Meta:
+        model = Signer
+
+
+class FormFieldFactory(DjangoModelFactory[FormField]):
+    document = SubFactory(DocumentFactory)
+    type = FieldType.SIGNATURE
+    x = 100.0
+    y = 600.0
+    width = 200.0
+    height = 50.0
+    page = 1
+
+    class Meta:
+        model = FormField
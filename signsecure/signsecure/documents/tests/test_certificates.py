@@ -0,0 +1,111 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from pypdf import PdfReader
+
+from signsecure.documents import certificates
+from signsecure.documents.certificates import generate_certificate
+from signsecure.documents.certificates import render_certificate
+from signsecure.documents.models import AuditEvent
+from signsecure.documents.models import Certificate
+from signsecure.documents.models import Document
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.documents.tests.factories import SignerFactory
+from signsecure.documents.tests.factories import make_pdf
+from signsecure.outbox.relay import relay_outbox
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def document():
+    document = DocumentFactory(
+        title="Supply agreement",
+        file=ContentFile(make_pdf(["Page one", "Page two"]), "supply.pdf"),
+    )
+    SignerFactory(document=document, name="Ada Lovelace", email="ada@example.com")
+    AuditEvent.objects.record(document, "document_sent")
+    AuditEvent.objects.record(
+        document,
+        "document_signed",
+        email="ada@example.com",
+        ip_address="203.0.113.7",
+    )
+    return document
+
+
+class TestGenerateCertificate:
+    def test_renders_summary(self, document: Document):
+        certificate = generate_certificate(document.pk)
+
+        with certificate.file.open("rb") as stream:
+            text = "".join(page.extract_text() for page in PdfReader(stream).pages)
+        assert "Supply agreement" in text
+        assert "Ada Lovelace <ada@example.com>" in text
+        assert "203.0.113.7" in text
+        assert certificate.audit_hash in text
+
+    def test_final_file_appends_certificate(self, document: Document):
+        certificate = generate_certificate(document.pk)
+
+        with certificate.final_file.open("rb") as stream:
+            pages = PdfReader(BytesIO(stream.read())).pages
+        assert pages[0].extract_text() == "Page one"
+        assert "CERTIFICATE OF COMPLETION" in pages[2].extract_text()
+
+    def test_rendered_once(self, document: Document, django_assert_num_queries):
+        certificate = generate_certificate(document.pk)
+
+        with django_assert_num_queries(1):
+            assert generate_certificate(document.pk) == certificate
+
+    def test_rerendered_if_audit_trail_changes(self, document: Document, monkeypatch):
+        rendered: list[list[str]] = []
+
+        def render(lines):
+            if not rendered:
+                AuditEvent.objects.record(document, "document_viewed")
+            rendered.append(lines)
+            return render_certificate(lines)
+
+        monkeypatch.setattr(certificates, "render_certificate", render)
+
+        certificate = generate_certificate(document.pk)
+
+        assert len(rendered) == 2  # noqa: PLR2004
+        assert certificate.audit_hash == AuditEvent.objects.chain_head(document)
+
+    def test_concurrent_certificate_kept(self, document: Document, monkeypatch):
+        render = certificates._render  # noqa: SLF001
+        rendered: list[Certificate] = []
+
+        def render_twice(document):
+            # Another run renders and saves the certificate meanwhile.
+            rendered.append(render(document))
+            rendered[-1].save()
+            return render(document)
+
+        monkeypatch.setattr(certificates, "_render", render_twice)
+
+        certificate = generate_certificate(document.pk)
+
+        assert certificate == rendered[0]
+        assert Certificate.objects.get() == certificate
+
+    def test_tampered_audit_trail(self, document: Document):
+        AuditEvent.objects.filter(action="document_sent").update(details="edited")
+
+        with pytest.raises(ValueError, match="fails verification"):
+            generate_certificate(document.pk)
+        assert not Certificate.objects.exists()
+
+
+def test_completion_schedules_certificate(document: Document, settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    document.status = Document.Status.COMPLETED
+    document.save()
+
+    relay_outbox()
+
+    assert Certificate.objects.filter(document=document).exists()
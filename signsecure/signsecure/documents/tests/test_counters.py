@@ -0,0 +1,78 @@
+import pytest
+from django.conf import settings
+
+from signsecure.documents.models import Document
+from signsecure.documents.models import DocumentCounter
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def user_counts(user: User) -> dict[str, int]:
+    return DocumentCounter.objects.counts(settings.SITE_ID, user.pk)
+
+
+def tenant_counts() -> dict[str, int]:
+    return DocumentCounter.objects.counts(settings.SITE_ID)
+
+
+class TestDocumentCounters:
+    def test_create(self, user: User):
+        DocumentFactory.create_batch(2, owner=user)
+        DocumentFactory(status=Document.Status.SENT)
+
+        assert user_counts(user)["draft"] == 2  # noqa: PLR2004
+        assert user_counts(user)["sent"] == 0
+        assert tenant_counts()["draft"] == 2  # noqa: PLR2004
+        assert tenant_counts()["sent"] == 1
+
+    def test_status_transition(self, user: User):
+        document = DocumentFactory(owner=user)
+        document.status = Document.Status.SENT
+        document.save()
+
+        assert user_counts(user)["draft"] == 0
+        assert user_counts(user)["sent"] == 1
+
+    def test_save_without_transition(self, user: User, django_assert_num_queries):
+        document = DocumentFactory(owner=user)
+        document.title = "Renamed"
+        with django_assert_num_queries(2):  # the UPDATE and the search vector
+            document.save()
+
+        assert user_counts(user)["draft"] == 1
+
+    def test_delete(self, user: User):
+        document = DocumentFactory(owner=user)
+        document.delete()
+
+        assert user_counts(user)["draft"] == 0
+        assert tenant_counts()["draft"] == 0
+
+    def test_owner_delete(self, user: User):
+        DocumentFactory(owner=user)
+        DocumentFactory()
+        owner_id = user.pk
+        user.delete()
+
+        assert tenant_counts()["draft"] == 1
+        assert not DocumentCounter.objects.filter(owner_id=owner_id).exists()
+
+    def test_tenant_counts_sharded(self, user: User):
+        DocumentFactory.create_batch(20, owner=user)
+
+        assert tenant_counts()["draft"] == 20  # noqa: PLR2004
+        assert DocumentCounter.objects.filter(owner=None).count() > 1
+        assert DocumentCounter.objects.filter(owner=user).count() == 1
+
+    def test_rows_written_in_order(self, user: User, django_assert_num_queries):
+        with django_assert_num_queries(1) as queries:
+            DocumentCounter.objects.add(
+                settings.SITE_ID,
+                user.pk,
+                {"sent": 1, "draft": -1},
+            )
+
+        params = queries.captured_queries[0]["sql"]
+        assert params.index("'draft'") < params.index("'sent'")
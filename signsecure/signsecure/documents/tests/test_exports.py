@@ -0,0 +1,191 @@
+import csv
+import json
+import zipfile
+from datetime import timedelta
+from io import BytesIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from signsecure.documents import exports
+from signsecure.documents.certificates import generate_certificate
+from signsecure.documents.exports import build_next_part
+from signsecure.documents.exports import stream_audit_csv
+from signsecure.documents.exports import stream_audit_ndjson
+from signsecure.documents.exports import stream_zip
+from signsecure.documents.models import ArchiveExport
+from signsecure.documents.models import ArchiveExportPart
+from signsecure.documents.models import AuditEvent
+from signsecure.documents.models import Document
+from signsecure.documents.tasks import build_archive_export
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.documents.tests.factories import make_pdf
+
+pytestmark = pytest.mark.django_db
+
+
+def completed_document(**kwargs) -> Document:
+    document = DocumentFactory(
+        status=Document.Status.COMPLETED,
+        file=ContentFile(make_pdf(["Contract"]), "contract.pdf"),
+        **kwargs,
+    )
+    AuditEvent.objects.record(document, "document_signed", email="ada@example.com")
+    generate_certificate(document.pk)
+    return document
+
+
+@pytest.fixture
+def export(user) -> ArchiveExport:
+    now = timezone.now()
+    return ArchiveExport.objects.create(
+        user=user,
+        completed_from=now - timedelta(days=1),
+        completed_until=now + timedelta(days=1),
+    )
+
+
+def test_stream_zip():
+    archive = b"".join(
+        stream_zip([("a.pdf", [b"%PDF", b"-1.7"]), ("b.json", iter([b"{}"]))]),
+    )
+
+    with zipfile.ZipFile(BytesIO(archive)) as reader:
+        assert reader.namelist() == ["a.pdf", "b.json"]
+        assert reader.read("a.pdf") == b"%PDF-1.7"
+        assert reader.getinfo("b.json").compress_type == zipfile.ZIP_DEFLATED
+
+
+class TestBuildNextPart:
+    def test_archives_documents(self, export, user):
+        document = completed_document(owner=user, title="Lease")
+        completed_document()  # Someone else's.
+
+        part = build_next_part(export)
+
+        assert part is not None
+        assert part.document_count == 1
+        with part.file.open("rb") as stream, zipfile.ZipFile(stream) as reader:
+            folder = f"{document.pk}-lease"
+            assert reader.namelist() == [
+                f"{folder}/final.pdf",
+                f"{folder}/certificate.pdf",
+                f"{folder}/audit.json",
+            ]
+            with document.certificate.final_file.open("rb") as final:
+                assert reader.read(f"{folder}/final.pdf") == final.read()
+            audit = json.loads(reader.read(f"{folder}/audit.json"))
+            assert audit[0]["action"] == "document_signed"
+
+    def test_resumes_after_last_part(self, export, user, monkeypatch):
+        monkeypatch.setattr(exports, "PART_SIZE", 1)
+        first, second = completed_document(owner=user), completed_document(owner=user)
+
+        parts = [build_next_part(export) for _ in range(3)]
+
+        assert [part.last_document_pk if part else None for part in parts] == [
+            first.pk,
+            second.pk,
+            None,
+        ]
+
+    def test_tenant(self, export, user):
+        completed_document(owner=user)
+        completed_document()
+        export.tenant = True
+
+        part = build_next_part(export)
+
+        assert part is not None
+        assert part.document_count == 2  # noqa: PLR2004
+
+
+def test_build_archive_export(export, user, monkeypatch, settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    monkeypatch.setattr(exports, "PART_SIZE", 1)
+    completed_document(owner=user)
+    completed_document(owner=user)
+
+    build_archive_export.delay(export.pk)
+
+    export.refresh_from_db()
+    assert export.status == ArchiveExport.Status.COMPLETED
+    assert export.document_count == 2  # noqa: PLR2004
+    assert list(export.parts.values_list("number", flat=True)) == [1, 2]
+
+
+def test_build_archive_export_counts_stored_parts(export, user, monkeypatch, settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    monkeypatch.setattr(exports, "PART_SIZE", 1)
+    completed_document(owner=user)
+    completed_document(owner=user)
+    # Stored by a run lost before it counted it.
+    build_next_part(export)
+
+    build_archive_export.delay(export.pk)
+
+    export.refresh_from_db()
+    assert export.status == ArchiveExport.Status.COMPLETED
+    assert export.document_count == 2  # noqa: PLR2004
+
+
+def test_build_archive_export_run_twice(export, user, monkeypatch):
+    completed_document(owner=user)
+    archive_entries = exports.archive_entries
+
+    def racing_entries(documents):
+        # Another run for the same message stores the part first.
+        ArchiveExportPart.objects.create(
+            export=export,
+            number=1,
+            last_document_pk=documents[-1].pk,
+            document_count=len(documents),
+            file=ContentFile(b"", "other.zip"),
+        )
+        return archive_entries(documents)
+
+    monkeypatch.setattr(exports, "archive_entries", racing_entries)
+
+    assert build_archive_export(export.pk) is None
+
+    export.refresh_from_db()
+    assert export.status == ArchiveExport.Status.RUNNING
+    assert export.document_count == 0
+    assert export.parts.count() == 1
+
+
+@async_to_sync
+async def collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+class TestAuditStreams:
+    @pytest.fixture
+    def events(self, monkeypatch):
+        monkeypatch.setattr(exports, "AUDIT_CHUNK_SIZE", 2)
+        document = DocumentFactory()
+        for action in ["document_sent", "document_viewed", "document_signed"]:
+            AuditEvent.objects.record(document, action, details='said "hi", then')
+        return AuditEvent.objects.order_by("pk")
+
+    def test_ndjson(self, events):
+        lines = collect(stream_audit_ndjson(events)).decode().splitlines()
+
+        rows = [json.loads(line) for line in lines]
+        assert [row["action"] for row in rows] == [
+            "document_sent",
+            "document_viewed",
+            "document_signed",
+        ]
+        assert rows[0]["hash"] == events[0].hash
+        assert rows[0]["timestamp"] == events[0].timestamp.isoformat()
+
+    def test_csv(self, events):
+        content = collect(stream_audit_csv(events)).decode()
+
+        rows = list(csv.DictReader(content.splitlines()))
+        assert len(rows) == events.count()
+        assert rows[2]["action"] == "document_signed"
+        assert rows[2]["details"] == 'said "hi", then'
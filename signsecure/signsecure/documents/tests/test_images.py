@@ -0,0 +1,81 @@
+import base64
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from PIL import ImageDraw
+
+from signsecure.documents.images import MAX_HEIGHT
+from signsecure.documents.images import MAX_WIDTH
+from signsecure.documents.images import fill_field
+from signsecure.documents.images import store_signature_image
+from signsecure.documents.models import FieldType
+from signsecure.documents.models import SignatureImage
+from signsecure.documents.tests.factories import FormFieldFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def data_url(size=(1500, 500), background=(0, 0, 0, 0), box=(300, 100, 1200, 400)):
+    image = Image.new("RGBA", size, background)
+    if box:
+        ImageDraw.Draw(image).line(box, fill=(0, 0, 0, 255), width=12)
+    output = BytesIO()
+    image.save(output, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(output.getvalue()).decode()
+
+
+class TestStoreSignatureImage:
+    def test_trimmed_and_downscaled(self):
+        signature = store_signature_image(data_url())
+
+        assert signature.width <= MAX_WIDTH
+        assert signature.height <= MAX_HEIGHT
+        # Only the 900 x 300 stroke is kept, at its aspect ratio.
+        assert signature.width / signature.height == pytest.approx(3, rel=0.05)
+
+    def test_white_background_trimmed(self):
+        signature = store_signature_image(
+            data_url(background=(255, 255, 255, 255), box=(10, 10, 110, 60)),
+        )
+
+        assert (signature.width, signature.height) <= (112, 62)
+
+    def test_deduplicated(self):
+        first = store_signature_image(data_url())
+
+        assert store_signature_image(data_url()) == first
+        assert SignatureImage.objects.count() == 1
+
+    @pytest.mark.parametrize(
+        ("value", "message"),
+        [
+            ("not a data url", "data URL"),
+            ("data:image/png;base64,!!!", "base64"),
+            ("data:image/png;base64," + base64.b64encode(b"junk").decode(), "read"),
+            (data_url(box=None), "blank"),
+        ],
+    )
+    def test_invalid(self, value, message):
+        with pytest.raises(ValueError, match=message):
+            store_signature_image(value)
+
+
+class TestFillField:
+    def test_signature_stored_by_reference(self):
+        field = FormFieldFactory(type=FieldType.SIGNATURE)
+
+        fill_field(field, data_url())
+
+        field.refresh_from_db()
+        assert field.value == ""
+        assert field.image is not None
+
+    def test_text_kept_inline(self):
+        field = FormFieldFactory(type=FieldType.TEXT)
+
+        fill_field(field, "Acme Ltd.")
+
+        field.refresh_from_db()
+        assert field.value == "Acme Ltd."
+        assert field.image is None
@@ -0,0 +1,105 @@
+import pytest
+
+from signsecure.documents.models import AuditEvent
+from signsecure.documents.models import Document
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.documents.tests.factories import TemplateFactory
+from signsecure.documents.tests.factories import TemplateFieldFactory
+from signsecure.documents.tests.factories import TemplatePageFactory
+from signsecure.documents.tests.factories import TemplateRoleFactory
+from signsecure.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+class TestCreateFromTemplate:
+    @pytest.fixture
+    def template(self):
+        template = TemplateFactory(title="NDA", page_count=2)
+        TemplatePageFactory.create_batch(2, template=template)
+        client = TemplateRoleFactory(template=template, name="Client", order=1)
+        vendor = TemplateRoleFactory(template=template, name="Vendor", order=2)
+        TemplateFieldFactory.create_batch(2, template=template, role=client)
+        TemplateFieldFactory(template=template, role=vendor, page=2)
+        return template
+
+    @pytest.fixture
+    def signers(self):
+        return [
+            {"role": "Client", "name": "Ada", "email": "ada@example.com"},
+            {"role": "Vendor", "name": "Bob", "email": "bob@example.com"},
+        ]
+
+    def test_copies_layout(self, user: User, template, signers):
+        document = Document.objects.create_from_template(template, user, signers)
+
+        assert document.title == "NDA"
+        assert document.template == template
+        assert [s.email for s in document.signers.all()] == [
+            "ada@example.com",
+            "bob@example.com",
+        ]
+        assert document.fields.count() == template.fields.count()
+        assert document.fields.filter(signer__role="Vendor", page=2).count() == 1
+
+    def test_shares_file_and_pages(self, user: User, template, signers):
+        document = Document.objects.create_from_template(template, user, signers)
+
+        assert document.file.name == template.file.name
+        assert document.shares_template_file
+        assert list(document.get_pages()) == list(template.pages.all())
+
+    def test_reupload_stops_sharing_pages(self, user: User, template, signers):
+        document = Document.objects.create_from_template(template, user, signers)
+        document.file.name = "documents/other.pdf"
+
+        assert not document.shares_template_file
+        assert not document.get_pages().exists()
+
+    def test_query_count(
+        self,
+        user: User,
+        template,
+        signers,
+        django_assert_max_num_queries,
+    ):
+        # Includes the one insert of the document's outbox messages.
+        with django_assert_max_num_queries(11):
+            Document.objects.create_from_template(template, user, signers)
+
+    def test_missing_role(self, user: User, template, signers):
+        with pytest.raises(ValueError, match="Vendor"):
+            Document.objects.create_from_template(template, user, signers[:1])
+        assert not Document.objects.exists()
+
+    def test_unknown_role(self, user: User, template, signers):
+        signers.append({"role": "Witness", "name": "Cy", "email": "cy@example.com"})
+        with pytest.raises(ValueError, match="Witness"):
+            Document.objects.create_from_template(template, user, signers)
+
+
+class TestAuditEventChain:
+    def test_record_chains_hashes(self):
+        document = DocumentFactory()
+        first = AuditEvent.objects.record(document, "document_created")
+        second = AuditEvent.objects.record(document, "document_sent")
+
+        assert first.hash == first.compute_hash("")
+        assert second.hash == second.compute_hash(first.hash)
+        assert AuditEvent.objects.verify_chain(document) == second.hash
+
+    def test_tampering_breaks_chain(self):
+        document = DocumentFactory()
+        event = AuditEvent.objects.record(document, "document_signed", email="a@b.c")
+        AuditEvent.objects.record(document, "document_completed")
+        AuditEvent.objects.filter(pk=event.pk).update(email="mallory@example.com")
+
+        assert AuditEvent.objects.verify_chain(document) is None
+
+    def test_removal_breaks_chain(self):
+        document = DocumentFactory()
+        event = AuditEvent.objects.record(document, "document_viewed")
+        AuditEvent.objects.record(document, "document_signed")
+        event.delete()
+
+        assert AuditEvent.objects.verify_chain(document) is None
@@ -0,0 +1,108 @@
+import pytest
+from django.db import connection
+
+from signsecure.documents.models import Document
+from signsecure.documents.models import Signer
+from signsecure.documents.search import search_documents
+from signsecure.documents.search import status_facets
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.documents.tests.factories import SignerFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestSearchVector:
+    def test_populated_on_save(self):
+        document = DocumentFactory(title="Master services agreement")
+        document.refresh_from_db()
+
+        assert "'services':2A" in document.search_vector
+
+    def test_includes_signers(self):
+        document = DocumentFactory(title="Lease")
+        SignerFactory(document=document, name="Grace Hopper", email="grace@navy.mil")
+
+        assert list(search_documents(document.owner_id, "hopper")) == [document]
+
+    def test_signer_delete_reindexes(self):
+        document = DocumentFactory(title="Lease")
+        signer = SignerFactory(document=document, name="Grace Hopper")
+        signer.delete()
+
+        assert not search_documents(document.owner_id, "hopper").exists()
+
+
+class TestSearchDocuments:
+    def test_title_ranks_above_signer(self, user):
+        by_signer = DocumentFactory(owner=user, title="Lease")
+        SignerFactory(document=by_signer, name="Acme Corp")
+        by_title = DocumentFactory(owner=user, title="Acme supply contract")
+
+        results = list(search_documents(user.pk, "acme"))
+
+        assert results == [by_title, by_signer]
+
+    def test_partial_email(self):
+        document = DocumentFactory(title="Lease")
+        SignerFactory(document=document, email="legal@initech.example")
+
+        assert list(search_documents(document.owner_id, "initech")) == [
+            document,
+        ]
+
+    def test_no_match(self):
+        document = DocumentFactory(title="Lease")
+
+        assert not search_documents(document.owner_id, "invoice").exists()
+
+    def test_other_owners_excluded(self, user):
+        DocumentFactory(title="Acme supply contract")
+        SignerFactory(name="Acme Corp")
+
+        assert not search_documents(user.pk, "acme").exists()
+
+    def test_short_terms_only_match_words(self, user):
+        document = DocumentFactory(owner=user, title="Q3 report")
+        DocumentFactory(owner=user, title="FAQ3")
+
+        assert list(search_documents(user.pk, "q3")) == [document]
+
+
+class TestTrigramIndexes:
+    @pytest.fixture(autouse=True)
+    def _no_seqscan(self):
+        # The test tables are tiny: leave the planner nothing but bitmap scans,
+        # which need an index that matches the filter.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_indexscan = off")
+
+    def test_title(self):
+        plan = Document.objects.filter(title__icontains="acme").explain()
+
+        assert "document_title_trgm_idx" in plan
+
+    def test_signer_name_and_email(self):
+        signers = Signer.objects.order_by()
+
+        assert (
+            "signer_name_trgm_idx" in signers.filter(name__icontains="acme").explain()
+        )
+        assert (
+            "signer_email_trgm_idx" in signers.filter(email__icontains="acme").explain()
+        )
+
+
+def test_status_facets():
+    DocumentFactory.create_batch(2, status=Document.Status.SENT)
+    DocumentFactory(status=Document.Status.COMPLETED)
+
+    facets = status_facets(Document.objects.all())
+
+    assert facets == {
+        "draft": 0,
+        "sent": 2,
+        "completed": 1,
+        "declined": 0,
+        "expired": 0,
+    }
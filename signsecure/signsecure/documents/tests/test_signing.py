@@ -0,0 +1,105 @@
+from io import BytesIO
+
+import pytest
+from asn1crypto import x509 as asn1_x509
+from django.core.files.base import ContentFile
+from pyhanko.pdf_utils.reader import PdfFileReader
+from pyhanko.sign.validation import validate_pdf_signature
+from pyhanko_certvalidator import ValidationContext
+
+from signsecure.documents.certificates import generate_certificate
+from signsecure.documents.models import AuditEvent
+from signsecure.documents.models import Certificate
+from signsecure.documents.signing import get_signer
+from signsecure.documents.signing import sign_documents
+from signsecure.documents.tasks import sign_unsigned_documents
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.documents.tests.factories import make_pdf
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def document():
+    document = DocumentFactory(
+        file=ContentFile(make_pdf(["Page one", "Page two"]), "supply.pdf"),
+    )
+    AuditEvent.objects.record(document, "document_sent")
+    return document
+
+
+def assert_signed(certificate: Certificate, signing_cert: bytes):
+    with certificate.final_file.open("rb") as stream:
+        reader = PdfFileReader(BytesIO(stream.read()))
+        (signature,) = reader.embedded_signatures
+        status = validate_pdf_signature(
+            signature,
+            ValidationContext(trust_roots=[asn1_x509.Certificate.load(signing_cert)]),
+        )
+    assert status.intact
+    assert status.valid
+    assert signature.field_name == "SignSecure"
+
+
+def test_certificate_final_file_signed(document, signing_cert):
+    certificate = generate_certificate(document.pk)
+
+    assert certificate.signed_at is not None
+    assert_signed(certificate, signing_cert)
+
+
+def test_unsigned_without_key(document):
+    certificate = generate_certificate(document.pk)
+
+    assert certificate.signed_at is None
+    assert sign_documents([document.pk]) == 0
+
+
+def test_signer_loaded_once(signing_cert):
+    assert get_signer() is get_signer()
+
+
+class TestSignDocuments:
+    @pytest.fixture
+    def unsigned(self, document, signing_cert, settings) -> Certificate:
+        key_file, settings.DOCUMENT_SIGNING_KEY_FILE = (
+            settings.DOCUMENT_SIGNING_KEY_FILE,
+            "",
+        )
+        certificate = generate_certificate(document.pk)
+        settings.DOCUMENT_SIGNING_KEY_FILE = key_file
+        return certificate
+
+    def test_signs_pending_final_files(
+        self,
+        unsigned,
+        signing_cert,
+        django_capture_on_commit_callbacks,
+    ):
+        old_name = unsigned.final_file.name
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert sign_documents([unsigned.document_id]) == 1
+
+        unsigned.refresh_from_db()
+        assert unsigned.signed_at is not None
+        assert_signed(unsigned, signing_cert)
+        assert not unsigned.final_file.storage.exists(old_name)
+
+    def test_signed_once(self, unsigned):
+        assert sign_documents([unsigned.document_id]) == 1
+        assert sign_documents([unsigned.document_id]) == 0
+
+    def test_unreadable_file_skipped(self, unsigned):
+        unsigned.final_file.save("broken.pdf", ContentFile(b"not a pdf"))
+
+        assert sign_documents([unsigned.document_id]) == 0
+        unsigned.refresh_from_db()
+        assert unsigned.signed_at is None
+
+    def test_sweeper_queues_batches(self, unsigned, settings):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+
+        assert sign_unsigned_documents() == 1
+        unsigned.refresh_from_db()
+        assert unsigned.signed_at is not None
@@ -0,0 +1,66 @@
+import pytest
+from celery.result import EagerResult
+
+from signsecure.documents.models import Document
+from signsecure.documents.models import DocumentCounter
+from signsecure.documents.tasks import reconcile_document_counters
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def test_reconcile_document_counters(user: User, settings, monkeypatch):
+    monkeypatch.setattr(DocumentCounter, "TENANT_SHARDS", 1)
+    DocumentFactory.create_batch(3, owner=user)
+    # Bulk updates do not send signals, so the counters drift.
+    Document.objects.filter(owner=user).update(status=Document.Status.COMPLETED)
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+    task_result = reconcile_document_counters.delay()
+
+    assert isinstance(task_result, EagerResult)
+    assert task_result.result == 4  # noqa: PLR2004
+    counts = DocumentCounter.objects.counts(settings.SITE_ID, user.pk)
+    assert counts["draft"] == 0
+    assert counts["completed"] == 3  # noqa: PLR2004
+    assert reconcile_document_counters() == 0
+
+
+def test_reconcile_merges_shards(user: User, settings):
+    DocumentFactory.create_batch(20, owner=user)
+
+    reconcile_document_counters()
+
+    counters = DocumentCounter.objects.filter(owner=None, status="draft")
+    assert {(c.shard, c.count) for c in counters if c.count} == {(0, 20)}
+    assert DocumentCounter.objects.counts(settings.SITE_ID)["draft"] == 20  # noqa: PLR2004
+
+
+def test_reconcile_creates_missing_counters(user: User, settings):
+    DocumentFactory(owner=user)
+    DocumentCounter.objects.all().delete()
+
+    reconcile_document_counters()
+
+    assert DocumentCounter.objects.counts(settings.SITE_ID, user.pk)["draft"] == 1
+    assert DocumentCounter.objects.counts(settings.SITE_ID)["draft"] == 1
+
+
+def test_reconcile_keeps_concurrent_changes(user: User, settings, monkeypatch):
+    DocumentFactory(owner=user)
+    DocumentCounter.objects.all().delete()
+    merge = DocumentCounter.objects.merge
+
+    def racing_merge(*args):
+        # A document is created once the counts have been read.
+        if Document.objects.filter(owner=user).count() == 1:
+            DocumentFactory(owner=user)
+        merge(*args)
+
+    monkeypatch.setattr(DocumentCounter.objects, "merge", racing_merge)
+
+    reconcile_document_counters()
+
+    assert DocumentCounter.objects.counts(settings.SITE_ID, user.pk)["draft"] == 2  # noqa: PLR2004
+    assert DocumentCounter.objects.counts(settings.SITE_ID)["draft"] == 2  # noqa: PLR2004
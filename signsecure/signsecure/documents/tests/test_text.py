@@ -0,0 +1,150 @@
+from io import BytesIO
+from io import StringIO
+from unittest.mock import Mock
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+
+from signsecure.documents import text
+from signsecure.documents.models import Document
+from signsecure.documents.models import DocumentPage
+from signsecure.documents.search import search_documents
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.documents.tests.factories import TemplateFactory
+from signsecure.documents.tests.factories import make_pdf
+from signsecure.documents.text import extract_pages
+from signsecure.documents.text import index_document_text
+from signsecure.documents.text import index_template_text
+from signsecure.outbox.models import OutboxMessage
+from signsecure.outbox.relay import relay_outbox
+from signsecure.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def test_extract_pages():
+    pdf = make_pdf(["Mutual NDA", "Indemnification clause"])
+
+    assert list(extract_pages(BytesIO(pdf))) == [
+        (1, "Mutual NDA"),
+        (2, "Indemnification clause"),
+    ]
+
+
+class TestIndexDocumentText:
+    def test_index(self):
+        document = DocumentFactory(
+            file=ContentFile(make_pdf(["Mutual NDA", "Governing law"]), "nda.pdf"),
+        )
+
+        assert index_document_text(document.pk) == 2  # noqa: PLR2004
+        assert list(document.pages.values_list("number", "text")) == [
+            (1, "Mutual NDA"),
+            (2, "Governing law"),
+        ]
+
+    def test_reindex_shorter_file(self):
+        document = DocumentFactory(
+            file=ContentFile(make_pdf(["One", "Two", "Three"]), "a.pdf"),
+        )
+        index_document_text(document.pk)
+        document.file = ContentFile(make_pdf(["Uno"]), "b.pdf")
+        document.save()
+
+        assert index_document_text(document.pk) == 1
+        assert list(document.pages.values_list("text", flat=True)) == ["Uno"]
+
+    def test_unreadable_file(self):
+        document = DocumentFactory(file=ContentFile(b"not a pdf", "broken.pdf"))
+
+        assert index_document_text(document.pk) == 0
+        assert not document.pages.exists()
+
+    def test_page_text_is_searchable(self):
+        document = DocumentFactory(
+            title="Lease",
+            file=ContentFile(make_pdf(["Arbitration in Zurich"]), "lease.pdf"),
+        )
+        index_document_text(document.pk)
+
+        assert list(search_documents(document.owner_id, "zurich")) == [
+            document,
+        ]
+
+
+class TestTemplateText:
+    @pytest.fixture
+    def template(self):
+        return TemplateFactory(
+            file=ContentFile(make_pdf(["Mutual NDA", "Governing law"]), "nda.pdf"),
+        )
+
+    def test_extracted_once(self, user: User, template, monkeypatch):
+        extract = Mock(wraps=text.extract_pages)
+        monkeypatch.setattr(text, "extract_pages", extract)
+        first = Document.objects.create_from_template(template, user, [])
+        second = Document.objects.create_from_template(template, user, [])
+
+        assert index_document_text(first.pk) == 2  # noqa: PLR2004
+        assert index_document_text(second.pk) == 2  # noqa: PLR2004
+
+        extract.assert_called_once()
+        assert list(second.pages.values_list("number", "text")) == [
+            (1, "Mutual NDA"),
+            (2, "Governing law"),
+        ]
+
+    def test_copied_on_instantiation(self, user: User, template):
+        index_template_text(template)
+
+        document = Document.objects.create_from_template(template, user, [])
+
+        assert list(document.pages.values_list("text", flat=True)) == [
+            "Mutual NDA",
+            "Governing law",
+        ]
+        assert not OutboxMessage.objects.filter(
+            kind=OutboxMessage.Kind.TASK,
+            aggregate_id=str(document.pk),
+        ).exists()
+        assert list(search_documents(user.pk, "governing")) == [
+            document,
+        ]
+
+    def test_replaced_template_file_extracted_again(self, template):
+        index_template_text(template)
+        template.file = ContentFile(make_pdf(["Lease"]), "lease.pdf")
+        template.save()
+        assert not template.has_page_texts
+
+        index_template_text(template)
+
+        template.refresh_from_db()
+        assert template.page_texts == ["Lease"]
+        assert template.has_page_texts
+
+
+def test_upload_schedules_extraction(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    document = DocumentFactory(
+        file=ContentFile(make_pdf(["Statement of work"]), "sow.pdf"),
+    )
+    assert not document.pages.exists()
+
+    relay_outbox()
+
+    assert document.pages.get().text == "Statement of work"
+
+
+def test_reindex_document_text_command():
+    DocumentFactory.create_batch(
+        2,
+        file=ContentFile(make_pdf(["First", "Second"]), "doc.pdf"),
+    )
+    out = StringIO()
+
+    call_command("reindex_document_text", "--processes=1", stdout=out)
+
+    assert DocumentPage.objects.count() == 4  # noqa: PLR2004
+    assert out.getvalue() == "Indexed 4 pages from 2 documents (0 failed).\n"
@@ -0,0 +1,110 @@
+import pytest
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from pyhanko.sign.timestamps import TimestampRequestError
+
+from signsecure.documents import timestamps
+from signsecure.documents.models import AuditEvent
+from signsecure.documents.models import TimestampBatch
+from signsecure.documents.models import TimestampLeaf
+from signsecure.documents.tasks import timestamp_audit_events
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.documents.timestamps import merkle_root
+from signsecure.documents.timestamps import merkle_tree
+from signsecure.documents.timestamps import timestamp_pending_leaves
+from signsecure.documents.timestamps import verify_leaf
+
+DIGESTS = [f"{i:064x}" for i in range(9)]
+
+
+@pytest.mark.parametrize("size", range(1, len(DIGESTS) + 1))
+def test_merkle_proofs(size):
+    root, proofs = merkle_tree(DIGESTS[:size])
+
+    for digest, proof in zip(DIGESTS[:size], proofs, strict=True):
+        assert merkle_root(digest, proof) == root
+    assert merkle_root("f" + DIGESTS[size - 1][1:], proofs[-1]) != root
+
+
+@pytest.mark.django_db
+class TestTimestampPendingLeaves:
+    @pytest.fixture
+    def local_tsa(self, settings, signing_cert):
+        settings.DOCUMENT_TIMESTAMPER = (
+            "signsecure.documents.timestamps.local_timestamper"
+        )
+
+    @pytest.fixture
+    def events(self):
+        return [
+            AuditEvent.objects.record(DocumentFactory(), action)
+            for action in ["document_sent", "document_viewed", "document_signed"]
+        ]
+
+    def test_record_queues_leaf(self, events):
+        leaf = events[0].timestamp_leaf
+        assert leaf.digest == events[0].hash
+        assert leaf.batch is None
+
+    def test_one_timestamp_per_batch(self, events, local_tsa):
+        assert timestamp_audit_events() == len(events)
+
+        batch = TimestampBatch.objects.get()
+        assert batch.size == len(events)
+        assert batch.verified
+        for leaf in TimestampLeaf.objects.all():
+            assert leaf.batch == batch
+            assert leaf.claimed_until is None
+            assert verify_leaf(leaf) == batch.timestamped_at
+        assert timestamp_pending_leaves() == 0
+
+    def test_claimed_leaves_left_to_their_run(self, events, local_tsa, monkeypatch):
+        timestamper = timestamps.local_timestamper()
+        concurrent_runs = []
+
+        class Timestamper:
+            async def async_timestamp(self, message_digest, md_algorithm):
+                # Another run, while the TSA answers this one's request.
+                concurrent_runs.append(
+                    await sync_to_async(timestamp_pending_leaves)(),
+                )
+                return await timestamper.async_timestamp(
+                    message_digest,
+                    md_algorithm,
+                )
+
+        monkeypatch.setattr(timestamps, "get_timestamper", Timestamper)
+
+        assert timestamp_pending_leaves() == len(events)
+        assert concurrent_runs == [0]
+
+    def test_claim_released_on_failure(self, events, monkeypatch):
+        class Timestamper:
+            async def async_timestamp(self, message_digest, md_algorithm):
+                raise TimestampRequestError
+
+        monkeypatch.setattr(timestamps, "get_timestamper", Timestamper)
+
+        with pytest.raises(TimestampRequestError):
+            timestamp_pending_leaves()
+
+        assert not TimestampLeaf.objects.filter(claimed_until__isnull=False).exists()
+
+    def test_expired_claim_taken_over(self, events, local_tsa):
+        TimestampLeaf.objects.update(claimed_until=timezone.now())
+
+        assert timestamp_pending_leaves() == len(events)
+
+    def test_tampered_proof(self, events, local_tsa):
+        timestamp_pending_leaves()
+
+        leaf = events[1].timestamp_leaf
+        leaf.refresh_from_db()
+        leaf.digest = events[0].hash
+        assert verify_leaf(leaf) is None
+
+    def test_disabled_without_tsa(self, events, settings):
+        settings.DOCUMENT_TIMESTAMP_URL = ""
+
+        assert timestamp_pending_leaves() == 0
+        assert not TimestampBatch.objects.exists()
@@ -0,0 +1,111 @@
+"""
+Text extraction from uploaded PDFs into the per-page search index.
+
+The PDF is read lazily from storage and pages are written one batch at a
+time, so a large upload is never held in memory as a whole. Documents that
+still share their template's PDF are not parsed: the template's text is
+extracted once, into ``Template.page_texts``, and copied from there.
+"""
+
+import logging
+from collections.abc import Iterator
+from itertools import batched
+from typing import BinaryIO
+
+from pypdf import PdfReader
+from pypdf.errors import PyPdfError
+
+from .models import Document
+from .models import DocumentPage
+from .models import Template
+
+logger = logging.getLogger(__name__)
+
+PAGE_BATCH_SIZE = 20
+
+
+def extract_pages(stream: BinaryIO) -> Iterator[tuple[int, str]]:
+    """Yield ``(page number, text)`` for each page of the PDF in ``stream``."""
+    reader = PdfReader(stream)
+    for number, page in enumerate(reader.pages, start=1):
+        yield number, page.extract_text()
+
+
+def copy_template_text(document_id: int, template: Template) -> int:
+    """
+    Copy a template's ``page_texts`` into the pages of a document sharing its PDF.
+
+    Returns the number of pages indexed; pages beyond it are left alone.
+    """
+    DocumentPage.objects.bulk_create(
+        [
+            DocumentPage(document_id=document_id, number=number, text=text)
+            for number, text in enumerate(template.page_texts, start=1)
+        ],
+        update_conflicts=True,
+        unique_fields=["document", "number"],
+        update_fields=["text"],
+    )
+    return len(template.page_texts)
+
+
+def index_template_text(template: Template) -> None:
+    """
+    Extract the text of a template's PDF into its ``page_texts``, unless done.
+
+    Parse errors are logged rather than raised; pages extracted before the
+    error are kept.
+    """
+    if template.has_page_texts:
+        return
+    texts: list[str] = []
+    try:
+        with template.file.open("rb") as stream:
+            texts.extend(text for _, text in extract_pages(stream))
+    except (PyPdfError, ValueError):
+        logger.warning("Could not extract text from template %s", template.pk)
+    template.page_texts, template.text_file = texts, template.file.name
+    # Unless the file was replaced meanwhile.
+    Template.objects.filter(pk=template.pk, file=template.file.name).update(
+        page_texts=texts,
+        text_file=template.file.name,
+    )
+
+
+def index_document_text(document_id: int) -> int:
+    """
+    Extract the text of a document's PDF into its ``DocumentPage`` rows.
+
+    Returns the number of pages indexed. Parse errors are logged rather than
+    raised; pages extracted before the error are kept. A document sharing its
+    template's PDF gets the template's text, which is only extracted once.
+    """
+    document = Document.objects.select_related("template").get(pk=document_id)
+    page_count = 0
+    if document.shares_template_file:
+        assert document.template is not None
+        index_template_text(document.template)
+        page_count = copy_template_text(document_id, document.template)
+    else:
+        try:
+            with document.file.open("rb") as stream:
+                for batch in batched(extract_pages(stream), PAGE_BATCH_SIZE):
+                    DocumentPage.objects.bulk_create(
+                        [
+                            DocumentPage(
+                                document_id=document_id,
+                                number=number,
+                                text=text,
+                            )
+                            for number, text in batch
+                        ],
+                        update_conflicts=True,
+                        unique_fields=["document", "number"],
+                        update_fields=["text"],
+                    )
+                    page_count = batch[-1][0]
+        except (PyPdfError, ValueError):
+            logger.warning("Could not extract text from document %s", document_id)
+    # Drop pages left over from a previous, longer version of the file.
+    DocumentPage.objects.filter(document_id=document_id, number__gt=page_count).delete()
+    return page_count
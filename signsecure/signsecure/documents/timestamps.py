@@ -0,0 +1,216 @@
+"""
+Trusted timestamps for audit events, batched through Merkle trees.
+
+Recording an audit event queues its hash as a pending leaf. Every few seconds
+the pending leaves are gathered into a Merkle tree, only the root is sent to
+the RFC 3161 timestamp authority (TSA), and each leaf stores the proof that
+links it to the timestamped root. A leaf is verified offline by rebuilding
+the root from its proof and checking the stored token against it; the token
+itself is checked once, when stored.
+
+The leaves of a run are claimed for ``LEASE_SECONDS`` in a short
+transaction, the TSA is called outside any, and the batch is stored in a
+second one, so that no rows stay locked while the TSA answers. Leaves
+claimed by a run that died are taken up again once the lease expires.
+
+The TSA client is whatever pyHanko ``TimeStamper`` the callable named by the
+``DOCUMENT_TIMESTAMPER`` setting returns.
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections.abc import Sequence
+from datetime import datetime
+from datetime import timedelta
+
+from asn1crypto.cms import ContentInfo
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from pyhanko.keys import load_cert_from_pemder
+from pyhanko.keys import load_private_key_from_pemder
+from pyhanko.sign.timestamps import DummyTimeStamper
+from pyhanko.sign.timestamps import HTTPTimeStamper
+from pyhanko.sign.timestamps import TimeStamper
+from pyhanko.sign.validation.generic_cms import validate_tst_signed_data
+
+from signsecure.core.db import release_connections
+
+from .models import TimestampBatch
+from .models import TimestampLeaf
+
+logger = logging.getLogger(__name__)
+
+# Cap on the leaves sent in one batch; any more wait for the next run.
+MAX_BATCH_SIZE = 10_000
+# How long a run has to timestamp the leaves it claimed.
+LEASE_SECONDS = 5 * 60
+
+# Leaves and inner nodes are hashed with distinct prefixes, so an inner node
+# can never pass for a leaf (as in RFC 6962).
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+
+def _leaf_hash(digest: str) -> bytes:
+    return hashlib.sha256(_LEAF_PREFIX + bytes.fromhex(digest)).digest()
+
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(_NODE_PREFIX + left + right).digest()
+
+
+def merkle_tree(digests: Sequence[str]) -> tuple[str, list[list[list[str]]]]:
+    """
+    Build a Merkle tree over hex ``digests``.
+
+    Returns:
+        tuple: The hex root, and the inclusion proof of each digest in order.
+        A node without a sibling is carried up to the next level as is.
+
+    """
+    level = [_leaf_hash(digest) for digest in digests]
+    positions = list(range(len(level)))
+    proofs: list[list[list[str]]] = [[] for _ in digests]
+    while len(level) > 1:
+        for leaf, position in enumerate(positions):
+            sibling = position ^ 1
+            if sibling < len(level):
+                side = "L" if sibling < position else "R"
+                proofs[leaf].append([side, level[sibling].hex()])
+            positions[leaf] = position // 2
+        level = [
+            _node_hash(*level[i : i + 2]) if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ]
+    return level[0].hex(), proofs
+
+
+def merkle_root(digest: str, proof: Sequence[Sequence[str]]) -> str:
+    """Rebuild the root of the tree ``digest`` belongs to from its proof."""
+    node = _leaf_hash(digest)
+    for side, sibling in proof:
+        node = (
+            _node_hash(bytes.fromhex(sibling), node)
+            if side == "L"
+            else _node_hash(node, bytes.fromhex(sibling))
+        )
+    return node.hex()
+
+
+def http_timestamper() -> TimeStamper | None:
+    """The TSA at ``DOCUMENT_TIMESTAMP_URL``, or None if there is none."""
+    if not settings.DOCUMENT_TIMESTAMP_URL:
+        return None
+    return HTTPTimeStamper(settings.DOCUMENT_TIMESTAMP_URL)
+
+
+def local_timestamper() -> TimeStamper:
+    """A stand-in TSA answering with the document signing key, for tests."""
+    return DummyTimeStamper(
+        tsa_cert=load_cert_from_pemder(settings.DOCUMENT_SIGNING_CERT_FILE),
+        tsa_key=load_private_key_from_pemder(
+            settings.DOCUMENT_SIGNING_KEY_FILE,
+            settings.DOCUMENT_SIGNING_KEY_PASSPHRASE.encode() or None,
+        ),
+    )
+
+
+def get_timestamper() -> TimeStamper | None:
+    """Get the configured TSA client, or None if timestamping is disabled."""
+    return import_string(settings.DOCUMENT_TIMESTAMPER)()
+
+
+def _token_time(token: ContentInfo) -> datetime:
+    tst_info = token["content"]["encap_content_info"]["content"].parsed
+    return tst_info["gen_time"].native
+
+
+def _claim() -> list[TimestampLeaf]:
+    now = timezone.now()
+    with transaction.atomic():
+        leaves = list(
+            TimestampLeaf.objects.select_for_update(skip_locked=True)
+            .filter(batch__isnull=True)
+            .exclude(claimed_until__gt=now)
+            .order_by("pk")[:MAX_BATCH_SIZE],
+        )
+        TimestampLeaf.objects.filter(pk__in=[leaf.pk for leaf in leaves]).update(
+            claimed_until=now + timedelta(seconds=LEASE_SECONDS),
+        )
+    return leaves
+
+
+def _verify_token(token: ContentInfo, root: str) -> datetime | None:
+    status = asyncio.run(
+        validate_tst_signed_data(token["content"], None, bytes.fromhex(root)),
+    )
+    return status["timestamp"] if status["intact"] else None
+
+
+def timestamp_pending_leaves() -> int:
+    """
+    Timestamp the pending leaves in one batch.
+
+    Leaves claimed by a concurrent run are left to it. Returns the number of
+    leaves timestamped.
+    """
+    timestamper = get_timestamper()
+    if timestamper is None:
+        return 0
+    leaves = _claim()
+    if not leaves:
+        return 0
+    root, proofs = merkle_tree([leaf.digest for leaf in leaves])
+    release_connections()
+    try:
+        token = asyncio.run(timestamper.async_timestamp(bytes.fromhex(root), "sha256"))
+    except Exception:
+        # Let the next run try again rather than wait for the lease.
+        TimestampLeaf.objects.filter(pk__in=[leaf.pk for leaf in leaves]).update(
+            claimed_until=None,
+        )
+        raise
+    verified = _verify_token(token, root) is not None
+    if not verified:
+        logger.error("The timestamp token over %s does not verify.", root)
+    with transaction.atomic():
+        batch = TimestampBatch.objects.create(
+            root=root,
+            token=token.dump(),
+            timestamped_at=_token_time(token),
+            size=len(leaves),
+            verified=verified,
+        )
+        for leaf, proof in zip(leaves, proofs, strict=True):
+            leaf.batch = batch
+            leaf.proof = proof
+            leaf.claimed_until = None
+        TimestampLeaf.objects.bulk_update(
+            leaves,
+            ["batch", "proof", "claimed_until"],
+            batch_size=1000,
+        )
+    return len(leaves)
+
+
+def verify_batch(batch: TimestampBatch) -> datetime | None:
+    """
+    Check a batch's token against its root, without contacting the TSA.
+
+    Returns:
+        datetime | None: The time asserted by the TSA, or None if the token
+        is not a valid signature over the root. Whether the TSA itself is
+        trusted is left to the caller.
+
+    """
+    return _verify_token(ContentInfo.load(bytes(batch.token)), batch.root)
+
+
+def verify_leaf(leaf: TimestampLeaf) -> datetime | None:
+    """Get the trusted time of a timestamped leaf, or None if it fails to verify."""
+    if leaf.batch is None or merkle_root(leaf.digest, leaf.proof) != leaf.batch.root:
+        return None
+    return verify_batch(leaf.batch)
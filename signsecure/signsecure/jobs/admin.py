@@ -0,0 +1,19 @@
+from django.contrib import admin
+from django.db import transaction
+
+from .chunking import resume_job
+from .models import ChunkedJob
+
+
+@admin.register(ChunkedJob)
+class ChunkedJobAdmin(admin.ModelAdmin):
+    list_display = ["name", "status", "chunk_count", "cursor_pk", "created"]
+    list_filter = ["status", "name"]
+    readonly_fields = ["cursor_pk", "chunk_count", "result", "error"]
+    actions = ["resume"]
+
+    @admin.action(description="Resume selected failed jobs")
+    def resume(self, request, queryset):
+        with transaction.atomic():
+            for job in queryset.filter(status=ChunkedJob.Status.FAILED):
+                resume_job(job)
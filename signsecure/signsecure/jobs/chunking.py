@@ -0,0 +1,246 @@
+"""
+Fan-out jobs over large tables.
+
+A job is a function registered with ``@chunked_job`` that processes a slice
+of a queryset and returns counts. ``start_job()`` runs it over the whole
+queryset: the rows are split into primary key ranges of ``chunk_size`` rows,
+found with keyset queries rather than by loading every key, and each range
+is processed by its own ``run_job_chunk`` task. Ranges are dispatched in
+waves of ``max_in_flight`` as the header of a chord, whose body adds the
+wave's counts to the job, moves its checkpoint forward and dispatches the
+next wave. So the broker never holds more than one wave of tasks, and no
+task runs for longer than one chunk takes.
+
+Every processed range is stored, and a failed job resumes from its
+checkpoint without processing those again. Jobs assume integer primary keys.
+
+A chunk that runs out of time fails its job. One whose worker is killed
+outright leaves the chord waiting forever, so running jobs that no chunk has
+finished for ``STALLED_AFTER`` are failed by the ``fail_stalled_jobs`` beat
+task, to be resumed like any other failed job.
+"""
+
+import logging
+from collections import Counter
+from collections.abc import Callable
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Max
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from .models import ChunkedJob
+from .models import JobChunk
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+MAX_IN_FLIGHT = 8
+# Far longer than a chunk may run, see tasks.run_job_chunk.
+STALLED_AFTER = timedelta(minutes=30)
+
+
+@dataclass(frozen=True)
+class JobType:
+    name: str
+    queryset: Callable[[], QuerySet]
+    process: Callable[[QuerySet], dict[str, int]]
+    # The queue chunk tasks are sent to, if not the default.
+    queue: str | None = None
+    # Rows per chunk unless the job is started with another size.
+    chunk_size: int = CHUNK_SIZE
+
+
+_job_types: dict[str, JobType] = {}
+
+
+def chunked_job(
+    name: str,
+    queryset: Callable[[], QuerySet],
+    queue: str | None = None,
+    chunk_size: int = CHUNK_SIZE,
+):
+    """
+    Register a function processing part of ``queryset()`` as the job ``name``.
+
+    The function takes the rows of one chunk as a queryset and returns a
+    dict of counts, which are summed over the whole job. It must be safe to
+    run twice on the same rows, since a chunk whose worker is lost is redone.
+    ``chunk_size`` is the default number of rows per chunk: small enough
+    for a chunk to finish within its task's time limit.
+    """
+
+    def decorator(process):
+        _job_types[name] = JobType(name, queryset, process, queue, chunk_size)
+        return process
+
+    return decorator
+
+
+def get_job_type(name: str) -> JobType:
+    try:
+        return _job_types[name]
+    except KeyError:
+        msg = f"No chunked job is registered as {name!r}."
+        raise ValueError(msg) from None
+
+
+def pk_ranges(
+    queryset: QuerySet,
+    chunk_size: int,
+    after: int = 0,
+) -> Iterator[tuple[int, int]]:
+    """
+    Yield ``(after, last)`` primary key ranges of ``chunk_size`` rows each.
+
+    A range covers ``after < pk <= last``. Each takes one index-only query,
+    so they are found as they are consumed.
+    """
+    pks = queryset.order_by("pk").values_list("pk", flat=True)
+    while True:
+        remaining = pks.filter(pk__gt=after)
+        last = remaining[chunk_size - 1 : chunk_size].first()
+        if last is None:
+            last = remaining.aggregate(last=Max("pk"))["last"]
+            if last is None:
+                return
+        yield after, last
+        after = last
+
+
+def next_wave(job: ChunkedJob) -> list[tuple[int, int]]:
+    """The ranges to process next, at most ``max_in_flight`` of them."""
+    ranges = pk_ranges(
+        get_job_type(job.name).queryset(),
+        job.chunk_size,
+        after=job.cursor_pk,
+    )
+    return list(islice(ranges, job.max_in_flight))
+
+
+def fail_job(job_id: int, error: str) -> None:
+    """Mark a job failed, unless it is no longer running."""
+    ChunkedJob.objects.filter(pk=job_id, status=ChunkedJob.Status.RUNNING).update(
+        status=ChunkedJob.Status.FAILED,
+        error=error,
+        modified=timezone.now(),
+    )
+
+
+def run_chunk(job_id: int, after_pk: int, last_pk: int) -> dict[str, int]:
+    """
+    Process one range of a job, unless it has been already.
+
+    A failure fails the job, which can then be resumed. Chunks of jobs that
+    are no longer running, such as a redelivered chunk of a failed job, are
+    skipped.
+    """
+    job = ChunkedJob.objects.get(pk=job_id)
+    done = JobChunk.objects.filter(job=job, after_pk=after_pk).first()
+    if done is not None:
+        return done.result
+    if job.status != ChunkedJob.Status.RUNNING:
+        return {}
+    job_type = get_job_type(job.name)
+    rows = job_type.queryset().filter(pk__gt=after_pk, pk__lte=last_pk)
+    try:
+        result = job_type.process(rows)
+    except Exception as exc:
+        fail_job(
+            job_id,
+            f"Chunk ({after_pk}, {last_pk}]: {type(exc).__name__}: {exc}",
+        )
+        raise
+    JobChunk.objects.get_or_create(
+        job=job,
+        after_pk=after_pk,
+        defaults={"last_pk": last_pk, "result": result},
+    )
+    # The job is making progress, see fail_stalled_jobs.
+    ChunkedJob.objects.filter(pk=job_id).update(modified=timezone.now())
+    return result
+
+
+def finish_wave(
+    job_id: int,
+    results: list[dict[str, int]],
+    after_pk: int,
+    last_pk: int,
+) -> bool:
+    """
+    Add a wave's counts to its job and move the checkpoint past it.
+
+    Returns whether the job should go on. A wave that was finished already,
+    by a redelivered chord body, is ignored.
+    """
+    with transaction.atomic():
+        job = ChunkedJob.objects.select_for_update().get(pk=job_id)
+        if job.status != ChunkedJob.Status.RUNNING or job.cursor_pk != after_pk:
+            return False
+        totals = Counter(job.result)
+        for result in results:
+            totals.update(result)
+        job.result = dict(totals)
+        job.cursor_pk = last_pk
+        job.chunk_count += len(results)
+        job.save(update_fields=["result", "cursor_pk", "chunk_count", "modified"])
+    return True
+
+
+def fail_stalled_jobs() -> int:
+    """
+    Fail the running jobs none of whose chunks finished for ``STALLED_AFTER``.
+
+    Returns the number of jobs failed.
+    """
+    return ChunkedJob.objects.filter(
+        status=ChunkedJob.Status.RUNNING,
+        modified__lt=timezone.now() - STALLED_AFTER,
+    ).update(
+        status=ChunkedJob.Status.FAILED,
+        error=f"No chunk finished in {STALLED_AFTER.total_seconds() / 60:g} minutes.",
+        modified=timezone.now(),
+    )
+
+
+def start_job(
+    name: str,
+    chunk_size: int | None = None,
+    max_in_flight: int = MAX_IN_FLIGHT,
+) -> ChunkedJob:
+    """
+    Run a registered job over its whole queryset, once the caller commits.
+
+    Chunks have the job type's ``chunk_size`` unless another is given.
+    """
+    from signsecure.outbox.messages import enqueue
+
+    from .tasks import dispatch_job_wave
+
+    job_type = get_job_type(name)
+    job = ChunkedJob.objects.create(
+        name=name,
+        chunk_size=chunk_size or job_type.chunk_size,
+        max_in_flight=max_in_flight,
+    )
+    enqueue(dispatch_job_wave, job.pk, aggregate=job)
+    return job
+
+
+def resume_job(job: ChunkedJob) -> None:
+    """Carry on with a failed job from its checkpoint."""
+    from signsecure.outbox.messages import enqueue
+
+    from .tasks import dispatch_job_wave
+
+    if job.status != ChunkedJob.Status.FAILED:
+        msg = "Only failed jobs can be resumed."
+        raise ValueError(msg)
+    job.status = ChunkedJob.Status.RUNNING
+    job.error = ""
+    job.save(update_fields=["status", "error", "modified"])
+    enqueue(dispatch_job_wave, job.pk, aggregate=job)
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from signsecure.jobs.chunking import MAX_IN_FLIGHT
+from signsecure.jobs.chunking import resume_job
+from signsecure.jobs.chunking import start_job
+from signsecure.jobs.models import ChunkedJob
+
+
+class Command(BaseCommand):
+    help = "Start a registered chunked job on the Celery workers, or resume one."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", nargs="?", help="Name of the job to start.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Rows per chunk; by default, the job's own chunk size.",
+        )
+        parser.add_argument("--max-in-flight", type=int, default=MAX_IN_FLIGHT)
+        parser.add_argument(
+            "--resume",
+            type=int,
+            metavar="JOB_ID",
+            help="Resume the failed job with this ID instead.",
+        )
+
+    def handle(self, *args, name, chunk_size, max_in_flight, resume, **options):
+        try:
+            if resume is not None:
+                job = ChunkedJob.objects.get(pk=resume)
+                resume_job(job)
+            elif name:
+                job = start_job(name, chunk_size, max_in_flight)
+            else:
+                msg = "Give the name of a job, or --resume."
+                raise CommandError(msg)
+        except (ValueError, ChunkedJob.DoesNotExist) as exc:
+            raise CommandError(exc) from exc
+        self.stdout.write(self.style.SUCCESS(f"Queued {job}."))
@@ -0,0 +1,123 @@
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ChunkedJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, verbose_name="Job")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "Running"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="running",
+                        max_length=20,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "chunk_size",
+                    models.PositiveIntegerField(verbose_name="Rows per chunk"),
+                ),
+                (
+                    "max_in_flight",
+                    models.PositiveSmallIntegerField(verbose_name="Chunks in flight"),
+                ),
+                (
+                    "cursor_pk",
+                    models.BigIntegerField(default=0, verbose_name="Processed up to"),
+                ),
+                (
+                    "chunk_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Chunks processed"
+                    ),
+                ),
+                (
+                    "result",
+                    models.JSONField(blank=True, default=dict, verbose_name="Result"),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="Error")),
+            ],
+            options={
+                "ordering": ["-created"],
+            },
+        ),
+        migrations.CreateModel(
+            name="JobChunk",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("after_pk", models.BigIntegerField(verbose_name="After")),
+                ("last_pk", models.BigIntegerField(verbose_name="Up to")),
+                ("result", models.JSONField(default=dict, verbose_name="Result")),
+                (
+                    "completed",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Completed"
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chunks",
+                        to="jobs.chunkedjob",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["job", "after_pk"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("job", "after_pk"), name="job_chunk_unique"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+from django.db.models import CASCADE
+from django.db.models import BigIntegerField
+from django.db.models import CharField
+from django.db.models import DateTimeField
+from django.db.models import ForeignKey
+from django.db.models import JSONField
+from django.db.models import Model
+from django.db.models import PositiveIntegerField
+from django.db.models import PositiveSmallIntegerField
+from django.db.models import TextChoices
+from django.db.models import TextField
+from django.db.models import UniqueConstraint
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from model_utils.models import TimeStampedModel
+
+
+class ChunkedJob(TimeStampedModel):
+    """
+    A run of a registered job over every row of its queryset.
+
+    Rows are processed in primary key ranges of ``chunk_size`` rows, at most
+    ``max_in_flight`` ranges at a time; see chunking.py. ``cursor_pk`` is the
+    checkpoint: every row up to it has been processed and its results added
+    to ``result``.
+    """
+
+    class Status(TextChoices):
+        RUNNING = "running", _("Running")
+        COMPLETED = "completed", _("Completed")
+        FAILED = "failed", _("Failed")
+
+    name = CharField(_("Job"), max_length=100)
+    status = CharField(
+        _("Status"),
+        max_length=20,
+        choices=Status.choices,
+        default=Status.RUNNING,
+    )
+    chunk_size = PositiveIntegerField(_("Rows per chunk"))
+    max_in_flight = PositiveSmallIntegerField(_("Chunks in flight"))
+    cursor_pk = BigIntegerField(_("Processed up to"), default=0)
+    chunk_count = PositiveIntegerField(_("Chunks processed"), default=0)
+    result = JSONField(_("Result"), default=dict, blank=True)
+    error = TextField(_("Error"), blank=True)
+
+    class Meta:
+        ordering = ["-created"]
+
+    def __str__(self) -> str:
+        return f"{self.name} #{self.pk}"
+
+
+class JobChunk(Model):
+    """The result of one processed range of a job, kept so it is not redone."""
+
+    job = ForeignKey(ChunkedJob, on_delete=CASCADE, related_name="chunks")
+    # The range is after_pk < pk <= last_pk.
+    after_pk = BigIntegerField(_("After"))
+    last_pk = BigIntegerField(_("Up to"))
+    result = JSONField(_("Result"), default=dict)
+    completed = DateTimeField(_("Completed"), default=timezone.now)
+
+    class Meta:
+        ordering = ["job", "after_pk"]
+        constraints = [
+            UniqueConstraint(fields=["job", "after_pk"], name="job_chunk_unique"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.job} ({self.after_pk}, {self.last_pk}]"
@@ -0,0 +1,60 @@
+from celery import chord
+from celery import shared_task
+from celery.exceptions import SoftTimeLimitExceeded
+
+from . import chunking
+from .chunking import fail_job
+from .chunking import finish_wave
+from .chunking import get_job_type
+from .chunking import next_wave
+from .chunking import run_chunk
+from .models import ChunkedJob
+
+
+@shared_task()
+def dispatch_job_wave(job_id):
+    """Send the next wave of a job's chunks, or mark the job completed."""
+    job = ChunkedJob.objects.get(pk=job_id)
+    if job.status != ChunkedJob.Status.RUNNING:
+        return 0
+    ranges = next_wave(job)
+    if not ranges:
+        job.status = ChunkedJob.Status.COMPLETED
+        job.save(update_fields=["status", "modified"])
+        return 0
+    options = {"queue": queue} if (queue := get_job_type(job.name).queue) else {}
+    header = [
+        run_job_chunk.si(job.pk, after_pk, last_pk).set(**options)
+        for after_pk, last_pk in ranges
+    ]
+    chord(header)(finish_job_wave.s(job.pk, job.cursor_pk, ranges[-1][1]))
+    return len(ranges)
+
+
+@shared_task(
+    acks_late=True,
+    reject_on_worker_lost=True,
+    soft_time_limit=4 * 60,
+    time_limit=5 * 60,
+)
+def run_job_chunk(job_id, after_pk, last_pk):
+    """Process one range of a job's rows, failing the job if it takes too long."""
+    try:
+        return run_chunk(job_id, after_pk, last_pk)
+    except SoftTimeLimitExceeded:
+        # Also when the limit struck outside the job's own code.
+        fail_job(job_id, f"Chunk ({after_pk}, {last_pk}]: timed out.")
+        raise
+
+
+@shared_task()
+def finish_job_wave(results, job_id, after_pk, last_pk):
+    """Record a finished wave of a job, then send the next one."""
+    if finish_wave(job_id, results, after_pk, last_pk):
+        dispatch_job_wave.delay(job_id)
+
+
+@shared_task()
+def fail_stalled_jobs():
+    """Fail running jobs whose chord was lost to a killed worker."""
+    return chunking.fail_stalled_jobs()
@@ -0,0 +1,173 @@
+from datetime import timedelta
+
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+from django.utils import timezone
+
+from signsecure.documents.models import Document
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.jobs.chunking import CHUNK_SIZE
+from signsecure.jobs.chunking import STALLED_AFTER
+from signsecure.jobs.chunking import chunked_job
+from signsecure.jobs.chunking import fail_stalled_jobs
+from signsecure.jobs.chunking import finish_wave
+from signsecure.jobs.chunking import pk_ranges
+from signsecure.jobs.chunking import resume_job
+from signsecure.jobs.chunking import start_job
+from signsecure.jobs.models import ChunkedJob
+from signsecure.jobs.tasks import run_job_chunk
+from signsecure.outbox.relay import relay_outbox
+
+pytestmark = pytest.mark.django_db
+
+processed: list[int] = []
+failing: set[int] = set()
+
+
+@chunked_job("tests.count", queryset=lambda: Document.objects.all())
+def count_chunk(documents):
+    pks = list(documents.values_list("pk", flat=True))
+    if failing & set(pks):
+        msg = "Boom"
+        raise RuntimeError(msg)
+    processed.extend(pks)
+    return {"documents": len(pks), "chunks": 1}
+
+
+@chunked_job("tests.slow", queryset=lambda: Document.objects.all(), chunk_size=2)
+def slow_chunk(documents):
+    raise SoftTimeLimitExceeded
+
+
+@pytest.fixture
+def documents(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    processed.clear()
+    failing.clear()
+    return DocumentFactory.create_batch(5, file="")
+
+
+def test_pk_ranges(documents):
+    pks = [d.pk for d in documents]
+
+    ranges = list(pk_ranges(Document.objects.all(), 2))
+
+    assert ranges == [(0, pks[1]), (pks[1], pks[3]), (pks[3], pks[4])]
+    assert list(pk_ranges(Document.objects.all(), 2, after=pks[4])) == []
+
+
+def test_run_job(documents):
+    job = start_job("tests.count", chunk_size=2, max_in_flight=2)
+    relay_outbox()
+
+    job.refresh_from_db()
+    assert job.status == ChunkedJob.Status.COMPLETED
+    assert job.result == {"documents": 5, "chunks": 3}
+    assert job.chunk_count == 3  # noqa: PLR2004
+    assert job.cursor_pk == documents[-1].pk
+    assert sorted(processed) == [d.pk for d in documents]
+
+
+def test_job_type_chunk_size(documents):
+    assert start_job("tests.slow").chunk_size == 2  # noqa: PLR2004
+    assert start_job("tests.slow", chunk_size=3).chunk_size == 3  # noqa: PLR2004
+    assert start_job("tests.count").chunk_size == CHUNK_SIZE
+    assert start_job("documents.reindex_text").chunk_size == 20  # noqa: PLR2004
+
+
+def test_resume_failed_job(documents):
+    failing.add(documents[3].pk)
+    job = start_job("tests.count", chunk_size=2, max_in_flight=2)
+    relay_outbox()
+
+    job.refresh_from_db()
+    assert job.status == ChunkedJob.Status.FAILED
+    assert "Boom" in job.error
+    # The chunk that succeeded in the failed wave is kept, and not redone.
+    assert job.chunks.count() == 1
+    assert job.cursor_pk == 0
+
+    failing.clear()
+    processed.clear()
+    resume_job(job)
+    relay_outbox()
+
+    job.refresh_from_db()
+    assert job.status == ChunkedJob.Status.COMPLETED
+    assert job.result == {"documents": 5, "chunks": 3}
+    assert sorted(processed) == [d.pk for d in documents[2:]]
+
+
+def test_chunk_timeout_fails_job(documents):
+    job = ChunkedJob.objects.create(name="tests.slow", chunk_size=2, max_in_flight=1)
+
+    with pytest.raises(SoftTimeLimitExceeded):
+        run_job_chunk(job.pk, 0, documents[1].pk)
+
+    job.refresh_from_db()
+    assert job.status == ChunkedJob.Status.FAILED
+    assert "SoftTimeLimitExceeded" in job.error
+
+
+def test_chunks_of_failed_job_skipped(documents):
+    job = ChunkedJob.objects.create(
+        name="tests.count",
+        chunk_size=2,
+        max_in_flight=1,
+        status=ChunkedJob.Status.FAILED,
+    )
+
+    assert run_job_chunk(job.pk, 0, documents[1].pk) == {}
+    assert processed == []
+
+
+def test_fail_stalled_jobs(documents):
+    stalled, running, failed = (
+        ChunkedJob.objects.create(
+            name="tests.count",
+            chunk_size=2,
+            max_in_flight=1,
+            status=status,
+        )
+        for status in (
+            ChunkedJob.Status.RUNNING,
+            ChunkedJob.Status.RUNNING,
+            ChunkedJob.Status.FAILED,
+        )
+    )
+    long_ago = timezone.now() - STALLED_AFTER - timedelta(minutes=1)
+    ChunkedJob.objects.filter(pk__in=[stalled.pk, failed.pk]).update(modified=long_ago)
+
+    assert fail_stalled_jobs() == 1
+
+    stalled.refresh_from_db()
+    assert stalled.status == ChunkedJob.Status.FAILED
+    assert "No chunk finished" in stalled.error
+    running.refresh_from_db()
+    assert running.status == ChunkedJob.Status.RUNNING
+
+
+def test_chunk_keeps_job_from_stalling(documents):
+    job = ChunkedJob.objects.create(name="tests.count", chunk_size=2, max_in_flight=1)
+    long_ago = timezone.now() - STALLED_AFTER - timedelta(minutes=1)
+    ChunkedJob.objects.filter(pk=job.pk).update(modified=long_ago)
+
+    run_job_chunk(job.pk, 0, documents[1].pk)
+
+    assert fail_stalled_jobs() == 0
+
+
+def test_finish_wave_once():
+    job = ChunkedJob.objects.create(name="tests.count", chunk_size=2, max_in_flight=1)
+
+    assert finish_wave(job.pk, [{"documents": 2}], 0, 10)
+    assert not finish_wave(job.pk, [{"documents": 2}], 0, 10)
+
+    job.refresh_from_db()
+    assert job.result == {"documents": 2}
+    assert job.cursor_pk == 10  # noqa: PLR2004
+
+
+def test_unknown_job():
+    with pytest.raises(ValueError, match="No chunked job"):
+        start_job("tests.missing")
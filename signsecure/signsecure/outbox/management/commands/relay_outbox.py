@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from signsecure.outbox.relay import NOTIFY_CHANNEL
+from signsecure.outbox.relay import relay_outbox
+
+
+class Command(BaseCommand):
+    help = "Publish outbox messages to Celery and Redis as they are committed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait for a notification before checking anyway.",
+        )
+
+    def handle(self, *args, poll_interval, **options):
+        connection.ensure_connection()
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        self.stdout.write(f"Relaying outbox messages (listening on {NOTIFY_CHANNEL}).")
+        while True:
+            while relay_outbox():
+                pass
+            # A notification missed while relaying delays its messages by
+            # at most the poll interval.
+            for _ in connection.connection.notifies(
+                timeout=poll_interval,
+                stop_after=1,
+            ):
+                pass
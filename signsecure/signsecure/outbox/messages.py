@@ -0,0 +1,59 @@
+"""
+Writing to the outbox.
+
+Use ``enqueue()`` instead of calling ``task.delay()`` inside a transaction,
+and ``emit()`` to announce a domain event to pub/sub subscribers. Both only
+insert a row: nothing reaches the broker until the transaction has committed
+and the relay picks the message up. To write several messages in one insert,
+build them with ``task_message()`` and ``event_message()`` and pass them to
+``OutboxMessage.objects.bulk_create()``.
+"""
+
+from typing import TYPE_CHECKING
+
+from .models import OutboxMessage
+
+if TYPE_CHECKING:
+    from celery import Task
+    from django.db.models import Model
+
+
+def _aggregate(instance: "Model") -> dict:
+    return {
+        "aggregate_type": instance._meta.label_lower,  # noqa: SLF001
+        "aggregate_id": str(instance.pk),
+    }
+
+
+def task_message(task: "Task", *args, aggregate: "Model") -> OutboxMessage:
+    """An unsaved message calling ``task`` with ``args``."""
+    return OutboxMessage(
+        kind=OutboxMessage.Kind.TASK,
+        name=task.name,
+        payload={"args": list(args)},
+        **_aggregate(aggregate),
+    )
+
+
+def event_message(topic: str, aggregate: "Model", data: dict) -> OutboxMessage:
+    """An unsaved message announcing an event about ``aggregate``."""
+    return OutboxMessage(
+        kind=OutboxMessage.Kind.EVENT,
+        name=topic,
+        payload=data,
+        **_aggregate(aggregate),
+    )
+
+
+def enqueue(task: "Task", *args, aggregate: "Model") -> OutboxMessage:
+    """Queue ``task`` to be called with ``args`` once the transaction commits."""
+    message = task_message(task, *args, aggregate=aggregate)
+    message.save()
+    return message
+
+
+def emit(topic: str, aggregate: "Model", data: dict) -> OutboxMessage:
+    """Publish a domain event about ``aggregate`` once the transaction commits."""
+    message = event_message(topic, aggregate, data)
+    message.save()
+    return message
@@ -0,0 +1,96 @@
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations
+from django.db import models
+
+
+# Wakes the relay up once per inserting statement, when it commits.
+NOTIFY_TRIGGER = """
+CREATE FUNCTION outbox_notify() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('outbox', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER outbox_message_notify
+AFTER INSERT ON outbox_outboxmessage
+FOR EACH STATEMENT EXECUTE FUNCTION outbox_notify();
+"""
+
+DROP_NOTIFY_TRIGGER = """
+DROP TRIGGER outbox_message_notify ON outbox_outboxmessage;
+DROP FUNCTION outbox_notify();
+"""
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxMessage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("task", "Celery task"), ("event", "Event")],
+                        max_length=10,
+                        verbose_name="Kind",
+                    ),
+                ),
+                ("name", models.CharField(max_length=200, verbose_name="Name")),
+                (
+                    "aggregate_type",
+                    models.CharField(max_length=100, verbose_name="Aggregate type"),
+                ),
+                (
+                    "aggregate_id",
+                    models.CharField(max_length=100, verbose_name="Aggregate ID"),
+                ),
+                (
+                    "payload",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        verbose_name="Payload",
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="Created",
+                    ),
+                ),
+                (
+                    "published_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Published at"
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["pk"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("published_at__isnull", True)),
+                        fields=["id"],
+                        name="outbox_message_pending_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(NOTIFY_TRIGGER, DROP_NOTIFY_TRIGGER),
+    ]
@@ -0,0 +1,46 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import CharField
+from django.db.models import DateTimeField
+from django.db.models import Index
+from django.db.models import JSONField
+from django.db.models import Model
+from django.db.models import Q
+from django.db.models import TextChoices
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class OutboxMessage(Model):
+    """
+    A Celery task or domain event, waiting to be published by the relay.
+
+    Messages are written in the transaction that causes them, so they are
+    published if and only if it commits; see relay.py.
+    """
+
+    class Kind(TextChoices):
+        TASK = "task", _("Celery task")
+        EVENT = "event", _("Event")
+
+    kind = CharField(_("Kind"), max_length=10, choices=Kind.choices)
+    # The task name, or the event topic.
+    name = CharField(_("Name"), max_length=200)
+    # Messages about the same aggregate are published in the order written.
+    aggregate_type = CharField(_("Aggregate type"), max_length=100)
+    aggregate_id = CharField(_("Aggregate ID"), max_length=100)
+    payload = JSONField(_("Payload"), encoder=DjangoJSONEncoder)
+    created = DateTimeField(_("Created"), default=timezone.now, editable=False)
+    published_at = DateTimeField(_("Published at"), null=True, blank=True)
+
+    class Meta:
+        ordering = ["pk"]
+        indexes = [
+            Index(
+                fields=["id"],
+                condition=Q(published_at__isnull=True),
+                name="outbox_message_pending_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.aggregate_type} {self.aggregate_id})"
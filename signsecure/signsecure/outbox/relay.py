@@ -0,0 +1,116 @@
+"""
+The outbox relay.
+
+Publishes committed outbox messages in batches: tasks to Celery, with the
+message ID as the task ID, and events to the Redis channel
+``<OUTBOX_CHANNEL_PREFIX><topic>`` as JSON with an ``id`` key. A message is
+marked published only after it has been handed over, so a relay that dies in
+between publishes it again: delivery is at least once. Celery does not
+deduplicate task IDs, so a task may run twice for one message, and tasks sent
+through the outbox must be idempotent.
+
+Only one relay publishes at a time, in primary key order. A message is
+written after the change to its aggregate's row, and two transactions
+changing the same row are serialized by its lock, so per aggregate this is
+the order of the commits.
+
+An insert trigger sends ``NOTIFY outbox`` with every committed batch of
+messages, which the ``relay_outbox`` command listens for.
+"""
+
+import json
+import logging
+from functools import cache
+
+import redis
+from celery import current_app
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "outbox"
+BATCH_SIZE = 500
+# Key of the advisory lock held by the publishing relay.
+RELAY_LOCK_ID = 0x0B0C5
+
+
+@cache
+def get_redis() -> redis.Redis | None:
+    """The client events are published with, or None if there is none."""
+    if not settings.OUTBOX_REDIS_URL:
+        return None
+    return redis.Redis.from_url(settings.OUTBOX_REDIS_URL)
+
+
+def _try_lock() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [RELAY_LOCK_ID])
+        (locked,) = cursor.fetchone()
+    return locked
+
+
+def _publish_events(messages: list[OutboxMessage]) -> None:
+    client = get_redis()
+    if client is None:
+        return
+    pipeline = client.pipeline(transaction=False)
+    for message in messages:
+        pipeline.publish(
+            f"{settings.OUTBOX_CHANNEL_PREFIX}{message.name}",
+            json.dumps(
+                {
+                    "id": message.pk,
+                    "topic": message.name,
+                    "aggregate_type": message.aggregate_type,
+                    "aggregate_id": message.aggregate_id,
+                    "created": message.created,
+                    "data": message.payload,
+                },
+                cls=DjangoJSONEncoder,
+            ),
+        )
+    pipeline.execute()
+
+
+def publish(messages: list[OutboxMessage]) -> None:
+    """Hand messages over to Celery and Redis, in order."""
+    events = []
+    for message in messages:
+        if message.kind == OutboxMessage.Kind.TASK:
+            current_app.tasks[message.name].apply_async(
+                message.payload["args"],
+                task_id=f"outbox-{message.pk}",
+            )
+        else:
+            events.append(message)
+    if events:
+        _publish_events(events)
+
+
+def relay_outbox(batch_size: int = BATCH_SIZE) -> int:
+    """
+    Publish the next batch of messages, unless another relay is at it.
+
+    Returns the number of messages published.
+    """
+    with transaction.atomic():
+        if not _try_lock():
+            return 0
+        messages = list(
+            OutboxMessage.objects.filter(published_at__isnull=True).order_by("pk")[
+                :batch_size
+            ],
+        )
+        if not messages:
+            return 0
+        publish(messages)
+        OutboxMessage.objects.filter(pk__in=[m.pk for m in messages]).update(
+            published_at=timezone.now(),
+        )
+    return len(messages)
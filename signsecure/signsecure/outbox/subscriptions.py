@@ -0,0 +1,52 @@
+"""
+Listening for outbox events from async code.
+
+``event_subscription()`` subscribes to a topic's Redis channel with an async
+client, so waiting for an event holds no thread, and ``next_event()`` waits
+for the next event about a given aggregate. Subscribe before reading the
+state the event would change, or an event published in between is missed.
+"""
+
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+import redis.asyncio
+from django.conf import settings
+
+if TYPE_CHECKING:
+    from django.db.models import Model
+    from redis.asyncio.client import PubSub
+
+
+@asynccontextmanager
+async def event_subscription(topic: str) -> AsyncIterator["PubSub | None"]:
+    """Subscribe to the events of ``topic``; yields None if there is no Redis."""
+    if not settings.OUTBOX_REDIS_URL:
+        yield None
+        return
+    client = redis.asyncio.Redis.from_url(settings.OUTBOX_REDIS_URL)
+    try:
+        async with client.pubsub() as pubsub:
+            await pubsub.subscribe(f"{settings.OUTBOX_CHANNEL_PREFIX}{topic}")
+            yield pubsub
+    finally:
+        await client.aclose()
+
+
+async def next_event(pubsub: "PubSub", aggregate: "Model") -> dict:
+    """Wait for the next event about ``aggregate`` on a subscription."""
+    aggregate_type = aggregate._meta.label_lower  # noqa: SLF001
+    aggregate_id = str(aggregate.pk)
+    async for message in pubsub.listen():
+        if message["type"] != "message":
+            continue
+        event = json.loads(message["data"])
+        if (event["aggregate_type"], event["aggregate_id"]) == (
+            aggregate_type,
+            aggregate_id,
+        ):
+            return event
+    msg = "The subscription was closed."
+    raise ConnectionError(msg)
@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from .models import OutboxMessage
+from .relay import relay_outbox
+
+
+@shared_task()
+def relay_outbox_messages():
+    """
+    Publish whatever the relay process has not.
+
+    A fallback for when no ``relay_outbox`` process is running; with one,
+    this finds nothing left to do.
+    """
+    count = 0
+    while published := relay_outbox():
+        count += published
+    return count
+
+
+@shared_task()
+def purge_outbox():
+    """Delete messages published longer ago than ``OUTBOX_RETENTION_DAYS``."""
+    cutoff = timezone.now() - timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+    deleted, _ = OutboxMessage.objects.filter(published_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,116 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.db import connections
+from django.db import transaction
+from django.utils import timezone
+
+from signsecure.documents.models import Document
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.outbox import relay
+from signsecure.outbox.messages import emit
+from signsecure.outbox.messages import enqueue
+from signsecure.outbox.models import OutboxMessage
+from signsecure.outbox.relay import RELAY_LOCK_ID
+from signsecure.outbox.relay import relay_outbox
+from signsecure.outbox.tasks import purge_outbox
+from signsecure.users.tasks import get_users_count
+
+pytestmark = pytest.mark.django_db
+
+
+class FakeRedis:
+    def __init__(self):
+        self.published: list[tuple[str, dict]] = []
+
+    def pipeline(self, transaction):
+        return self
+
+    def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+    def execute(self):
+        pass
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(relay, "get_redis", lambda: client)
+    return client
+
+
+def test_enqueue_rolled_back():
+    document = DocumentFactory()
+    OutboxMessage.objects.all().delete()
+
+    def fail():
+        with transaction.atomic():
+            enqueue(get_users_count, aggregate=document)
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        fail()
+
+    assert not OutboxMessage.objects.exists()
+
+
+def test_relay_tasks(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    document = DocumentFactory(file="")
+    OutboxMessage.objects.all().delete()
+    message = enqueue(get_users_count, aggregate=document)
+
+    assert relay_outbox() == 1
+    assert relay_outbox() == 0
+
+    message.refresh_from_db()
+    assert message.published_at is not None
+    assert message.aggregate_type == "documents.document"
+    assert message.aggregate_id == str(document.pk)
+
+
+def test_relay_events_in_order(redis, settings):
+    document = DocumentFactory(file="")
+    document.status = Document.Status.SENT
+    document.save()
+    emit("document.viewed", document, {"id": document.pk})
+
+    assert relay_outbox(batch_size=2) == 2  # noqa: PLR2004
+    assert relay_outbox(batch_size=2) == 1
+
+    assert [channel for channel, _ in redis.published] == [
+        f"{settings.OUTBOX_CHANNEL_PREFIX}document.status",
+        f"{settings.OUTBOX_CHANNEL_PREFIX}document.status",
+        f"{settings.OUTBOX_CHANNEL_PREFIX}document.viewed",
+    ]
+    _, event = redis.published[1]
+    assert event["aggregate_id"] == str(document.pk)
+    assert event["data"]["status"] == Document.Status.SENT
+    assert event["id"] < redis.published[2][1]["id"]
+
+
+def test_relay_one_at_a_time(redis):
+    DocumentFactory(file="")
+    other = connections.create_connection("default")
+    try:
+        with other.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_lock(%s)", [RELAY_LOCK_ID])
+            assert relay_outbox() == 0
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [RELAY_LOCK_ID])
+    finally:
+        other.close()
+
+    assert relay_outbox() == 1
+    assert len(redis.published) == 1
+
+
+def test_purge_outbox(settings):
+    document = DocumentFactory(file="")
+    retention = timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+    OutboxMessage.objects.update(published_at=timezone.now() - retention * 2)
+    pending = emit("document.viewed", document, {})
+
+    assert purge_outbox() == 1
+    assert list(OutboxMessage.objects.all()) == [pending]
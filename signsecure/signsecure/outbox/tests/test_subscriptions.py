@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+import pytest
+
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.outbox.subscriptions import event_subscription
+from signsecure.outbox.subscriptions import next_event
+
+pytestmark = pytest.mark.django_db
+
+
+class FakePubSub:
+    def __init__(self, events):
+        self.messages = [{"type": "subscribe", "data": 1}] + [
+            {"type": "message", "data": json.dumps(event)} for event in events
+        ]
+
+    async def listen(self):
+        for message in self.messages:
+            yield message
+
+
+def test_next_event_about_aggregate():
+    document = DocumentFactory()
+    other = {"aggregate_type": "documents.document", "aggregate_id": "0"}
+    event = {"aggregate_type": "documents.document", "aggregate_id": str(document.pk)}
+
+    pubsub = FakePubSub([other, event])
+
+    received = asyncio.run(next_event(pubsub, document))  # type: ignore[arg-type]
+
+    assert received == event
+
+
+def test_next_event_closed():
+    document = DocumentFactory()
+    pubsub = FakePubSub([])
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(next_event(pubsub, document))  # type: ignore[arg-type]
+
+
+def test_no_subscription_without_redis(settings):
+    settings.OUTBOX_REDIS_URL = ""
+
+    async def subscribe():
+        async with event_subscription("document.status") as pubsub:
+            return pubsub
+
+    assert asyncio.run(subscribe()) is None
@@ -4,6 +4,8 @@ from django.contrib import admin
 from django.contrib.auth import admin as auth_admin
 from django.utils.translation import gettext_lazy as _
 
+from signsecure.core.pagination import ApproximateCountPaginator
+
 from .forms import UserAdminChangeForm
 from .forms import UserAdminCreationForm
 from .models import User
@@ -39,6 +41,9 @@ class UserAdmin(auth_admin.UserAdmin):
     list_display = ["email", "name", "is_superuser"]
     search_fields = ["name"]
     ordering = ["id"]
+    paginator = ApproximateCountPaginator
+    # Skips the unfiltered count shown next to search results.
+    show_full_result_count = False
     add_fieldsets = (
         (
             None,
@@ -0,0 +1,16 @@
+from collections.abc import Iterable
+
+from django.http import HttpRequest
+
+from signsecure.core.projections import Projection
+from signsecure.core.projections import detail_url
+
+
+class UserProjection(Projection):
+    """The rows of ``UserSerializer``."""
+
+    fields = ("pk", "name")
+
+    def project(self, rows: Iterable[dict], request: HttpRequest) -> list[dict]:
+        url = detail_url(request, "api:user-detail")
+        return [{"name": row["name"], "url": url(row["pk"])} for row in rows]
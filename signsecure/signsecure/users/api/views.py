@@ -8,6 +8,7 @@ from rest_framework.viewsets import GenericViewSet
 
 from signsecure.users.models import User
 
+from .projections import UserProjection
 from .serializers import UserSerializer
 
 
@@ -20,6 +21,9 @@ class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericV
         assert isinstance(self.request.user.id, int)
         return self.queryset.filter(id=self.request.user.id)
 
+    def list(self, request, *args, **kwargs):
+        return UserProjection().list_response(self, self.get_queryset())
+
     @action(detail=False)
     def me(self, request):
         serializer = UserSerializer(request.user, context={"request": request})
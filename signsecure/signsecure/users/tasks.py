@@ -1,9 +1,11 @@
 from celery import shared_task
 
+from signsecure.core.counts import table_count
+
 from .models import User
 
 
 @shared_task()
 def get_users_count():
-    """A pointless Celery task to demonstrate usage."""
-    return User.objects.count()
+    """Count the users, approximately once there are many of them."""
+    return table_count(User)
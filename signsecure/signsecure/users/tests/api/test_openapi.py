@@ -21,3 +21,11 @@ def test_api_schema_generated_successfully(admin_client):
     url = reverse("api-schema")
     response = admin_client.get(url)
     assert response.status_code == HTTPStatus.OK
+
+
+def test_api_schema_lists_formats(admin_client):
+    response = admin_client.get(reverse("api-schema"), {"format": "json"})
+
+    operation = response.json()["paths"]["/api/users/{id}/"]["patch"]
+    assert "application/msgpack" in operation["requestBody"]["content"]
+    assert "application/msgpack" in operation["responses"]["200"]["content"]
@@ -0,0 +1,21 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from signsecure.users.api.projections import UserProjection
+from signsecure.users.api.serializers import UserSerializer
+from signsecure.users.models import User
+from signsecure.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_matches_serializer():
+    UserFactory.create_batch(3)
+    request = APIRequestFactory().get("/")
+    users = User.objects.order_by("pk")
+
+    projected = UserProjection().project(UserProjection().values(users), request)
+
+    assert (
+        projected == UserSerializer(users, many=True, context={"request": request}).data
+    )
@@ -1,5 +1,18 @@
+import pytest
+from django.db import connection
+
 from signsecure.users.models import User
 
 
 def test_user_get_absolute_url(user: User):
     assert user.get_absolute_url() == f"/users/{user.pk}/"
+
+
+@pytest.mark.django_db
+def test_name_search_uses_trigram_index():
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+
+    plan = User.objects.filter(name__icontains="grace").explain()
+
+    assert "user_name_trgm_idx" in plan
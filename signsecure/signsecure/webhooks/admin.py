@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from .models import WebhookDelivery
+from .models import WebhookEndpoint
+
+
+@admin.register(WebhookEndpoint)
+class WebhookEndpointAdmin(admin.ModelAdmin):
+    list_display = ["url", "owner", "is_active", "batch", "created"]
+    list_filter = ["is_active"]
+    search_fields = ["url"]
+    raw_id_fields = ["owner"]
+
+
+@admin.register(WebhookDelivery)
+class WebhookDeliveryAdmin(admin.ModelAdmin):
+    list_display = ["uuid", "endpoint", "event", "status", "attempts", "created"]
+    list_filter = ["status", "event"]
+    raw_id_fields = ["endpoint"]
@@ -0,0 +1,72 @@
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from rest_framework import serializers
+
+from signsecure.webhooks.destinations import UnsafeDestinationError
+from signsecure.webhooks.destinations import check_url
+from signsecure.webhooks.models import WebhookDelivery
+from signsecure.webhooks.models import WebhookEndpoint
+from signsecure.webhooks.models import WebhookEvent
+
+MAX_CONCURRENCY = 10
+
+
+class WebhookEndpointSerializer(serializers.ModelSerializer[WebhookEndpoint]):
+    events = serializers.ListField(
+        child=serializers.ChoiceField(choices=WebhookEvent.choices),
+        allow_empty=False,
+    )
+
+    class Meta:
+        model = WebhookEndpoint
+        fields = [
+            "id",
+            "url",
+            "events",
+            "is_active",
+            "batch",
+            "max_concurrency",
+            "created",
+        ]
+        read_only_fields = ["created"]
+        extra_kwargs = {
+            "max_concurrency": {"min_value": 1, "max_value": MAX_CONCURRENCY},
+        }
+
+    def validate_url(self, value):
+        if urlsplit(value).scheme != "https" and not settings.DEBUG:
+            msg = "Webhook URLs must use HTTPS."
+            raise serializers.ValidationError(msg)
+        try:
+            check_url(value)
+        except UnsafeDestinationError as exc:
+            raise serializers.ValidationError(str(exc)) from exc
+        return value
+
+    def validate_events(self, value):
+        return sorted(set(value))
+
+
+class NewWebhookEndpointSerializer(WebhookEndpointSerializer):
+    """An endpoint with its signing secret, which is shown only once."""
+
+    class Meta(WebhookEndpointSerializer.Meta):
+        fields = [*WebhookEndpointSerializer.Meta.fields, "secret"]
+        read_only_fields = [*WebhookEndpointSerializer.Meta.read_only_fields, "secret"]
+
+
+class WebhookDeliverySerializer(serializers.ModelSerializer[WebhookDelivery]):
+    class Meta:
+        model = WebhookDelivery
+        fields = [
+            "uuid",
+            "event",
+            "payload",
+            "status",
+            "attempts",
+            "next_attempt_at",
+            "last_error",
+            "created",
+            "delivered_at",
+        ]
@@ -0,0 +1,83 @@
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.mixins import CreateModelMixin
+from rest_framework.mixins import DestroyModelMixin
+from rest_framework.mixins import ListModelMixin
+from rest_framework.mixins import RetrieveModelMixin
+from rest_framework.mixins import UpdateModelMixin
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from signsecure.outbox.messages import enqueue
+from signsecure.webhooks.models import WebhookDelivery
+from signsecure.webhooks.models import WebhookEndpoint
+from signsecure.webhooks.models import generate_secret
+from signsecure.webhooks.tasks import deliver_webhooks
+
+from .serializers import NewWebhookEndpointSerializer
+from .serializers import WebhookDeliverySerializer
+from .serializers import WebhookEndpointSerializer
+
+RECENT_DELIVERIES = 100
+
+
+class WebhookEndpointViewSet(
+    CreateModelMixin,
+    RetrieveModelMixin,
+    ListModelMixin,
+    UpdateModelMixin,
+    DestroyModelMixin,
+    GenericViewSet,
+):
+    serializer_class = WebhookEndpointSerializer
+    queryset = WebhookEndpoint.objects.all()
+    lookup_field = "pk"
+
+    def get_queryset(self, *args, **kwargs):
+        assert isinstance(self.request.user.id, int)
+        return self.queryset.filter(owner_id=self.request.user.id)
+
+    def get_serializer_class(self):
+        # The secret is only ever shown when it is new.
+        if self.action in {"create", "rotate_secret"}:
+            return NewWebhookEndpointSerializer
+        return self.serializer_class
+
+    def perform_create(self, serializer):
+        serializer.save(owner=self.request.user)
+
+    @action(detail=True)
+    def deliveries(self, request, pk=None):
+        """The endpoint's most recent deliveries, optionally of one status."""
+        deliveries = self.get_object().deliveries.all()
+        if delivery_status := request.query_params.get("status"):
+            deliveries = deliveries.filter(status=delivery_status)
+        serializer = WebhookDeliverySerializer(
+            deliveries[:RECENT_DELIVERIES],
+            many=True,
+        )
+        return Response(serializer.data)
+
+    @action(detail=True, methods=["post"])
+    def redeliver(self, request, pk=None):
+        """Queue the endpoint's dead deliveries to be posted again."""
+        endpoint = self.get_object()
+        count = endpoint.deliveries.filter(
+            status=WebhookDelivery.Status.DEAD,
+        ).update(
+            status=WebhookDelivery.Status.PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+        )
+        if count:
+            enqueue(deliver_webhooks, endpoint.pk, aggregate=endpoint)
+        return Response(status=status.HTTP_202_ACCEPTED, data={"count": count})
+
+    @action(detail=True, methods=["post"], url_path="rotate-secret")
+    def rotate_secret(self, request, pk=None):
+        """Replace the endpoint's signing secret, returning the new one."""
+        endpoint = self.get_object()
+        endpoint.secret = generate_secret()
+        endpoint.save(update_fields=["secret", "modified"])
+        return Response(self.get_serializer(endpoint).data)
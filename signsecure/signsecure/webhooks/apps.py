@@ -0,0 +1,13 @@
+import contextlib
+
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class WebhooksConfig(AppConfig):
+    name = "signsecure.webhooks"
+    verbose_name = _("Webhooks")
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import signsecure.webhooks.signals  # noqa: F401
@@ -0,0 +1,214 @@
+"""
+Webhook delivery.
+
+Deliveries are posted per endpoint by the ``deliver_webhooks`` task. Each
+run holds one of the endpoint's ``max_concurrency`` slots, so however slow
+an endpoint is, it never has more requests in flight than that, and the
+other endpoints' deliveries go on in other runs. Requests go through one
+pooled HTTP session per destination and worker thread, with short timeouts;
+each thread keeps the sessions of its ``MAX_SESSIONS`` most recently used
+destinations. Connections to internal addresses are refused, see
+destinations.py.
+
+Every request body is signed with the endpoint's secret; consumers check the
+``X-SignSecure-Signature`` header, ``t=<timestamp>,v1=<hex digest>``, where
+the digest is the HMAC-SHA256 of ``"<timestamp>." + body``.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+import requests
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from signsecure.core.db import release_connections
+
+from .destinations import CheckedAdapter
+from .destinations import UnsafeDestinationError
+from .models import WebhookDelivery
+from .models import WebhookEndpoint
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-SignSecure-Signature"
+TIMEOUT = (3, 10)  # Connect and read timeouts, in seconds.
+MAX_SESSIONS = 32
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = 60
+BACKOFF_MAX = 6 * 60 * 60
+# Claimed deliveries are handed out again if not settled within this time,
+# as is the slot of a worker that died while holding it.
+LEASE_SECONDS = 5 * 60
+# A run stops taking new deliveries after this long, to free its worker.
+RUN_SECONDS = 60
+
+# requests.Session is not thread-safe, and the io worker runs many threads.
+_local = threading.local()
+
+
+def get_session(url: str) -> requests.Session:
+    """Get this thread's pooled HTTP session for ``url``'s destination."""
+    origin = urlsplit(url)._replace(path="", query="", fragment="").geturl()
+    sessions: OrderedDict[str, requests.Session] = _local.__dict__.setdefault(
+        "sessions",
+        OrderedDict(),
+    )
+    if (session := sessions.get(origin)) is None:
+        session = requests.Session()
+        # One request at a time per thread: one kept-alive connection.
+        adapter = CheckedAdapter(pool_connections=1, pool_maxsize=1)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        sessions[origin] = session
+        if len(sessions) > MAX_SESSIONS:
+            sessions.popitem(last=False)[1].close()
+    sessions.move_to_end(origin)
+    return session
+
+
+def sign(secret: str, timestamp: int, body: bytes) -> str:
+    """Compute the value of the signature header for a request body."""
+    digest = hmac.new(
+        secret.encode(),
+        f"{timestamp}.".encode() + body,
+        hashlib.sha256,
+    ).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def backoff(attempts: int) -> timedelta:
+    """The delay before retrying a delivery that failed ``attempts`` times."""
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))  # noqa: S311
+
+
+@contextmanager
+def endpoint_slot(endpoint: WebhookEndpoint) -> Iterator[bool]:
+    """Take one of the endpoint's concurrency slots, yielding whether it did."""
+    for number in range(endpoint.max_concurrency):
+        key = f"webhooks:endpoint:{endpoint.pk}:slot:{number}"
+        if cache.add(key, 1, LEASE_SECONDS):
+            try:
+                yield True
+            finally:
+                cache.delete(key)
+            return
+    yield False
+
+
+def _event(delivery: WebhookDelivery) -> dict:
+    return {
+        "id": str(delivery.uuid),
+        "event": delivery.event,
+        "created": delivery.created,
+        "data": delivery.payload,
+    }
+
+
+def _claim(endpoint: WebhookEndpoint) -> list[WebhookDelivery]:
+    with transaction.atomic():
+        deliveries = list(
+            endpoint.deliveries.select_for_update(skip_locked=True)
+            .filter(
+                status=WebhookDelivery.Status.PENDING,
+                next_attempt_at__lte=timezone.now(),
+            )
+            .order_by("next_attempt_at", "pk")[: BATCH_SIZE if endpoint.batch else 1],
+        )
+        WebhookDelivery.objects.filter(pk__in=[d.pk for d in deliveries]).update(
+            next_attempt_at=timezone.now() + timedelta(seconds=LEASE_SECONDS),
+        )
+    return deliveries
+
+
+def post(endpoint: WebhookEndpoint, deliveries: list[WebhookDelivery]) -> str:
+    """
+    Post deliveries to their endpoint, in one request if it takes batches.
+
+    Returns:
+        str: An empty string on success, otherwise what went wrong.
+
+    """
+    if endpoint.batch:
+        content, event = {"events": [_event(d) for d in deliveries]}, "batch"
+    else:
+        (delivery,) = deliveries
+        content, event = _event(delivery), delivery.event
+    body = json.dumps(content, cls=DjangoJSONEncoder).encode()
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": "SignSecure-Webhooks",
+        "X-SignSecure-Event": event,
+        SIGNATURE_HEADER: sign(endpoint.secret, int(time.time()), body),
+    }
+    release_connections()
+    try:
+        response = get_session(endpoint.url).post(
+            endpoint.url,
+            data=body,
+            headers=headers,
+            timeout=TIMEOUT,
+            allow_redirects=False,
+        )
+    except (requests.RequestException, UnsafeDestinationError) as exc:
+        return f"{type(exc).__name__}: {exc}"
+    if not response.ok:
+        return f"HTTP {response.status_code}: {response.text[:500]}"
+    return ""
+
+
+def _settle(deliveries: list[WebhookDelivery], error: str) -> None:
+    now = timezone.now()
+    for delivery in deliveries:
+        delivery.attempts += 1
+        delivery.last_error = error
+        if not error:
+            delivery.status = WebhookDelivery.Status.DELIVERED
+            delivery.delivered_at = now
+        elif delivery.attempts >= MAX_ATTEMPTS:
+            delivery.status = WebhookDelivery.Status.DEAD
+        else:
+            delivery.next_attempt_at = now + backoff(delivery.attempts)
+    WebhookDelivery.objects.bulk_update(
+        deliveries,
+        ["attempts", "last_error", "status", "delivered_at", "next_attempt_at"],
+    )
+
+
+def deliver_due(endpoint_id: int) -> int:
+    """
+    Post an endpoint's due deliveries, if one of its slots is free.
+
+    Stops at the first failure and leaves the rest to the retry schedule, so
+    a failing endpoint is not hammered. Returns the number delivered.
+    """
+    endpoint = WebhookEndpoint.objects.get(pk=endpoint_id)
+    delivered = 0
+    if not endpoint.is_active:
+        return 0
+    with endpoint_slot(endpoint) as acquired:
+        if not acquired:
+            return 0
+        deadline = time.monotonic() + RUN_SECONDS
+        while time.monotonic() < deadline and (deliveries := _claim(endpoint)):
+            error = post(endpoint, deliveries)
+            _settle(deliveries, error)
+            if error:
+                logger.warning("Webhook delivery to %s failed: %s", endpoint, error)
+                break
+            delivered += len(deliveries)
+    return delivered
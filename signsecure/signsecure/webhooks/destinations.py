@@ -0,0 +1,102 @@
+"""
+Where webhooks may be posted.
+
+Endpoint URLs are chosen by users, so a URL naming, or resolving to, a
+loopback, link-local or private address would let them make the server post
+to the internal network. Such addresses are refused twice: when an endpoint
+is saved, by resolving its host, and when a delivery connects, by checking
+the address the socket actually connected to, so that a name re-pointed
+after it was saved gains nothing. Networks listed in
+``WEBHOOK_ALLOWED_NETWORKS`` are exempt, for consumers on the same network
+in development.
+"""
+
+import ipaddress
+import socket
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connection import HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.connectionpool import HTTPSConnectionPool
+
+
+class UnsafeDestinationError(ValueError):
+    """A webhook URL leads to an address that may not be posted to."""
+
+
+def is_allowed(address: str) -> bool:
+    """Whether webhooks may be posted to an IP address."""
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    if any(ip in ipaddress.ip_network(n) for n in settings.WEBHOOK_ALLOWED_NETWORKS):
+        return True
+    return ip.is_global and not ip.is_multicast
+
+
+def resolve(host: str, port: int) -> list[str]:
+    """The addresses ``host`` resolves to."""
+    return [str(info[4][0]) for info in socket.getaddrinfo(host, port)]
+
+
+def check_url(url: str) -> None:
+    """
+    Check that every address a URL's host resolves to may be posted to.
+
+    Raises:
+        UnsafeDestinationError: If one may not, or the host does not resolve.
+
+    """
+    parts = urlsplit(url)
+    if not parts.hostname:
+        msg = "The URL has no host."
+        raise UnsafeDestinationError(msg)
+    try:
+        addresses = resolve(parts.hostname, parts.port or 443)
+    except (OSError, UnicodeError) as exc:
+        msg = f"{parts.hostname} could not be resolved."
+        raise UnsafeDestinationError(msg) from exc
+    if not all(is_allowed(address) for address in addresses):
+        msg = f"{parts.hostname} resolves to an address webhooks may not be sent to."
+        raise UnsafeDestinationError(msg)
+
+
+def _checked(sock: socket.socket) -> socket.socket:
+    address = sock.getpeername()[0]
+    if not is_allowed(address):
+        sock.close()
+        msg = f"Connected to {address}, where webhooks may not be sent."
+        raise UnsafeDestinationError(msg)
+    return sock
+
+
+class _HTTPConnection(HTTPConnection):
+    def _new_conn(self) -> socket.socket:
+        return _checked(super()._new_conn())
+
+
+class _HTTPSConnection(HTTPSConnection):
+    def _new_conn(self) -> socket.socket:
+        return _checked(super()._new_conn())
+
+
+class _HTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _HTTPConnection
+
+
+class _HTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _HTTPSConnection
+
+
+class CheckedAdapter(HTTPAdapter):
+    """An ``HTTPAdapter`` whose connections are checked with ``is_allowed``."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _HTTPConnectionPool,
+            "https": _HTTPSConnectionPool,
+        }
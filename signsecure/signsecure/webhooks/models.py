@@ -0,0 +1,116 @@
+import secrets
+import uuid
+
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import CASCADE
+from django.db.models import BooleanField
+from django.db.models import CharField
+from django.db.models import DateTimeField
+from django.db.models import ForeignKey
+from django.db.models import Index
+from django.db.models import JSONField
+from django.db.models import Model
+from django.db.models import PositiveSmallIntegerField
+from django.db.models import Q
+from django.db.models import TextChoices
+from django.db.models import TextField
+from django.db.models import URLField
+from django.db.models import UUIDField
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from model_utils.models import TimeStampedModel
+
+
+class WebhookEvent(TextChoices):
+    DOCUMENT_SENT = "document.sent", _("Document sent")
+    SIGNER_SIGNED = "signer.signed", _("Signer signed")
+    DOCUMENT_COMPLETED = "document.completed", _("Document completed")
+
+
+def generate_secret() -> str:
+    return secrets.token_hex(32)
+
+
+class WebhookEndpoint(TimeStampedModel):
+    """A URL that a user's document events are posted to."""
+
+    owner = ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=CASCADE,
+        related_name="webhook_endpoints",
+    )
+    url = URLField(_("URL"), max_length=500)
+    # Payloads are signed with this key, see delivery.py.
+    secret = CharField(
+        _("Signing secret"),
+        max_length=64,
+        default=generate_secret,
+        editable=False,
+    )
+    events = ArrayField(
+        CharField(max_length=50, choices=WebhookEvent.choices),
+        verbose_name=_("Events"),
+    )
+    is_active = BooleanField(_("Active"), default=True)
+    # Whether the consumer takes several events in one request.
+    batch = BooleanField(_("Accepts batches"), default=False)
+    max_concurrency = PositiveSmallIntegerField(
+        _("Maximum concurrent requests"),
+        default=2,
+    )
+
+    class Meta:
+        ordering = ["-created"]
+
+    def __str__(self) -> str:
+        return self.url
+
+
+class WebhookDelivery(Model):
+    """
+    One event to post to one endpoint.
+
+    Pending deliveries are retried with exponential backoff until they
+    succeed or run out of attempts; dead ones form the dead-letter queue and
+    can be redelivered by hand.
+    """
+
+    class Status(TextChoices):
+        PENDING = "pending", _("Pending")
+        DELIVERED = "delivered", _("Delivered")
+        DEAD = "dead", _("Dead")
+
+    uuid = UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    endpoint = ForeignKey(
+        WebhookEndpoint,
+        on_delete=CASCADE,
+        related_name="deliveries",
+    )
+    event = CharField(_("Event"), max_length=50, choices=WebhookEvent.choices)
+    payload = JSONField(_("Payload"), encoder=DjangoJSONEncoder)
+    status = CharField(
+        _("Status"),
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = PositiveSmallIntegerField(_("Attempts"), default=0)
+    next_attempt_at = DateTimeField(_("Next attempt at"), default=timezone.now)
+    last_error = TextField(_("Last error"), blank=True)
+    created = DateTimeField(_("Created"), default=timezone.now, editable=False)
+    delivered_at = DateTimeField(_("Delivered at"), null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created"]
+        indexes = [
+            Index(
+                fields=["endpoint", "next_attempt_at"],
+                condition=Q(status="pending"),
+                name="webhook_delivery_due_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event} to {self.endpoint}"
@@ -0,0 +1,79 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from signsecure.documents.models import Document
+from signsecure.documents.models import Signer
+from signsecure.outbox.messages import task_message
+from signsecure.outbox.models import OutboxMessage
+
+from .models import WebhookDelivery
+from .models import WebhookEndpoint
+from .models import WebhookEvent
+from .tasks import deliver_webhooks
+
+DOCUMENT_STATUS_EVENTS = {
+    Document.Status.SENT: WebhookEvent.DOCUMENT_SENT,
+    Document.Status.COMPLETED: WebhookEvent.DOCUMENT_COMPLETED,
+}
+
+
+def queue_event(event: str, owner_id: int, data: dict) -> None:
+    """Queue a delivery of ``event`` to each of the owner's endpoints for it."""
+    endpoints = list(
+        WebhookEndpoint.objects.filter(
+            owner_id=owner_id,
+            is_active=True,
+            events__contains=[event],
+        ).only("pk"),
+    )
+    if not endpoints:
+        return
+    WebhookDelivery.objects.bulk_create(
+        WebhookDelivery(endpoint=endpoint, event=event, payload=data)
+        for endpoint in endpoints
+    )
+    OutboxMessage.objects.bulk_create(
+        task_message(deliver_webhooks, endpoint.pk, aggregate=endpoint)
+        for endpoint in endpoints
+    )
+
+
+def document_data(document: Document) -> dict:
+    return {
+        "id": document.pk,
+        "title": document.title,
+        "status": document.status,
+    }
+
+
+@receiver(post_save, sender=Document)
+def document_status_webhooks(sender, instance, created, **kwargs):
+    """Notify endpoints when a document is sent or completed."""
+    if not (created or instance.tracker.has_changed("status")):
+        return
+    if event := DOCUMENT_STATUS_EVENTS.get(instance.status):
+        queue_event(event, instance.owner_id, {"document": document_data(instance)})
+
+
+@receiver(post_save, sender=Signer)
+def signer_signed_webhooks(sender, instance, created, **kwargs):
+    """Notify endpoints when a signer signs."""
+    if instance.status != Signer.Status.SIGNED or not (
+        created or instance.tracker.has_changed("status")
+    ):
+        return
+    document = instance.document
+    queue_event(
+        WebhookEvent.SIGNER_SIGNED,
+        document.owner_id,
+        {
+            "document": document_data(document),
+            "signer": {
+                "id": instance.pk,
+                "name": instance.name,
+                "email": instance.email,
+                "role": instance.role,
+                "signed_at": instance.signed_at,
+            },
+        },
+    )
@@ -0,0 +1,36 @@
+from celery import shared_task
+from django.utils import timezone
+
+from .delivery import deliver_due
+from .models import WebhookDelivery
+
+
+@shared_task(soft_time_limit=2 * 60)
+def deliver_webhooks(endpoint_id):
+    """Post the due deliveries of one endpoint."""
+    return deliver_due(endpoint_id)
+
+
+@shared_task()
+def dispatch_webhooks():
+    """
+    Queue delivery for every endpoint with deliveries due.
+
+    Picks up retries whose backoff has elapsed and anything left over by a
+    run that hit its time limit or lost its worker.
+    """
+    endpoint_ids = (
+        WebhookDelivery.objects.filter(
+            status=WebhookDelivery.Status.PENDING,
+            next_attempt_at__lte=timezone.now(),
+            endpoint__is_active=True,
+        )
+        .order_by()
+        .values_list("endpoint_id", flat=True)
+        .distinct()
+    )
+    count = 0
+    for endpoint_id in endpoint_ids:
+        deliver_webhooks.delay(endpoint_id)
+        count += 1
+    return count
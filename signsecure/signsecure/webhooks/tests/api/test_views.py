@@ -0,0 +1,143 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+from signsecure.users.models import User
+from signsecure.webhooks import destinations
+from signsecure.webhooks.models import WebhookDelivery
+from signsecure.webhooks.models import WebhookEndpoint
+from signsecure.webhooks.models import WebhookEvent
+from signsecure.webhooks.tests.factories import WebhookDeliveryFactory
+from signsecure.webhooks.tests.factories import WebhookEndpointFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def resolve(monkeypatch):
+    addresses = {"example.com": ["93.184.215.14"], "internal.example.com": ["10.0.0.5"]}
+    monkeypatch.setattr(destinations, "resolve", lambda host, port: addresses[host])
+
+
+class TestWebhookEndpointViewSet:
+    def test_create(self, user: User, client):
+        client.force_login(user)
+
+        response = client.post(
+            reverse("api:webhookendpoint-list"),
+            {
+                "url": "https://example.com/hook",
+                "events": [WebhookEvent.DOCUMENT_COMPLETED],
+            },
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.CREATED
+        endpoint = WebhookEndpoint.objects.get(owner=user)
+        assert response.json()["secret"] == endpoint.secret
+        assert endpoint.events == [WebhookEvent.DOCUMENT_COMPLETED]
+
+    def test_create_requires_https(self, user: User, client):
+        client.force_login(user)
+
+        response = client.post(
+            reverse("api:webhookendpoint-list"),
+            {"url": "http://example.com/hook", "events": ["document.sent"]},
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert "url" in response.json()
+
+    def test_create_refuses_internal_addresses(self, user: User, client):
+        client.force_login(user)
+
+        response = client.post(
+            reverse("api:webhookendpoint-list"),
+            {"url": "https://internal.example.com/hook", "events": ["document.sent"]},
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert "url" in response.json()
+        assert not WebhookEndpoint.objects.exists()
+
+    def test_update_refuses_internal_addresses(self, user: User, client):
+        endpoint = WebhookEndpointFactory(owner=user)
+        client.force_login(user)
+
+        response = client.patch(
+            reverse("api:webhookendpoint-detail", kwargs={"pk": endpoint.pk}),
+            {"url": "https://internal.example.com/hook"},
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        endpoint.refresh_from_db()
+        assert endpoint.url == "https://example.com/webhooks"
+
+    def test_secret_not_shown_again(self, user: User, client):
+        endpoint = WebhookEndpointFactory(owner=user)
+        client.force_login(user)
+
+        detail = client.get(
+            reverse("api:webhookendpoint-detail", kwargs={"pk": endpoint.pk}),
+        )
+        listed = client.get(reverse("api:webhookendpoint-list"))
+
+        assert "secret" not in detail.json()
+        assert "secret" not in listed.json()[0]
+
+    def test_rotate_secret(self, user: User, client):
+        endpoint = WebhookEndpointFactory(owner=user)
+        old = endpoint.secret
+        client.force_login(user)
+
+        response = client.post(
+            reverse("api:webhookendpoint-rotate-secret", kwargs={"pk": endpoint.pk}),
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        endpoint.refresh_from_db()
+        assert endpoint.secret != old
+        assert response.json()["secret"] == endpoint.secret
+
+    def test_list_only_own(self, user: User, client):
+        own = WebhookEndpointFactory(owner=user)
+        WebhookEndpointFactory()
+        client.force_login(user)
+
+        response = client.get(reverse("api:webhookendpoint-list"))
+
+        assert [e["id"] for e in response.json()] == [own.pk]
+
+    def test_redeliver(self, user: User, client):
+        endpoint = WebhookEndpointFactory(owner=user)
+        dead = WebhookDeliveryFactory(
+            endpoint=endpoint,
+            status=WebhookDelivery.Status.DEAD,
+            attempts=8,
+        )
+        client.force_login(user)
+
+        response = client.post(
+            reverse("api:webhookendpoint-redeliver", kwargs={"pk": endpoint.pk}),
+        )
+
+        assert response.status_code == HTTPStatus.ACCEPTED
+        assert response.json() == {"count": 1}
+        dead.refresh_from_db()
+        assert dead.status == WebhookDelivery.Status.PENDING
+        assert dead.attempts == 0
+
+    def test_deliveries(self, user: User, client):
+        endpoint = WebhookEndpointFactory(owner=user)
+        delivery = WebhookDeliveryFactory(endpoint=endpoint)
+        client.force_login(user)
+
+        response = client.get(
+            reverse("api:webhookendpoint-deliveries", kwargs={"pk": endpoint.pk}),
+        )
+
+        assert [d["uuid"] for d in response.json()] == [str(delivery.uuid)]
@@ -0,0 +1,25 @@
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+
+from signsecure.users.tests.factories import UserFactory
+from signsecure.webhooks.models import WebhookDelivery
+from signsecure.webhooks.models import WebhookEndpoint
+from signsecure.webhooks.models import WebhookEvent
+
+
+class WebhookEndpointFactory(DjangoModelFactory[WebhookEndpoint]):
+    owner = SubFactory(UserFactory)
+    url = "https://example.com/webhooks"
+    events = list(WebhookEvent.values)
+
+    class Meta:
+        model = WebhookEndpoint
+
+
+class WebhookDeliveryFactory(DjangoModelFactory[WebhookDelivery]):
+    endpoint = SubFactory(WebhookEndpointFactory)
+    event = WebhookEvent.DOCUMENT_SENT
+    payload = {"document": {"id": 1}}
+
+    class Meta:
+        model = WebhookDelivery
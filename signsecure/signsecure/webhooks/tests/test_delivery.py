@@ -0,0 +1,255 @@
+import json
+import threading
+from datetime import timedelta
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from signsecure.documents.models import Document
+from signsecure.documents.models import Signer
+from signsecure.documents.tests.factories import DocumentFactory
+from signsecure.documents.tests.factories import SignerFactory
+from signsecure.outbox.models import OutboxMessage
+from signsecure.webhooks.delivery import MAX_ATTEMPTS
+from signsecure.webhooks.delivery import MAX_SESSIONS
+from signsecure.webhooks.delivery import SIGNATURE_HEADER
+from signsecure.webhooks.delivery import deliver_due
+from signsecure.webhooks.delivery import endpoint_slot
+from signsecure.webhooks.delivery import get_session
+from signsecure.webhooks.delivery import sign
+from signsecure.webhooks.models import WebhookDelivery
+from signsecure.webhooks.models import WebhookEvent
+from signsecure.webhooks.tasks import deliver_webhooks
+from signsecure.webhooks.tasks import dispatch_webhooks
+
+from .factories import WebhookDeliveryFactory
+from .factories import WebhookEndpointFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class Receiver(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), ReceiverHandler)
+        self.requests: list[tuple[dict, bytes]] = []
+        self.status = HTTPStatus.OK
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/hook"
+
+
+class ReceiverHandler(BaseHTTPRequestHandler):
+    server: Receiver
+
+    def do_POST(self):  # noqa: N802
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((dict(self.headers), body))
+        self.send_response(self.server.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def receiver(settings):
+    settings.WEBHOOK_ALLOWED_NETWORKS = ["127.0.0.0/8"]
+    server = Receiver()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_deliver_signed(receiver):
+    endpoint = WebhookEndpointFactory(url=receiver.url)
+    delivery = WebhookDeliveryFactory(endpoint=endpoint)
+
+    assert deliver_due(endpoint.pk) == 1
+
+    ((headers, body),) = receiver.requests
+    timestamp = int(headers[SIGNATURE_HEADER].split(",")[0].removeprefix("t="))
+    assert headers[SIGNATURE_HEADER] == sign(endpoint.secret, timestamp, body)
+    assert headers["X-SignSecure-Event"] == WebhookEvent.DOCUMENT_SENT
+    event = json.loads(body)
+    assert event["id"] == str(delivery.uuid)
+    assert event["data"] == delivery.payload
+    delivery.refresh_from_db()
+    assert delivery.status == WebhookDelivery.Status.DELIVERED
+    assert delivery.attempts == 1
+
+
+def test_deliver_batches(receiver):
+    endpoint = WebhookEndpointFactory(url=receiver.url, batch=True)
+    deliveries = WebhookDeliveryFactory.create_batch(3, endpoint=endpoint)
+
+    assert deliver_due(endpoint.pk) == len(deliveries)
+
+    ((_, body),) = receiver.requests
+    assert {event["id"] for event in json.loads(body)["events"]} == {
+        str(delivery.uuid) for delivery in deliveries
+    }
+
+
+def test_deliver_retries_with_backoff(receiver):
+    receiver.status = HTTPStatus.SERVICE_UNAVAILABLE
+    endpoint = WebhookEndpointFactory(url=receiver.url)
+    first, second = WebhookDeliveryFactory.create_batch(2, endpoint=endpoint)
+
+    assert deliver_due(endpoint.pk) == 0
+
+    # The first failure stops the run.
+    assert len(receiver.requests) == 1
+    first.refresh_from_db()
+    assert first.status == WebhookDelivery.Status.PENDING
+    assert first.attempts == 1
+    assert first.last_error.startswith("HTTP 503")
+    assert first.next_attempt_at > timezone.now()
+
+
+def test_deliver_dead_after_max_attempts(receiver):
+    receiver.status = HTTPStatus.INTERNAL_SERVER_ERROR
+    endpoint = WebhookEndpointFactory(url=receiver.url)
+    delivery = WebhookDeliveryFactory(endpoint=endpoint, attempts=MAX_ATTEMPTS - 1)
+
+    deliver_due(endpoint.pk)
+
+    delivery.refresh_from_db()
+    assert delivery.status == WebhookDelivery.Status.DEAD
+
+
+def test_deliver_unreachable():
+    endpoint = WebhookEndpointFactory(url="http://127.0.0.1:9/hook")
+    delivery = WebhookDeliveryFactory(endpoint=endpoint)
+
+    deliver_due(endpoint.pk)
+
+    delivery.refresh_from_db()
+    assert delivery.status == WebhookDelivery.Status.PENDING
+    assert delivery.last_error.startswith("ConnectionError")
+
+
+def test_deliver_refuses_internal_addresses(receiver, settings):
+    settings.WEBHOOK_ALLOWED_NETWORKS = []
+    endpoint = WebhookEndpointFactory(url=receiver.url)
+    delivery = WebhookDeliveryFactory(endpoint=endpoint)
+
+    assert deliver_due(endpoint.pk) == 0
+
+    assert receiver.requests == []
+    delivery.refresh_from_db()
+    assert delivery.status == WebhookDelivery.Status.PENDING
+    assert delivery.last_error.startswith("UnsafeDestinationError")
+
+
+def test_deliver_respects_concurrency_limit(receiver):
+    endpoint = WebhookEndpointFactory(url=receiver.url, max_concurrency=1)
+    WebhookDeliveryFactory(endpoint=endpoint)
+
+    with endpoint_slot(endpoint) as acquired:
+        assert acquired
+        assert deliver_due(endpoint.pk) == 0
+    assert deliver_due(endpoint.pk) == 1
+
+
+def test_dispatch_webhooks(receiver, settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    endpoint = WebhookEndpointFactory(url=receiver.url)
+    due = WebhookDeliveryFactory(endpoint=endpoint)
+    later = WebhookDeliveryFactory(
+        endpoint=endpoint,
+        next_attempt_at=timezone.now() + timedelta(hours=1),
+    )
+
+    assert dispatch_webhooks() == 1
+
+    due.refresh_from_db()
+    later.refresh_from_db()
+    assert due.status == WebhookDelivery.Status.DELIVERED
+    assert later.status == WebhookDelivery.Status.PENDING
+
+
+def test_sessions_per_thread():
+    session = get_session("https://example.com/hook")
+    other_thread: list = []
+    thread = threading.Thread(
+        target=lambda: other_thread.append(get_session("https://example.com/hook")),
+    )
+    thread.start()
+    thread.join()
+
+    assert get_session("https://example.com/other") is session
+    assert other_thread[0] is not session
+
+
+def test_sessions_bounded():
+    first = get_session("https://first.example.com/")
+    for number in range(MAX_SESSIONS):
+        get_session(f"https://{number}.example.com/")
+
+    assert get_session("https://first.example.com/") is not first
+
+
+class TestSignals:
+    def test_document_sent(self):
+        endpoint = WebhookEndpointFactory(events=[WebhookEvent.DOCUMENT_SENT])
+        document = DocumentFactory(owner=endpoint.owner)
+        assert not endpoint.deliveries.exists()
+
+        document.status = Document.Status.SENT
+        document.save()
+
+        (delivery,) = endpoint.deliveries.all()
+        assert delivery.event == WebhookEvent.DOCUMENT_SENT
+        assert delivery.payload["document"]["id"] == document.pk
+
+    def test_one_insert_per_event(self, user):
+        endpoints = WebhookEndpointFactory.create_batch(
+            2,
+            owner=user,
+            events=[WebhookEvent.DOCUMENT_SENT],
+        )
+        document = DocumentFactory(owner=user)
+        document.status = Document.Status.SENT
+
+        with CaptureQueriesContext(connection) as queries:
+            document.save()
+
+        table = OutboxMessage._meta.db_table  # noqa: SLF001
+        inserts = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith(f'INSERT INTO "{table}"')
+            and deliver_webhooks.name in query["sql"]
+        ]
+        assert len(inserts) == 1
+        messages = OutboxMessage.objects.filter(name=deliver_webhooks.name)
+        assert sorted(m.payload["args"] for m in messages) == [
+            [endpoint.pk] for endpoint in endpoints
+        ]
+
+    def test_only_subscribed_events(self):
+        endpoint = WebhookEndpointFactory(events=[WebhookEvent.DOCUMENT_COMPLETED])
+        DocumentFactory(owner=endpoint.owner, status=Document.Status.SENT)
+
+        assert not endpoint.deliveries.exists()
+
+    def test_signer_signed(self):
+        endpoint = WebhookEndpointFactory(events=[WebhookEvent.SIGNER_SIGNED])
+        signer = SignerFactory(document__owner=endpoint.owner)
+
+        signer.status = Signer.Status.SIGNED
+        signer.signed_at = timezone.now()
+        signer.save()
+        signer.save()
+
+        (delivery,) = endpoint.deliveries.all()
+        assert delivery.payload["signer"]["email"] == signer.email
@@ -0,0 +1,58 @@
+import pytest
+
+from signsecure.webhooks import destinations
+from signsecure.webhooks.destinations import UnsafeDestinationError
+from signsecure.webhooks.destinations import check_url
+from signsecure.webhooks.destinations import is_allowed
+
+
+@pytest.mark.parametrize(
+    ("address", "allowed"),
+    [
+        ("93.184.215.14", True),
+        ("2606:2800:21f:cb07:6820:80da:af6b:8b2c", True),
+        ("127.0.0.1", False),
+        ("10.1.2.3", False),
+        ("172.16.0.1", False),
+        ("192.168.1.1", False),
+        ("169.254.169.254", False),
+        ("100.64.0.1", False),
+        ("0.0.0.0", False),  # noqa: S104
+        ("::1", False),
+        ("fe80::1%eth0", False),
+        ("fd00::1", False),
+        ("::ffff:127.0.0.1", False),
+        ("224.0.0.1", False),
+    ],
+)
+def test_is_allowed(address, allowed):
+    assert is_allowed(address) is allowed
+
+
+def test_is_allowed_in_allowed_networks(settings):
+    settings.WEBHOOK_ALLOWED_NETWORKS = ["10.0.0.0/8"]
+
+    assert is_allowed("10.1.2.3")
+    assert not is_allowed("192.168.1.1")
+
+
+class TestCheckUrl:
+    def test_public(self, monkeypatch):
+        monkeypatch.setattr(destinations, "resolve", lambda *_: ["93.184.215.14"])
+
+        check_url("https://example.com/hook")
+
+    def test_any_address_internal(self, monkeypatch):
+        addresses = ["93.184.215.14", "10.0.0.1"]
+        monkeypatch.setattr(destinations, "resolve", lambda *_: addresses)
+
+        with pytest.raises(UnsafeDestinationError):
+            check_url("https://example.com/hook")
+
+    def test_ip_literal(self):
+        with pytest.raises(UnsafeDestinationError):
+            check_url("https://169.254.169.254/latest/meta-data/")
+
+    def test_unresolvable(self):
+        with pytest.raises(UnsafeDestinationError, match="could not be resolved"):
+            check_url("https://nonexistent.invalid/hook")
@@ -0,0 +1,13 @@
+import pytest
+
+from config.celery_app import app
+
+
+@pytest.mark.parametrize("task_name", list(app.conf.task_routes))
+def test_routed_task_exists(task_name: str):
+    assert task_name in app.tasks
+
+
+def test_default_queue():
+    route = app.amqp.router.route({}, "signsecure.users.tasks.get_users_count")
+    assert route["queue"].name == app.conf.task_default_queue